@@ -41,6 +41,22 @@ CSRF_TRUSTED_ORIGINS = os.getenv("CSRF_TRUSTED_ORIGINS", "").split(",") if os.ge
 SEOUL_OPENAPI_KEY = os.getenv("SEOUL_OPENAPI_KEY")
 SEOUL_OPENAPI_BASE = os.getenv("SEOUL_OPENAPI_BASE")
 
+# analytics 컬럼형 스냅샷 (export_analytics_snapshot) — 비워두면 뷰는 DB만 사용
+ANALYTICS_SNAPSHOT_DIR = os.getenv("ANALYTICS_SNAPSHOT_DIR", str(BASE_DIR / "data" / "snapshot"))
+
+# DatasetVersion 확인 주기(초) — 워커 메모리 캐시(지역 인덱스 등)가 다른 프로세스의 적재를 알아채는 최대 지연
+ANALYTICS_VERSION_CHECK_SECONDS = float(os.getenv("ANALYTICS_VERSION_CHECK_SECONDS", "5"))
+
+# 외부 API 응답 디스크 캐시 (services/http_cache.py) — off | on | replay(캐시에서만, 네트워크 X)
+ANALYTICS_HTTP_CACHE = os.getenv("ANALYTICS_HTTP_CACHE", "off")
+ANALYTICS_HTTP_CACHE_DIR = os.getenv("ANALYTICS_HTTP_CACHE_DIR", str(BASE_DIR / "data" / "http_cache"))
+ANALYTICS_HTTP_CACHE_TTL = int(os.getenv("ANALYTICS_HTTP_CACHE_TTL", "3600"))  # 초
+ANALYTICS_HTTP_CACHE_MAX_MB = int(os.getenv("ANALYTICS_HTTP_CACHE_MAX_MB", "512"))
+
+# 분석 API 응답 캐시 (services/response_cache.py) — 워커별 LRU, 키에 데이터셋 버전 포함 (ENTRIES=0이면 ETag/304만)
+ANALYTICS_RESPONSE_CACHE_ENTRIES = int(os.getenv("ANALYTICS_RESPONSE_CACHE_ENTRIES", "512"))
+ANALYTICS_RESPONSE_CACHE_MAX_MB = int(os.getenv("ANALYTICS_RESPONSE_CACHE_MAX_MB", "64"))
+
 # Application definition
 
 INSTALLED_APPS = [
@@ -1,6 +1,6 @@
 # analytics/admin.py
 from django.contrib import admin
-from .models import TradingArea, IndustryMetric, ChangeIndex, ClosureStat
+from .models import TradingArea, IndustryMetric, ChangeIndex, ClosureStat, ImportManifest
 
 @admin.register(TradingArea)
 class TradingAreaAdmin(admin.ModelAdmin):
@@ -21,3 +21,8 @@ class ChangeIndexAdmin(admin.ModelAdmin):
 class ClosureStatAdmin(admin.ModelAdmin):
     list_display = ("year", "signgu_cd_nm", "adstrd_cd_nm", "category", "closures")
     search_fields = ("signgu_cd_nm", "adstrd_cd_nm", "category")
+
+@admin.register(ImportManifest)
+class ImportManifestAdmin(admin.ModelAdmin):
+    list_display = ("source", "file_name", "status", "last_committed_row", "created", "updated", "unchanged", "finished_at")
+    list_filter = ("source", "status")
@@ -1,23 +1,63 @@
+import time
 from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Q
 from analytics.models import ChangeIndex
+from analytics.services.csv_loader import DEFAULT_BATCH_SIZE
+from analytics.services.raw_store import load_raw
+from analytics.services.versioning import CHANGE_INDEX, bump_version
+from analytics.utils import resolve_change_score
 
 class Command(BaseCommand):
-    help = "raw_data에 있는 상권변화지표 레이블(change_level)만 백필 (숫자 필드 안 건드림)"
+    help = "원본 payload에 있는 상권변화지표 레이블(change_level) 백필 (change_score는 코드 기준으로 맞춤)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch_size", type=int, default=DEFAULT_BATCH_SIZE)
 
     def handle(self, *args, **opts):
-        qs = ChangeIndex.objects.all()
-        updated = 0
-        for obj in qs.iterator(chunk_size=2000):
-            raw = obj.raw_data or {}
-            snake = raw.get("snake", {})
-            original = raw.get("original", {})
-
-            # 표기(한글) 레벨만 안전하게 채움
-            name = snake.get("상권_변화_지표_명") or original.get("상권_변화_지표_명")
-
-            if name and (getattr(obj, "change_level", None) in (None, "")):
-                obj.change_level = name
-                obj.save(update_fields=["change_level"])
-                updated += 1
-
-        self.stdout.write(self.style.SUCCESS(f"ChangeIndex backfilled (level only): updated={updated}"))
+        batch_size = opts["batch_size"]
+        # 비어 있는 행만 대상 → pk 키셋으로 한 번만 훑음 (배치당 SELECT 2 + UPDATE 1)
+        qs = (
+            ChangeIndex.objects.filter(Q(change_level__isnull=True) | Q(change_level=""))
+            .only("id", "change_code")
+            .order_by("id")
+        )
+        updated = scanned = batch_no = 0
+        last_id = 0
+        started = time.monotonic()
+
+        while True:
+            t0 = time.monotonic()
+            batch = list(qs.filter(id__gt=last_id)[:batch_size])
+            if not batch:
+                break
+            last_id = batch[-1].id
+            batch_no += 1
+            scanned += len(batch)
+
+            raws = load_raw(ChangeIndex.RAW_SOURCE, [obj.id for obj in batch])
+            dirty = []
+            for obj in batch:
+                raw = raws.get(obj.id) or {}
+
+                # 표기(한글) 레벨만 안전하게 채움 — 점수는 레벨명이 아니라 코드 기준으로 다시 계산
+                name = raw.get("상권_변화_지표_명")
+                if name:
+                    obj.change_level = name
+                    _, obj.change_score = resolve_change_score(obj.change_code, None)
+                    dirty.append(obj)
+
+            if dirty:
+                with transaction.atomic():
+                    ChangeIndex.objects.bulk_update(dirty, ["change_level", "change_score"], batch_size=batch_size)
+            updated += len(dirty)
+            self.stdout.write(
+                f"  batch {batch_no}: scanned={len(batch)} updated={len(dirty)} ({time.monotonic() - t0:.2f}s)"
+            )
+
+        if updated:
+            bump_version(CHANGE_INDEX)
+        self.stdout.write(self.style.SUCCESS(
+            f"ChangeIndex backfilled (level only): scanned={scanned}, updated={updated} "
+            f"({time.monotonic() - started:.2f}s)"
+        ))
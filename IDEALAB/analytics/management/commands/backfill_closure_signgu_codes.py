@@ -1,24 +1,28 @@
 # analytics/management/commands/backfill_closure_signgu_codes.py
+import time
 from django.core.management.base import BaseCommand
+from django.db.models import Case, CharField, Q, Value, When
 from analytics.models import ClosureStat
-try:
-    from analytics.services.region import name_to_signgu_cd
-except Exception:
-    def name_to_signgu_cd(x): return None  # 안전장치
+from analytics.services.region import SIGNGU_NAME_TO_CODE
+from analytics.services.versioning import CLOSURE_STAT, bump_version
 
 class Command(BaseCommand):
     help = "ClosureStat의 signgu_cd가 비어있는 행을 자치구 이름(signgu_cd_nm)으로 보정합니다."
 
     def handle(self, *args, **opts):
-        updated = 0
-        skipped = 0
-        qs = ClosureStat.objects.filter(signgu_cd__isnull=True)
-        for row in qs.iterator():
-            code = name_to_signgu_cd(row.signgu_cd_nm)
-            if code:
-                row.signgu_cd = code
-                row.save(update_fields=["signgu_cd"])
-                updated += 1
-            else:
-                skipped += 1
-        self.stdout.write(self.style.SUCCESS(f"Backfilled signgu_cd: updated={updated}, skipped={skipped}"))
+        started = time.monotonic()
+        qs = ClosureStat.objects.filter(Q(signgu_cd__isnull=True) | Q(signgu_cd=""))
+
+        # 이름→코드는 메모리(SIGNGU_NAME_TO_CODE)에서 해결 → UPDATE ... CASE 한 번
+        code_case = Case(
+            *[When(signgu_cd_nm=name, then=Value(code)) for name, code in SIGNGU_NAME_TO_CODE.items()],
+            output_field=CharField(),
+        )
+        updated = qs.filter(signgu_cd_nm__in=list(SIGNGU_NAME_TO_CODE)).update(signgu_cd=code_case)
+        skipped = qs.count()
+        if updated:
+            bump_version(CLOSURE_STAT)
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Backfilled signgu_cd: updated={updated}, skipped={skipped} ({time.monotonic() - started:.2f}s)"
+        ))
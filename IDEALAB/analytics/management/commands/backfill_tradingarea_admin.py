@@ -1,53 +1,84 @@
+import time
 from django.core.management.base import BaseCommand
 from django.db import transaction
 from analytics.models import TradingArea
-from analytics.services.seoul_openapi import iter_TbgisTrdarRelm
+from analytics.services.csv_loader import DEFAULT_BATCH_SIZE
+from analytics.services.seoul_openapi import iter_TbgisTrdarRelm, DEFAULT_WORKERS
+from analytics.services.rollups import rebuild_industry_rollup
+from analytics.services.versioning import TRADING_AREA, bump_version
+
+ADMIN_FIELDS = ("signgu_cd", "signgu_cd_nm", "adstrd_cd", "adstrd_cd_nm")
+
+# 응답 필드 → 모델 필드 매핑
+API_KEYS = {
+    "signgu_cd": "SIGNGU_CD",
+    "signgu_cd_nm": "SIGNGU_CD_NM",
+    "adstrd_cd": "ADSTRD_CD",
+    "adstrd_cd_nm": "ADSTRD_CD_NM",
+}
 
 class Command(BaseCommand):
     help = "TbgisTrdarRelm 응답을 이용해 TradingArea의 자치구/행정동 컬럼을 백필(update)합니다."
 
+    def add_arguments(self, parser):
+        parser.add_argument("--batch_size", type=int, default=DEFAULT_BATCH_SIZE)
+        parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS, help="동시 페이지 요청 수 (1이면 순차)")
+
     def handle(self, *args, **opts):
-        updated = 0
-        missing = 0
-        seen = 0
-
-        with transaction.atomic():
-            for row in iter_TbgisTrdarRelm():
-                seen += 1
-                trdar = row.get("TRDAR_CD")
-                if not trdar:
-                    continue
-
-                try:
-                    ta = TradingArea.objects.get(trdar_cd=trdar)
-                except TradingArea.DoesNotExist:
-                    missing += 1
-                    continue
-
-                # 응답 필드 → 모델 필드 매핑
-                new_sigungu_cd   = row.get("SIGNGU_CD") or ""
-                new_sigungu_nm   = row.get("SIGNGU_CD_NM") or ""
-                new_adstrd_cd    = row.get("ADSTRD_CD") or ""
-                new_adstrd_nm    = row.get("ADSTRD_CD_NM") or ""
-
-                dirty = False
-                if new_sigungu_cd and ta.sigungu_cd != new_sigungu_cd:
-                    ta.sigungu_cd = new_sigungu_cd
-                    dirty = True
-                if new_sigungu_nm and ta.sigungu_cd_nm != new_sigungu_nm:
-                    ta.sigungu_cd_nm = new_sigungu_nm
-                    dirty = True
-                if new_adstrd_cd and ta.adstrd_cd != new_adstrd_cd:
-                    ta.adstrd_cd = new_adstrd_cd
-                    dirty = True
-                if new_adstrd_nm and ta.adstrd_cd_nm != new_adstrd_nm:
-                    ta.adstrd_cd_nm = new_adstrd_nm
-                    dirty = True
-
-                if dirty:
-                    ta.save(update_fields=["sigungu_cd","sigungu_cd_nm","adstrd_cd","adstrd_cd_nm"])
-                    updated += 1
+        batch_size = opts["batch_size"]
+        started = time.monotonic()
+
+        # 현재 값을 한 번에 메모리로 (행마다 get() 하지 않음)
+        current = {
+            row[0]: dict(zip(ADMIN_FIELDS, row[1:]))
+            for row in TradingArea.objects.values_list("trdar_cd", *ADMIN_FIELDS)
+        }
+
+        updated = missing = seen = batch_no = 0
+        dirty = []
+
+        def flush():
+            nonlocal updated, batch_no
+            if not dirty:
+                return
+            t0 = time.monotonic()
+            with transaction.atomic():
+                TradingArea.objects.bulk_update(dirty, list(ADMIN_FIELDS), batch_size=batch_size)
+            batch_no += 1
+            updated += len(dirty)
+            self.stdout.write(
+                f"  batch {batch_no}: updated={len(dirty)} seen={seen} ({time.monotonic() - t0:.2f}s)"
+            )
+            dirty.clear()
+
+        for row in iter_TbgisTrdarRelm(workers=opts["workers"]):
+            seen += 1
+            trdar = row.get("TRDAR_CD")
+            if not trdar:
+                continue
+
+            cur = current.get(trdar)
+            if cur is None:
+                missing += 1
+                continue
+
+            # 빈 값은 기존 값 유지, 바뀐 컬럼만 반영
+            new = dict(cur)
+            for field, key in API_KEYS.items():
+                val = row.get(key) or ""
+                if val and cur[field] != val:
+                    new[field] = val
+
+            if new != cur:
+                dirty.append(TradingArea(trdar_cd=trdar, **new))
+                if len(dirty) >= batch_size:
+                    flush()
+        flush()
+        if updated:
+            rebuild_industry_rollup(batch_size=batch_size)  # 자치구/행정동이 바뀐 상권 반영
+            bump_version(TRADING_AREA)
 
         self.stdout.write(self.style.SUCCESS(
-            f"Processed={seen}, Updated={updated}, Missing TRDAR in DB={missing}"
+            f"Processed={seen}, Updated={updated}, Missing TRDAR in DB={missing} "
+            f"({time.monotonic() - started:.2f}s)"
         ))
@@ -0,0 +1,265 @@
+# analytics/management/commands/bench_analytics.py
+import io
+import json
+import os
+import platform
+import shutil
+import subprocess
+import tempfile
+import time
+
+import django
+import numpy as np
+from django.conf import settings
+from django.core.management import call_command
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test import Client
+from django.test.utils import (
+    CaptureQueriesContext, override_settings, setup_test_environment, teardown_test_environment,
+)
+from django.utils import timezone
+
+from analytics.models import StoreCount
+from analytics.services.csv_loader import BulkUpserter, DEFAULT_BATCH_SIZE
+from analytics.services.store_counts import category_count_rows, replace_category_counts
+from analytics.services.synthetic import CLOSURE_CATEGORIES, STORE_CATEGORIES, SyntheticSeoul
+
+
+def _latency_stats(samples_ms, queries, statuses, elapsed):
+    arr = np.asarray(samples_ms, dtype=np.float64)
+    p50, p95, p99 = np.percentile(arr, [50, 95, 99])
+    return {
+        "requests": int(arr.size),
+        "throughput_rps": round(arr.size / elapsed, 2) if elapsed else None,
+        "latency_ms": {
+            "p50": round(float(p50), 3),
+            "p95": round(float(p95), 3),
+            "p99": round(float(p99), 3),
+            "mean": round(float(arr.mean()), 3),
+            "max": round(float(arr.max()), 3),
+        },
+        "queries": {"min": min(queries), "median": int(np.median(queries)), "max": max(queries)},
+        "status": sorted(set(statuses)),
+    }
+
+
+def _git_revision():
+    try:
+        out = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=settings.BASE_DIR, capture_output=True, text=True, timeout=5,
+        )
+        return out.stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+class Command(BaseCommand):
+    help = "가짜 서울 데이터로 CSV 적재 + analytics API 벤치마크 (결과는 JSON, 커밋 간 비교용)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--trading_areas", type=int, default=1650)
+        parser.add_argument("--years", type=int, default=3, help="분기 데이터 연수 (연 4분기)")
+        parser.add_argument("--industries", type=int, default=5, help="상권·분기당 업종 수 (최대 10)")
+        parser.add_argument("--seed", type=int, default=42)
+        parser.add_argument("--repeat", type=int, default=30, help="엔드포인트별 측정 요청 수")
+        parser.add_argument("--warmup", type=int, default=2, help="측정 전 버리는 요청 수")
+        parser.add_argument("--batch_size", type=int, default=DEFAULT_BATCH_SIZE)
+        parser.add_argument("--workers", type=int, default=1, help="적재 시 CSV 파싱 프로세스 수")
+        parser.add_argument("--snapshot", action="store_true", help="스냅샷을 만든 뒤 스냅샷 경로도 측정")
+        parser.add_argument("--workdir", type=str, default=None, help="생성 파일 보관 경로 (기본: 임시 폴더, 끝나면 삭제)")
+        parser.add_argument("--out", type=str, default=None, help="결과 JSON 파일 (기본: stdout)")
+
+    def handle(self, *args, **opts):
+        workdir = opts["workdir"] or tempfile.mkdtemp(prefix="bench_analytics_")
+        data = SyntheticSeoul(
+            trading_areas=opts["trading_areas"],
+            years=opts["years"],
+            industries=opts["industries"],
+            seed=opts["seed"],
+        )
+        started = time.perf_counter()
+        paths = data.write(os.path.join(workdir, "csv"))
+        generate_s = time.perf_counter() - started
+
+        # 설정된 DB 엔진(SQLite/MySQL)의 test DB를 새로 만들어 사용 → 운영 데이터는 건드리지 않음
+        old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+        setup_test_environment()
+        try:
+            # db/snapshot은 응답 캐시 없이 (매 요청 뷰 실행), response_cache는 워밍업 뒤 캐시 적중
+            with override_settings(ANALYTICS_SNAPSHOT_DIR=os.path.join(workdir, "snapshot")):
+                imports = self._bench_imports(data, paths, opts)
+                with override_settings(ANALYTICS_RESPONSE_CACHE_ENTRIES=0):
+                    endpoints = {"db": self._bench_endpoints(data, opts)}
+                    if opts["snapshot"]:
+                        call_command("export_analytics_snapshot", stdout=io.StringIO())
+                        endpoints["snapshot"] = self._bench_endpoints(data, opts)
+                endpoints["response_cache"] = self._bench_endpoints(data, opts)
+        finally:
+            teardown_test_environment()
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            if not opts["workdir"]:
+                shutil.rmtree(workdir, ignore_errors=True)
+
+        result = {
+            "created_at": timezone.now().isoformat(),
+            "git": _git_revision(),
+            "env": {
+                "python": platform.python_version(),
+                "django": django.get_version(),
+                "db_vendor": connection.vendor,
+            },
+            "dataset": {
+                "seed": opts["seed"],
+                "trading_areas": len(data.areas),
+                "quarters": data.quarters,
+                "industries": len(data.industries),
+                "store_radii": list(data.store_radii),
+                "stores_per_area": data.stores_per_area,
+                "generate_s": round(generate_s, 3),
+            },
+            "imports": imports,
+            "endpoints": endpoints,
+        }
+        text = json.dumps(result, ensure_ascii=False, indent=2)
+        if opts["out"]:
+            with open(opts["out"], "w", encoding="utf-8") as f:
+                f.write(text)
+            self.stdout.write(self.style.SUCCESS(f"Benchmark written: {opts['out']}"))
+        else:
+            self.stdout.write(text)
+
+    # ---- 적재 ----
+    def _timed(self, rows, fn):
+        with CaptureQueriesContext(connection) as ctx:
+            t0 = time.perf_counter()
+            message = fn()
+            elapsed = time.perf_counter() - t0
+        lines = (message or "").strip().splitlines()
+        return {
+            "rows": rows,
+            "seconds": round(elapsed, 3),
+            "rows_per_s": round(rows / elapsed, 1) if elapsed else None,
+            "queries": len(ctx.captured_queries),
+            "message": lines[-1] if lines else None,
+        }
+
+    def _command(self, name, *args, **kwargs):
+        def run():
+            out = io.StringIO()
+            call_command(name, *args, stdout=out, **kwargs)
+            return out.getvalue()
+        return run
+
+    def _bench_imports(self, data, paths, opts):
+        common = {"batch_size": opts["batch_size"], "workers": opts["workers"]}
+        n_areas, n_q = len(data.areas), len(data.quarters)
+        results = {}
+        results["trading_areas"] = self._timed(
+            n_areas, self._command("import_trading_areas_csv", paths["trading_areas"], **common)
+        )
+        results["change_index"] = self._timed(
+            n_areas * n_q, self._command("import_change_index_csv", paths["change_index"], **common)
+        )
+        results["industry_metrics"] = self._timed(
+            n_areas * n_q * len(data.industries),
+            self._command("import_industry_metrics_csv", paths["industry_metrics"], **common),
+        )
+        results["closures"] = self._timed(
+            len(data.districts) * len(CLOSURE_CATEGORIES),
+            self._command(
+                "import_closures_csv", paths["closures"],
+                signgu_nm_col="자치구별(1)", wide_year=data.years[-1],
+                melt_cols=",".join(CLOSURE_CATEGORIES), skip_total_row=True,
+                batch_size=opts["batch_size"],
+            ),
+        )
+        results["store_counts"] = self._timed(
+            n_areas * len(data.store_radii), lambda: self._load_store_counts(paths["store_counts"], opts)
+        )
+        results["store_points"] = self._timed(
+            n_areas * data.stores_per_area,
+            self._command("import_store_points_csv", paths["store_points"], build_index=True, **common),
+        )
+        return results
+
+    def _load_store_counts(self, path, opts):
+        """StoreCount는 CSV 적재 명령이 없어서 fetch_store_counts가 쓰는 것과 같은 형태로 직접 upsert"""
+        upserter = BulkUpserter(
+            StoreCount,
+            unique_fields=("trdar_cd", "radius"),
+            update_fields=("cx", "cy", "total", "counts_lcls", "counts_mcls", "counts_scls"),
+            batch_size=opts["batch_size"],
+            raw_source=StoreCount.RAW_SOURCE,
+        )
+        trdars, radii, category_rows = set(), set(), []
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                page = json.loads(line)
+                page["raw_data"] = page.pop("raw")
+                upserter.add(**page)
+                trdars.add(page["trdar_cd"])
+                radii.add(page["radius"])
+                category_rows.extend(category_count_rows(
+                    page["trdar_cd"], page["radius"], page["counts_lcls"], page["counts_mcls"], page["counts_scls"],
+                ))
+        upserter.flush()
+        replace_category_counts(trdars, radii, category_rows, batch_size=opts["batch_size"])
+        return f"[StoreCount] upserted: created={upserter.created}, updated={upserter.updated}"
+
+    # ---- 조회 ----
+    def _cases(self, data):
+        area = data.areas[0]
+        yyq, year = data.quarters[-1], data.years[-1]
+        signgu, adstrd = area["SIGNGU_CD"], area["ADSTRD_CD"]
+        mcls = next(iter(next(iter(STORE_CATEGORIES.values()))))
+        return [
+            ("industry_metrics.signgu", "/api/analytics/industry-metrics/", {"signgu_cd": signgu, "yyq": yyq}),
+            ("industry_metrics.signgu.no_items", "/api/analytics/industry-metrics/",
+             {"signgu_cd": signgu, "yyq": yyq, "items": 0}),
+            ("industry_metrics.adstrd", "/api/analytics/industry-metrics/", {"adstrd_cd": adstrd, "yyq": yyq}),
+            ("industry_metrics.city.items_page", "/api/analytics/industry-metrics/",
+             {"yyq": yyq, "include": "items", "limit": 100, "fields": "trdar_cd,svc_induty_cd,thsmon_selng_amt"}),
+            ("industry_metrics.city.no_items", "/api/analytics/industry-metrics/", {"yyq": yyq, "items": 0}),
+            ("industry_metrics.city.stream", "/api/analytics/industry-metrics/", {"yyq": yyq, "stream": 1}),
+            ("change_index.signgu", "/api/analytics/change-index/", {"signgu_cd": signgu, "yyq": yyq}),
+            ("change_index.adstrd", "/api/analytics/change-index/", {"adstrd_cd": adstrd, "yyq": yyq}),
+            ("change_index.city.no_items", "/api/analytics/change-index/", {"yyq": yyq, "items": 0}),
+            ("change_index.city.stream", "/api/analytics/change-index/", {"yyq": yyq, "stream": 1}),
+            ("timeseries.signgu", "/api/analytics/timeseries/",
+             {"signgu_cd": signgu, "yyq_from": data.quarters[0], "yyq_to": yyq}),
+            ("timeseries.trdar", "/api/analytics/timeseries/",
+             {"trdar_cd": area["TRDAR_CD"], "yyq_from": data.quarters[0], "yyq_to": yyq}),
+            ("closures.signgu_nm", "/api/analytics/closures/", {"signgu_nm": area["SIGNGU_CD_NM"], "year": year}),
+            ("closures.signgu_cd", "/api/analytics/closures/", {"signgu_cd": signgu, "year": year}),
+            ("store_counts.mcls", "/api/analytics/store-counts/",
+             {"trdar_cd": area["TRDAR_CD"], "radius": data.store_radii[-1], "group_by": "mcls"}),
+            ("store_counts.index_radius", "/api/analytics/store-counts/",
+             {"trdar_cd": area["TRDAR_CD"], "radius": 750, "group_by": "scls"}),
+            ("store_rankings.city", "/api/analytics/store-rankings/",
+             {"category": mcls, "radius": data.store_radii[-1], "limit": 20}),
+            ("store_rankings.signgu", "/api/analytics/store-rankings/",
+             {"category": mcls, "radius": data.store_radii[-1], "signgu_cd": signgu, "limit": 20}),
+        ]
+
+    def _bench_endpoints(self, data, opts):
+        client = Client()
+        results = {}
+        for name, url, params in self._cases(data):
+            for _ in range(opts["warmup"]):
+                client.get(url, params)
+            samples, queries, statuses = [], [], []
+            t_all = time.perf_counter()
+            for _ in range(max(1, opts["repeat"])):
+                with CaptureQueriesContext(connection) as ctx:
+                    t0 = time.perf_counter()
+                    resp = client.get(url, params)
+                    if resp.streaming:
+                        b"".join(resp.streaming_content)  # 스트리밍은 끝까지 받은 시간으로
+                    samples.append((time.perf_counter() - t0) * 1000)
+                queries.append(len(ctx.captured_queries))
+                statuses.append(resp.status_code)
+            stats = _latency_stats(samples, queries, statuses, time.perf_counter() - t_all)
+            results[name] = {"url": url, "params": params, **stats}
+        return results
@@ -0,0 +1,24 @@
+# analytics/management/commands/build_store_index.py
+import time
+from django.core.management.base import BaseCommand
+from analytics.services.store_index import StoreIndex, index_path
+from analytics.services.versioning import STORE_POINT, bump_version
+
+class Command(BaseCommand):
+    help = "StorePoint → 반경 검색용 KD-tree 인덱스 파일(store_index.npz) 생성"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--out", type=str, default=None, help="출력 파일 (기본: ANALYTICS_SNAPSHOT_DIR/store_index.npz)")
+
+    def handle(self, *args, **opts):
+        path = opts["out"] or index_path()
+        if not path:
+            self.stdout.write(self.style.ERROR("ANALYTICS_SNAPSHOT_DIR 미설정. --out으로 경로를 지정하세요."))
+            return
+        started = time.monotonic()
+        index = StoreIndex.from_db()
+        index.save(path)
+        bump_version(STORE_POINT)  # 뷰가 새 인덱스 파일로 답하므로 응답 캐시도 무효화
+        self.stdout.write(self.style.SUCCESS(
+            f"Store index written: {path} (stores={len(index)}, {time.monotonic() - started:.2f}s)"
+        ))
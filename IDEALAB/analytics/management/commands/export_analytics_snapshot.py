@@ -0,0 +1,128 @@
+# analytics/management/commands/export_analytics_snapshot.py
+import os
+import shutil
+import time
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+import numpy as np
+from analytics.models import TradingArea, ChangeIndex, IndustryMetric
+from analytics.services.snapshot import (
+    AMOUNT_DECIMALS, CURRENT_FILE, INDUSTRY_AMOUNT_FIELDS, NO_REGION, NOT_IN_TRADING_AREA, SNAPSHOT_DATASETS,
+    TMP_PREFIX, snapshot_root, write_snapshot,
+)
+from analytics.services.versioning import get_versions
+
+CHUNK = 5000
+
+
+def _dictionary(values):
+    """정렬된 문자열 사전 + {값: 인덱스}"""
+    items = sorted({v for v in values if v})
+    return items, {v: i for i, v in enumerate(items)}
+
+
+def _sorted_by_yyq(yyq_idx: np.ndarray, trdar_idx: np.ndarray, n_yyq: int):
+    """(yyq, trdar) 순 정렬 인덱스 + yyq별 offset (길이 n_yyq+1)"""
+    order = np.lexsort((trdar_idx, yyq_idx))
+    counts = np.bincount(yyq_idx, minlength=n_yyq)
+    offsets = np.concatenate(([0], np.cumsum(counts))).astype(np.int64)
+    return order, offsets
+
+
+class Command(BaseCommand):
+    help = "ChangeIndex/IndustryMetric을 컬럼형 NumPy 스냅샷으로 내보내기 (웹 워커가 mmap으로 집계)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--out", type=str, default=None, help="스냅샷 루트 (기본: settings.ANALYTICS_SNAPSHOT_DIR)")
+        parser.add_argument("--keep", type=int, default=2, help="남겨둘 이전 스냅샷 수")
+
+    def handle(self, *args, **opts):
+        root = opts["out"] or snapshot_root()
+        if not root:
+            self.stdout.write(self.style.ERROR("ANALYTICS_SNAPSHOT_DIR 미설정. --out으로 경로를 지정하세요."))
+            return
+        started = time.monotonic()
+        os.makedirs(root, exist_ok=True)
+
+        # 읽기 전에 버전을 먼저 — 읽는 도중 적재가 끝나면 스냅샷이 바로 stale로 판정됨 (DB 경로로)
+        versions = get_versions(SNAPSHOT_DATASETS)
+
+        # ---- 상권 사전 + 지역 매핑 ----
+        ta_rows = list(TradingArea.objects.values_list("trdar_cd", "signgu_cd", "adstrd_cd"))
+        ci_rows = list(ChangeIndex.objects.values_list("trdar_cd", "yyq", "change_score").iterator(chunk_size=CHUNK))
+        im_rows = list(
+            IndustryMetric.objects.values_list("trdar_cd", "yyq", *INDUSTRY_AMOUNT_FIELDS).iterator(chunk_size=CHUNK)
+        )
+
+        trdars, trdar_pos = _dictionary(
+            [r[0] for r in ta_rows] + [r[0] for r in ci_rows] + [r[0] for r in im_rows]
+        )
+        signgus, signgu_pos = _dictionary(r[1] for r in ta_rows)
+        adstrds, adstrd_pos = _dictionary(r[2] for r in ta_rows)
+
+        ta_signgu = np.full(len(trdars), NOT_IN_TRADING_AREA, dtype=np.int32)
+        ta_adstrd = np.full(len(trdars), NOT_IN_TRADING_AREA, dtype=np.int32)
+        for trdar_cd, signgu_cd, adstrd_cd in ta_rows:
+            i = trdar_pos[trdar_cd]
+            ta_signgu[i] = signgu_pos.get(signgu_cd, NO_REGION)
+            ta_adstrd[i] = adstrd_pos.get(adstrd_cd, NO_REGION)
+
+        # ---- ChangeIndex: 점수는 적재 시 저장한 change_score ----
+        ci_yyqs, ci_yyq_pos = _dictionary(r[1] for r in ci_rows)
+        ci_score = np.array([np.nan if r[2] is None else r[2] for r in ci_rows], dtype=np.float64)
+        ci_trdar = np.array([trdar_pos[r[0]] for r in ci_rows], dtype=np.int32)
+        ci_yyq = np.array([ci_yyq_pos[r[1]] for r in ci_rows], dtype=np.int32)
+        ci_order, ci_offsets = _sorted_by_yyq(ci_yyq, ci_trdar, len(ci_yyqs))
+
+        # ---- IndustryMetric ----
+        im_yyqs, im_yyq_pos = _dictionary(r[1] for r in im_rows)
+        im_trdar = np.array([trdar_pos[r[0]] for r in im_rows], dtype=np.int32)
+        im_yyq = np.array([im_yyq_pos[r[1]] for r in im_rows], dtype=np.int32)
+        im_order, im_offsets = _sorted_by_yyq(im_yyq, im_trdar, len(im_yyqs))
+        # 금액: Decimal을 10**AMOUNT_DECIMALS 배 정수로 (합계가 DB Sum과 정확히 같게) + NULL 마스크
+        amounts, nulls = {}, {}
+        for k, field in enumerate(INDUSTRY_AMOUNT_FIELDS):
+            vals = [r[2 + k] for r in im_rows]
+            amounts[field] = np.array(
+                [0 if v is None else int(v.scaleb(AMOUNT_DECIMALS)) for v in vals], dtype=np.int64
+            )[im_order]
+            nulls[field] = np.array([v is None for v in vals], dtype=bool)[im_order]
+
+        arrays = {
+            "ta_signgu": ta_signgu,
+            "ta_adstrd": ta_adstrd,
+            "ci_yyq_offsets": ci_offsets,
+            "ci_trdar": ci_trdar[ci_order],
+            "ci_score": ci_score[ci_order],
+            "im_yyq_offsets": im_offsets,
+            "im_trdar": im_trdar[im_order],
+            **{f"im_{field}": arr for field, arr in amounts.items()},
+            **{f"im_{field}_null": arr for field, arr in nulls.items()},
+        }
+        meta = {
+            "created_at": timezone.now().isoformat(),
+            "trdar": trdars,
+            "signgu": signgus,
+            "adstrd": adstrds,
+            "ci_yyq": ci_yyqs,
+            "im_yyq": im_yyqs,
+            "versions": versions,
+        }
+        name = timezone.now().strftime("%Y%m%dT%H%M%S%f")  # 같은 초에 두 번 내보내도 다른 폴더
+        path = write_snapshot(root, name, meta, arrays)
+        self._prune(root, keep=opts["keep"], current=name)
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Snapshot written: {path} (trdar={len(trdars)}, change_index={len(ci_rows)}, "
+            f"industry_metric={len(im_rows)}, {time.monotonic() - started:.2f}s)"
+        ))
+
+    def _prune(self, root, keep, current):
+        names = sorted(
+            d for d in os.listdir(root)
+            if d != current and d != CURRENT_FILE and not d.startswith(TMP_PREFIX)
+            and os.path.isdir(os.path.join(root, d))
+        )
+        # 이미 mmap으로 열려 있는 워커가 있어도 POSIX에서는 삭제해도 안전 (inode 유지)
+        for d in names[:max(0, len(names) - max(0, keep - 1))]:
+            shutil.rmtree(os.path.join(root, d), ignore_errors=True)
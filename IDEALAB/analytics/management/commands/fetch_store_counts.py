@@ -1,37 +1,50 @@
 # analytics/management/commands/fetch_store_counts.py
 
 import os
+import json
 import math
+import time
+import asyncio
 import requests
-from collections import Counter
 from django.core.management.base import BaseCommand
-from analytics.models import TradingArea, StoreCount
+from analytics.models import TradingArea
+from analytics.services.seoul_openapi import get_json_with_retry
+from analytics.services.store_counts import (
+    AsyncStoreCountFetcher, checkpoint_job, done_keys, mark_checkpoint, reset_checkpoints,
+    ring_counts, save_ring_counts, save_store_points, summarize,
+)
+from analytics.services.versioning import STORE_COUNT, STORE_POINT, bump_version
 
 SEOUL_STORE_API_BASE = os.getenv("SEOUL_STORE_API_BASE", "http://apis.data.go.kr/B553077/api/open/sdsc2")
 API_KEY = os.getenv("SEOUL_STORE_API_KEY")
 
-from pyproj import Transformer
-# TM중부(보정) → WGS84 (EPSG:2097 또는 5186 케이스에 맞춰 사용)
-_transformer = Transformer.from_crs("EPSG:2097", "EPSG:4326", always_xy=True)
-
-def tm_to_wgs84(x, y):
-    lon, lat = _transformer.transform(x, y)
-    return lon, lat
-
 class Command(BaseCommand):
     help = "반경 내 상가업소(서울) 집계 저장"
 
     def add_arguments(self, parser):
         parser.add_argument("--radius", type=int, default=2000)
+        parser.add_argument("--radii", type=str, default=None,
+                            help="반경 여러 개(쉼표구분, 예: 300,500,1000,2000) — 가장 큰 반경만 호출하고 안쪽은 거리로 계산")
         parser.add_argument("--trdar", type=str, default=None, help="특정 상권코드만")
         parser.add_argument("--api-key", type=str, default=None)
         parser.add_argument("--insecure", action="store_true", help="http 사용 강제")
         parser.add_argument("--verbose_fail", action="store_true")
+        # 비동기 모드: 상권 여러 개 동시 + 전역 토큰 버킷(data.go.kr 쿼터)
+        parser.add_argument("--async_mode", action="store_true", help="asyncio(httpx)로 상권 여러 개를 동시에 수집")
+        parser.add_argument("--concurrency", type=int, default=8, help="동시에 처리할 상권 수 (--async_mode)")
+        parser.add_argument("--rate", type=float, default=5.0, help="초당 최대 요청 수 (--async_mode, 전역)")
+        parser.add_argument("--burst", type=int, default=5, help="토큰 버킷 크기 (--async_mode)")
+        parser.add_argument("--retries", type=int, default=4, help="요청별 재시도 횟수 (--async_mode)")
+        parser.add_argument("--save_points", action="store_true",
+                            help="받은 점포를 StorePoint에도 upsert (로컬 반경 인덱스 갱신, 이후 build_store_index)")
+        # 체크포인트: 중단된 실행 이어서 하기
+        parser.add_argument("--resume", action="store_true", help="체크포인트에 done으로 남은 상권은 건너뜀")
 
     def handle(self, *args, **opts):
-        radius = opts["radius"]
+        radii = sorted({int(r) for r in (opts.get("radii") or "").split(",") if r.strip()}) or [opts["radius"]]
+        radius = radii[-1]  # API 호출 반경
         trdar_only = opts.get("trdar")
-        api_key = opts.get("api-key") or API_KEY
+        api_key = opts.get("api_key") or API_KEY
         if not api_key:
             self.stdout.write("SEOUL_STORE_API_KEY 미설정. export SEOUL_STORE_API_KEY=... 후 재시도")
             return
@@ -46,15 +59,32 @@ class Command(BaseCommand):
         else:
             ta_qs = TradingArea.objects.all()
 
+        job = checkpoint_job(radii)
+        if opts["resume"]:
+            skip = done_keys(job)
+            if skip:
+                self.stdout.write(f"[RESUME] 체크포인트 기준 {len(skip)}개 상권 건너뜀")
+        else:
+            if not trdar_only:
+                reset_checkpoints(job)
+            skip = set()
+
+        if opts["async_mode"]:
+            return self._handle_async(base, api_key, radii, ta_qs, skip, opts)
+
         created = updated = failed = 0
 
         for ta in ta_qs.iterator():
-            cx = float(ta.x) if getattr(ta, "x", None) is not None else None
-            cy = float(ta.y) if getattr(ta, "y", None) is not None else None
-            if cx is None or cy is None:
-                self.stdout.write(f"[SKIP] {ta.trdar_cd} {ta.trdar_cd_nm} -> 좌표(x,y) 없음")
+            if ta.trdar_cd in skip:
+                continue
+            # API 중심 좌표는 WGS84(경도/위도), 링 거리 계산은 TM(x/y)
+            if None in (ta.lon, ta.lat, ta.x, ta.y):
+                self.stdout.write(f"[SKIP] {ta.trdar_cd} {ta.trdar_cd_nm} -> 좌표(lon/lat) 없음")
                 continue
+            cx, cy = ta.lon, ta.lat
 
+            started = time.monotonic()
+            pages = 0
             try:
                 # 첫 페이지 호출(샘플 + totalCount 파악)
                 params = {
@@ -67,64 +97,85 @@ class Command(BaseCommand):
                     "numOfRows": 1000,  # 가능한 큰 값
                 }
                 url = f"{base}/storeListInRadius"
-                r = requests.get(url, params=params, timeout=30)
-                r.raise_for_status()
-                data = r.json()
+                data = get_json_with_retry(url, params=params, timeout=30)
+                pages += 1
 
                 body = (data or {}).get("body") or {}
                 items = body.get("items") or []
                 total = int(body.get("totalCount") or 0)
                 num = int(body.get("numOfRows") or 0)
 
-                # 카운터 준비
-                c_l = Counter()
-                c_m = Counter()
-                c_s = Counter()
-
-                # 첫 페이지 반영
-                for it in items:
-                    c_l[it.get("indsLclsNm")] += 1
-                    c_m[it.get("indsMclsNm")] += 1
-                    c_s[it.get("indsSclsNm")] += 1
+                items = list(items)
 
                 # 다음 페이지들
                 if total > num > 0:
                     pages = math.ceil(total / num)
                     for page in range(2, pages + 1):
                         params["pageNo"] = page
-                        rr = requests.get(url, params=params, timeout=30)
-                        rr.raise_for_status()
-                        dd = rr.json()
+                        dd = get_json_with_retry(url, params=params, timeout=30)
                         bb = (dd or {}).get("body") or {}
-                        its = bb.get("items") or []
-                        for it in its:
-                            c_l[it.get("indsLclsNm")] += 1
-                            c_m[it.get("indsMclsNm")] += 1
-                            c_s[it.get("indsSclsNm")] += 1
-
-                # DB upsert
-                obj, is_created = StoreCount.objects.update_or_create(
-                    trdar_cd=ta.trdar_cd, radius=radius,
-                    defaults={
-                        "cx": cx, "cy": cy,
-                        "total": total,
-                        # raw는 첫 페이지만 샘플로 저장
-                        "raw_data": data,
-                        "counts_lcls": dict(c_l),
-                        "counts_mcls": dict(c_m),
-                        "counts_scls": dict(c_s),
-                    }
-                )
-                created += 1 if is_created else 0
-                updated += 0 if is_created else 1
-
-            except requests.RequestException as e:
-                failed += 1
-                if opts["verbose_fail"]:
-                    self.stdout.write(f"[FAIL] {ta.trdar_cd} {ta.trdar_cd_nm} -> {e}")
-            except ValueError as e:
+                        items.extend(bb.get("items") or [])
+
+                # 반경별 누적 집계 → 한 번에 upsert (raw는 첫 페이지만 샘플로 RawPayload에)
+                rings = ring_counts(items, ta.x, ta.y, radii)
+                n_created = save_ring_counts(ta.trdar_cd, cx, cy, rings, total, data)
+                if opts["save_points"] and items:
+                    save_store_points(items)
+                created += n_created
+                updated += len(rings) - n_created
+                mark_checkpoint(job, ta.trdar_cd, True, pages=pages,
+                                elapsed_ms=int((time.monotonic() - started) * 1000))
+
+            except (requests.RequestException, ValueError) as e:
                 failed += 1
+                mark_checkpoint(job, ta.trdar_cd, False, pages=pages,
+                                elapsed_ms=int((time.monotonic() - started) * 1000), error=str(e))
                 if opts["verbose_fail"]:
                     self.stdout.write(f"[FAIL] {ta.trdar_cd} {ta.trdar_cd_nm} -> {e}")
 
+        self._bump(created + updated, opts)
         self.stdout.write(f"Done. created={created}, updated={updated}, failed={failed}")
+
+    def _handle_async(self, base, api_key, radii, ta_qs, skip, opts):
+        areas = []
+        for trdar_cd, trdar_nm, lon, lat, x, y in ta_qs.values_list("trdar_cd", "trdar_cd_nm", "lon", "lat", "x", "y"):
+            if trdar_cd in skip:
+                continue
+            if None in (lon, lat, x, y):
+                self.stdout.write(f"[SKIP] {trdar_cd} {trdar_nm} -> 좌표(lon/lat) 없음")
+                continue
+            areas.append((trdar_cd, lon, lat, x, y))
+
+        def on_result(res):
+            if not res.ok and opts["verbose_fail"]:
+                self.stdout.write(f"[FAIL] {res.trdar_cd} -> {res.error}")
+
+        fetcher = AsyncStoreCountFetcher(
+            base, api_key, radii,
+            concurrency=opts["concurrency"],
+            rate=opts["rate"],
+            burst=opts["burst"],
+            retries=opts["retries"],
+            save_points=opts["save_points"],
+            on_result=on_result,
+        )
+        started = time.monotonic()
+        results = asyncio.run(fetcher.run(areas))
+        summary = summarize(results, time.monotonic() - started)
+
+        self.stdout.write(json.dumps(summary, ensure_ascii=False, indent=2))
+        created = summary["created"]
+        self._bump(summary["rows"], opts)
+        self.stdout.write(
+            f"Done. created={created}, updated={summary['rows'] - created}, failed={summary['failed']}"
+        )
+        if summary["failed"]:
+            self.stdout.write("실패한 상권만 다시 받으려면 --resume 으로 재실행")
+
+    def _bump(self, rows, opts):
+        """저장한 행이 있으면 응답 캐시 무효화 (--save_points면 점포도)"""
+        if not rows:
+            return
+        bump_version(STORE_COUNT)
+        if opts["save_points"]:
+            bump_version(STORE_POINT)
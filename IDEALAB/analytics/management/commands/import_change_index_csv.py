@@ -1,78 +1,86 @@
 from django.core.management.base import BaseCommand
 from analytics.models import ChangeIndex
-from analytics.services.csv_loader import read_csv_rows
-import re
+from analytics.services.csv_loader import iter_records, BulkUpserter, DEFAULT_BATCH_SIZE
+from analytics.services.csv_schema import CsvSchemaError
+from analytics.services.import_manifest import ImportTracker
+from analytics.services.import_schemas import change_index_schema
+from analytics.services.versioning import CHANGE_INDEX, bump_version
+from analytics.utils import resolve_change_score
 
-def to_snake(s: str) -> str:
-    s = re.sub(r"[^\w]+", "_", s)
-    s = re.sub(r"_+", "_", s)
-    return s.strip("_").lower()
-
-def to_float_or_none(v):
-    if v is None:
-        return None
-    t = str(v).strip().replace(",", "")
-    if t == "" or t.upper() == "NULL":
-        return None
-    try:
-        return float(t)
-    except Exception:
-        return None
 
 class Command(BaseCommand):
-    help = "CSV에서 상권변화지표 전 컬럼을 ChangeIndex.raw_data에 저장 + 핵심 필드 저장"
+    help = "CSV에서 상권변화지표 전 컬럼을 원본 payload(RawPayload)로 저장 + 핵심 필드 저장"
 
     def add_arguments(self, parser):
         parser.add_argument("csv_path", type=str, help="CSV 파일 경로")
-        parser.add_argument("--encoding", type=str, default="cp949")
+        parser.add_argument("--encoding", type=str, default="auto", help="auto(기본: BOM/utf-8/cp949 판별) 또는 코덱명")
         # 컬럼명 지정 (없으면 자동 탐색)
         parser.add_argument("--yyq_col", type=str, help="기준_년분기_코드 / STDR_YYQU_CD")
         parser.add_argument("--trdar_col", type=str, help="상권_코드 / TRDAR_CD")
         parser.add_argument("--idx_col", type=str, help="상권_변화_지표 / CHG_IDX")
         parser.add_argument("--lvl_col", type=str, help="상권_변화_지표_등급 등")
+        parser.add_argument("--batch_size", type=int, default=DEFAULT_BATCH_SIZE, help="한 트랜잭션에 기록할 행 수")
+        parser.add_argument("--workers", type=int, default=1, help="CSV 파싱 프로세스 수 (1이면 순차)")
+        parser.add_argument("--force", action="store_true", help="매니페스트/행 해시를 무시하고 전체 재적재")
 
     def handle(self, *args, **opts):
         path = opts["csv_path"]
         encoding = opts["encoding"]
-        yyq_col = opts.get("yyq_col")
-        trdar_col = opts.get("trdar_col")
-        idx_col = opts.get("idx_col")
-        lvl_col = opts.get("lvl_col")
-
-        created = updated = 0
-
-        for r in read_csv_rows(path, encoding=encoding):
-            # 키 탐색
-            yyq = r.get(yyq_col or "기준_년분기_코드") or r.get("STDR_YYQU_CD")
-            trdar = r.get(trdar_col or "상권_코드") or r.get("TRDAR_CD")
-            if not yyq or not trdar:
-                self.stdout.write(self.style.WARNING(f"Skip row (missing keys): {r}"))
-                continue
+        schema = change_index_schema(
+            yyq_col=opts.get("yyq_col"),
+            trdar_col=opts.get("trdar_col"),
+            idx_col=opts.get("idx_col"),
+            lvl_col=opts.get("lvl_col"),
+        )
 
-            # 지표/등급 탐색
-            idx_val = r.get(idx_col or "상권_변화_지표") or r.get("CHG_IDX")
-            lvl_val = r.get(lvl_col or "상권_변화_지표_등급") or r.get("CHG_LVL")
+        tracker = ImportTracker("change_index", path, force=opts["force"]).begin()
+        if tracker.already_done:
+            self.stdout.write(self.style.WARNING(
+                "[ChangeIndex] 이미 적재 완료된 파일입니다(checksum 동일). 다시 쓰려면 --force"
+            ))
+            return
+        if tracker.resume_from:
+            self.stdout.write(f"[ChangeIndex] 중단된 적재 재개: {tracker.resume_from}행 이후부터")
 
-            std = {
-                "yyq": str(yyq).strip(),
-                "trdar_cd": str(trdar).strip(),
-                "change_index": to_float_or_none(idx_val),
-                "change_level": str(lvl_val).strip() if lvl_val else None,
-            }
+        upserter = BulkUpserter(
+            ChangeIndex,
+            unique_fields=("trdar_cd", "yyq"),
+            update_fields=("change_index", "change_level", "change_code", "change_score"),
+            batch_size=opts["batch_size"],
+            tracker=tracker,
+            raw_source=ChangeIndex.RAW_SOURCE,
+        )
 
-            # raw_data 저장: 원본 + snake
-            raw_store = {"original": dict(r), "snake": {}}
-            for k, v in r.items():
-                raw_store["snake"][to_snake(k)] = v
+        skipped = 0
+        try:
+            records = iter_records(path, schema, encoding=encoding, workers=opts["workers"])
+            for pos, rec in enumerate(records, 1):
+                if pos <= tracker.resume_from:
+                    continue
+                tracker.advance(pos)
+                if rec is None:
+                    skipped += 1
+                    continue
+                row = schema.as_dict(rec)
+                # 레벨이 없으면 코드로 유추, 점수까지 컬럼으로 (뷰와 같은 규칙)
+                row["change_level"], row["change_score"] = resolve_change_score(row["change_code"], row["change_level"])
+                upserter.add(**row)
 
-            obj, is_created = ChangeIndex.objects.update_or_create(
-                yyq=std["yyq"],
-                trdar_cd=std["trdar_cd"],
-                defaults={**std, "raw_data": raw_store},
-            )
-            created += int(is_created)
-            updated += int(not is_created)
+            upserter.flush()
+        except CsvSchemaError as e:
+            tracker.fail()
+            self.stdout.write(self.style.ERROR(f"[ChangeIndex] {e}"))
+            return
+        except BaseException:
+            tracker.fail()
+            raise
+        tracker.finish()
+        if tracker.resume_from or upserter.created or upserter.updated:
+            bump_version(CHANGE_INDEX)
 
+        if skipped:
+            self.stdout.write(self.style.WARNING(f"Skip rows (missing keys): {skipped}"))
         self.stdout.write(self.style.SUCCESS(
-            f"[ChangeIndex] upserted: created={created}, updated={updated}"
+            f"[ChangeIndex] upserted: created={upserter.created}, updated={upserter.updated}, "
+            f"unchanged={upserter.unchanged}, batches={upserter.batches}"
         ))
@@ -1,27 +1,21 @@
 # analytics/management/commands/import_closures_csv.py
 from django.core.management.base import BaseCommand
 from analytics.models import ClosureStat
-from analytics.services.csv_loader import read_csv_rows
+from analytics.services.csv_loader import iter_records, BulkUpserter, DEFAULT_BATCH_SIZE
+from analytics.services.csv_schema import CsvSchemaError, read_header
+from analytics.services.import_schemas import closures_wide_schema, closures_long_schema
+from analytics.services.versioning import CLOSURE_STAT, bump_version
 try:
     from analytics.services.region import name_to_signgu_cd
 except Exception:
     def name_to_signgu_cd(x): return None
 
-def _int_or_none(x):
-    try:
-        return int(str(x).replace(",", "").strip())
-    except Exception:
-        return None
-
-def _clean(s):
-    return str(s).strip().replace('"', '').replace("'", '')
-
 class Command(BaseCommand):
     help = "자치구/행정동 폐업 CSV 업로드"
 
     def add_arguments(self, parser):
         parser.add_argument("csv_path")
-        parser.add_argument("--encoding", default="utf-8")
+        parser.add_argument("--encoding", default="auto", help="auto(기본: BOM/utf-8/cp949 판별) 또는 코덱명")
         # 세로형: 'year'가 각 행에 있거나, 혹은 wide형처럼 한 해 전체일 수 있음
         parser.add_argument("--year", type=int)            # 세로형일 때 연도 고정
         parser.add_argument("--year_col")                  # 세로형일 때 연도 칼럼명
@@ -34,6 +28,7 @@ class Command(BaseCommand):
         parser.add_argument("--signgu_nm_col", required=True)
         parser.add_argument("--count_col")                 # 세로형일 때 값 칼럼
         parser.add_argument("--category_col")              # 세로형일 때 카테고리 칼럼
+        parser.add_argument("--batch_size", type=int, default=DEFAULT_BATCH_SIZE)
 
     def handle(self, *args, **opts):
         path       = opts["csv_path"]
@@ -48,74 +43,72 @@ class Command(BaseCommand):
         melt_cols  = [c.strip() for c in (opts.get("melt_cols") or "").split(",") if c.strip()]
         skip_total = opts.get("skip_total_row")
 
-        created = updated = skipped = 0
-
-        if wide_year:
-            # 가로형: 예) 자치구 | 전체 | 외식업 | 서비스업 | 소매업
-            for r in read_csv_rows(path, encoding=encoding):
-                name = _clean(r.get(signgu_nm_col, ""))
-                if not name:
-                    skipped += 1
-                    continue
-                if skip_total and name == "서울시":
-                    skipped += 1
-                    continue
+        skipped = 0
+        upserter = BulkUpserter(
+            ClosureStat,
+            unique_fields=("year", "signgu_cd_nm", "category"),
+            update_fields=("signgu_cd", "closures"),
+            batch_size=opts["batch_size"],
+            raw_source=ClosureStat.RAW_SOURCE,
+        )
 
-                for cat in melt_cols:
-                    if cat not in r:
+        try:
+            if wide_year:
+                # 가로형: 예) 자치구 | 전체 | 외식업 | 서비스업 | 소매업
+                header = set(read_header(path, encoding))
+                cats = [c for c in melt_cols if c in header]
+                schema = closures_wide_schema(signgu_nm_col, cats)
+                for rec in iter_records(path, schema, encoding=encoding):
+                    if rec is None:
+                        skipped += 1
+                        continue
+                    name, raw = rec[0], rec[-1]
+                    if skip_total and name == "서울시":
+                        skipped += 1
+                        continue
+                    signgu_cd = name_to_signgu_cd(name)
+                    for cat, closures in zip(cats, rec[1:-1]):
+                        # 조회 키에 category 포함! (중복 방지 핵심)
+                        upserter.add(
+                            year=wide_year,
+                            signgu_cd_nm=name,
+                            category=cat,
+                            signgu_cd=signgu_cd,
+                            closures=closures,
+                            raw_data=raw,
+                        )
+            else:
+                # 세로형 일반 포맷
+                schema = closures_long_schema(signgu_nm_col, year_col, category_col, count_col)
+                for rec in iter_records(path, schema, encoding=encoding):
+                    if rec is None:
+                        skipped += 1
+                        continue
+                    row = schema.as_dict(rec)
+                    y = year or row["year"]
+                    if not y:
+                        skipped += 1
                         continue
-                    closures = _int_or_none(r.get(cat))
-                    # 조회 키에 category 포함! (중복 방지 핵심)
-                    lookup = dict(
-                        year=wide_year,
+                    name = row["signgu_cd_nm"]
+                    if skip_total and name == "서울시":
+                        skipped += 1
+                        continue
+                    upserter.add(
+                        year=y,
                         signgu_cd_nm=name,
-                        category=cat,
-                    )
-                    defaults = dict(
+                        category=row["category"] or "전체",   # ← 여기 포함
                         signgu_cd=name_to_signgu_cd(name),
-                        closures=closures,
-                        raw_data=r,
-                    )
-                    obj, is_created = ClosureStat.objects.update_or_create(
-                        **lookup, defaults=defaults
+                        closures=row["closures"],
+                        raw_data=row["raw_data"],
                     )
-                    created += int(is_created)
-                    updated += int(not is_created)
-
-        else:
-            # 세로형 일반 포맷
-            for r in read_csv_rows(path, encoding=encoding):
-                y = year or _int_or_none(r.get(year_col))
-                if not y:
-                    skipped += 1
-                    continue
-                name = _clean(r.get(signgu_nm_col, ""))
-                if not name:
-                    skipped += 1
-                    continue
-                if skip_total and name == "서울시":
-                    skipped += 1
-                    continue
-
-                cat = _clean(r.get(category_col) or "전체")
-                val = _int_or_none(r.get(count_col))
-                lookup = dict(
-                    year=y,
-                    signgu_cd_nm=name,
-                    category=cat,   # ← 여기 포함
-                )
-                defaults = dict(
-                    signgu_cd=name_to_signgu_cd(name),
-                    closures=val,
-                    raw_data=r,
-                )
-                obj, is_created = ClosureStat.objects.update_or_create(
-                    **lookup, defaults=defaults
-                )
-                created += int(is_created)
-                updated += int(not is_created)
+        except CsvSchemaError as e:
+            self.stdout.write(self.style.ERROR(f"[ClosureStat] {e}"))
+            return
 
+        upserter.flush()
+        if upserter.created or upserter.updated:
+            bump_version(CLOSURE_STAT)
         self.stdout.write(self.style.SUCCESS(
-            f"[ClosureStat] upserted: created={created}, updated={updated}, skipped={skipped}"
+            f"[ClosureStat] upserted: created={upserter.created}, updated={upserter.updated}, skipped={skipped}"
         ))
         
\ No newline at end of file
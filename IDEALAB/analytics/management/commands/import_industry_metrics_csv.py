@@ -1,48 +1,92 @@
 # analytics/management/commands/import_industry_metrics_csv.py
 from django.core.management.base import BaseCommand
 from analytics.models import IndustryMetric
-from analytics.services.csv_loader import read_csv_rows, to_decimal_safe
+from analytics.services.csv_loader import iter_records, BulkUpserter, DEFAULT_BATCH_SIZE
+from analytics.services.csv_schema import CsvSchemaError
+from analytics.services.import_manifest import ImportTracker
+from analytics.services.import_schemas import industry_metric_schema
+from analytics.services.rollups import rebuild_industry_rollup
+from analytics.services.versioning import INDUSTRY_METRIC, bump_version
 
 class Command(BaseCommand):
     help = "업종/상권 분기 매출 CSV 적재 (VwsmTrdarSelngQq 다운본 등)"
 
     def add_arguments(self, parser):
         parser.add_argument("csv_path", type=str)
+        parser.add_argument("--encoding", type=str, default="auto", help="auto(기본: BOM/utf-8/cp949 판별) 또는 코덱명")
         parser.add_argument("--yyq_col", type=str, default="STDR_YYQU_CD")   # 예: 2023Q4
         parser.add_argument("--trdar_col", type=str, default="TRDAR_CD")
         parser.add_argument("--svc_cd_col", type=str, default="SVC_INDUTY_CD")
         parser.add_argument("--svc_nm_col", type=str, default="SVC_INDUTY_CD_NM")
         parser.add_argument("--amt_col", type=str, default="THSMON_SELNG_AMT")
         parser.add_argument("--cnt_col", type=str, default="THSMON_SELNG_CO")
+        parser.add_argument("--batch_size", type=int, default=DEFAULT_BATCH_SIZE, help="한 트랜잭션에 기록할 행 수")
+        parser.add_argument("--workers", type=int, default=1, help="CSV 파싱 프로세스 수 (1이면 순차)")
+        parser.add_argument("--force", action="store_true", help="매니페스트/행 해시를 무시하고 전체 재적재")
 
     def handle(self, *args, **opts):
         path = opts["csv_path"]
-        yyq_col = opts["yyq_col"]
-        trdar_col = opts["trdar_col"]
-        svc_cd_col = opts["svc_cd_col"]
-        svc_nm_col = opts["svc_nm_col"]
-        amt_col = opts["amt_col"]
-        cnt_col = opts["cnt_col"]
-
-        created = updated = 0
-        for r in read_csv_rows(path):
-            trdar = (r.get(trdar_col) or "").strip()
-            yyq = (r.get(yyq_col) or "").strip()
-            if not trdar or not yyq:
-                continue
-
-            defaults = {
-                "svc_induty_cd": r.get(svc_cd_col) or None,
-                "svc_induty_cd_nm": r.get(svc_nm_col) or None,
-                "thsmon_selng_amt": to_decimal_safe(r.get(amt_col)),
-                "thsmon_selng_co": to_decimal_safe(r.get(cnt_col)),
-                "mdwk_selng_amt": to_decimal_safe(r.get("MDWK_SELNG_AMT")),
-                "wkend_selng_amt": to_decimal_safe(r.get("WKEND_SELNG_AMT")),
-            }
-            obj, is_created = IndustryMetric.objects.update_or_create(
-                trdar_cd=trdar, yyq=yyq, svc_induty_cd=defaults["svc_induty_cd"], defaults=defaults
-            )
-            created += int(is_created)
-            updated += int(not is_created)
-
-        self.stdout.write(self.style.SUCCESS(f"[IndustryMetric] upserted: created={created}, updated={updated}"))
+        schema = industry_metric_schema(
+            yyq_col=opts["yyq_col"],
+            trdar_col=opts["trdar_col"],
+            svc_cd_col=opts["svc_cd_col"],
+            svc_nm_col=opts["svc_nm_col"],
+            amt_col=opts["amt_col"],
+            cnt_col=opts["cnt_col"],
+        )
+
+        tracker = ImportTracker("industry_metric", path, force=opts["force"]).begin()
+        if tracker.already_done:
+            self.stdout.write(self.style.WARNING(
+                "[IndustryMetric] 이미 적재 완료된 파일입니다(checksum 동일). 다시 쓰려면 --force"
+            ))
+            return
+        if tracker.resume_from:
+            self.stdout.write(f"[IndustryMetric] 중단된 적재 재개: {tracker.resume_from}행 이후부터")
+
+        yyqs = set()  # 롤업을 다시 만들 분기 (실제로 쓴 행의 분기만 — 해시가 같아 건너뛴 행은 제외)
+        upserter = BulkUpserter(
+            IndustryMetric,
+            unique_fields=("trdar_cd", "yyq", "svc_induty_cd"),
+            update_fields=(
+                "svc_induty_cd_nm",
+                "thsmon_selng_amt", "thsmon_selng_co",
+                "mdwk_selng_amt", "wkend_selng_amt",
+            ),
+            batch_size=opts["batch_size"],
+            tracker=tracker,
+            on_batch=lambda written: yyqs.update(values["yyq"] for values in written.values()),
+        )
+        try:
+            records = iter_records(path, schema, encoding=opts["encoding"], workers=opts["workers"])
+            for pos, rec in enumerate(records, 1):
+                if pos <= tracker.resume_from:
+                    continue
+                tracker.advance(pos)
+                if rec is None:
+                    continue
+                upserter.add(**schema.as_dict(rec))
+
+            upserter.flush()
+        except CsvSchemaError as e:
+            tracker.fail()
+            self.stdout.write(self.style.ERROR(f"[IndustryMetric] {e}"))
+            return
+        except BaseException:
+            tracker.fail()
+            raise
+        tracker.finish()
+
+        # 바뀐 행이 있던 분기만 지역 합계 재생성 (재개한 적재면 앞부분 분기를 모르니 전체)
+        rollup = 0
+        if tracker.resume_from:
+            rollup = rebuild_industry_rollup(batch_size=opts["batch_size"])
+        elif upserter.created or upserter.updated:
+            rollup = rebuild_industry_rollup(yyqs, batch_size=opts["batch_size"])
+        if tracker.resume_from or upserter.created or upserter.updated:
+            bump_version(INDUSTRY_METRIC)
+
+        self.stdout.write(self.style.SUCCESS(
+            f"[IndustryMetric] upserted: created={upserter.created}, updated={upserter.updated}, "
+            f"unchanged={upserter.unchanged}, batches={upserter.batches}, rollup_rows={rollup}"
+        ))
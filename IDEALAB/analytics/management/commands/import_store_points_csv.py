@@ -0,0 +1,51 @@
+# analytics/management/commands/import_store_points_csv.py
+import time
+from django.core.management import call_command
+from django.core.management.base import BaseCommand
+from analytics.services.csv_loader import iter_records, DEFAULT_BATCH_SIZE
+from analytics.services.csv_schema import CsvSchemaError
+from analytics.services.import_schemas import store_point_schema
+from analytics.services.store_index import add_store_points, store_point_upserter
+from analytics.services.versioning import STORE_POINT, bump_version
+
+class Command(BaseCommand):
+    help = "소상공인 상가(상권)정보 CSV 덤프 → StorePoint 적재 (경도/위도 → TM 좌표)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("csv_path", type=str)
+        parser.add_argument("--encoding", type=str, default="auto", help="auto(기본: BOM/utf-8/cp949 판별) 또는 코덱명")
+        parser.add_argument("--batch_size", type=int, default=DEFAULT_BATCH_SIZE, help="한 트랜잭션에 기록할 행 수")
+        parser.add_argument("--workers", type=int, default=1, help="CSV 파싱 프로세스 수 (1이면 순차)")
+        parser.add_argument("--build_index", action="store_true", help="적재 후 build_store_index 실행")
+
+    def handle(self, *args, **opts):
+        path = opts["csv_path"]
+        started = time.monotonic()
+        upserter = store_point_upserter(opts["batch_size"])
+        schema = store_point_schema()
+        skipped = 0
+        pending = []
+        try:
+            for rec in iter_records(path, schema, encoding=opts["encoding"], workers=opts["workers"]):
+                if rec is None:
+                    skipped += 1
+                    continue
+                pending.append(schema.as_dict(rec))
+                # 좌표 변환은 배치 단위로 (pyproj 배열 호출)
+                if len(pending) >= upserter.batch_size:
+                    add_store_points(upserter, pending)
+                    pending = []
+            add_store_points(upserter, pending)
+        except CsvSchemaError as e:
+            self.stdout.write(self.style.ERROR(f"[StorePoint] {e}"))
+            return
+
+        upserter.flush()
+        if upserter.created or upserter.updated:
+            bump_version(STORE_POINT)
+        self.stdout.write(self.style.SUCCESS(
+            f"[StorePoint] upserted: created={upserter.created}, updated={upserter.updated}, "
+            f"skipped={skipped} ({time.monotonic() - started:.1f}s)"
+        ))
+        if opts["build_index"]:
+            call_command("build_store_index", stdout=self.stdout)
@@ -1,37 +1,50 @@
 # analytics/management/commands/import_trading_areas_csv.py
 from django.core.management.base import BaseCommand
 from analytics.models import TradingArea
-from analytics.services.csv_loader import read_csv_rows
+from analytics.services.csv_loader import iter_records, BulkUpserter, DEFAULT_BATCH_SIZE
+from analytics.services.csv_schema import CsvSchemaError
+from analytics.services.import_schemas import trading_area_schema
+from analytics.services.rollups import rebuild_industry_rollup
+from analytics.services.trading_areas import fill_lonlat
+from analytics.services.versioning import TRADING_AREA, bump_version
 
 class Command(BaseCommand):
     help = "CSV로 상권(소권역) 마스터 적재"
 
     def add_arguments(self, parser):
         parser.add_argument("csv_path", type=str)
+        parser.add_argument("--encoding", type=str, default="auto", help="auto(기본: BOM/utf-8/cp949 판별) 또는 코덱명")
+        parser.add_argument("--batch_size", type=int, default=DEFAULT_BATCH_SIZE, help="한 트랜잭션에 기록할 행 수")
+        parser.add_argument("--workers", type=int, default=1, help="CSV 파싱 프로세스 수 (1이면 순차)")
 
     def handle(self, *args, **opts):
         path = opts["csv_path"]
-        created = updated = 0
-        for r in read_csv_rows(path):
-            trdar_cd = (r.get("TRDAR_CD") or r.get("trdar_cd") or "").strip()
-            if not trdar_cd:
-                continue
+        upserter = BulkUpserter(
+            TradingArea,
+            unique_fields=("trdar_cd",),
+            update_fields=(
+                "trdar_cd_nm", "trdar_se_cd", "trdar_se_cd_nm", "x", "y",
+                "signgu_cd", "signgu_cd_nm", "adstrd_cd", "adstrd_cd_nm", "area_m2",
+            ),
+            batch_size=opts["batch_size"],
+        )
+        schema = trading_area_schema()
+        try:
+            for rec in iter_records(path, schema, encoding=opts["encoding"], workers=opts["workers"]):
+                if rec is None:
+                    continue
+                upserter.add(**schema.as_dict(rec))
+        except CsvSchemaError as e:
+            self.stdout.write(self.style.ERROR(f"TradingArea: {e}"))
+            return
 
-            defaults = {
-                "trdar_cd_nm": r.get("TRDAR_CD_NM") or r.get("name"),
-                "trdar_se_cd": r.get("TRDAR_SE_CD"),
-                "trdar_se_cd_nm": r.get("TRDAR_SE_CD_NM"),
-                "x": float(r["XCNTS_VALUE"]) if r.get("XCNTS_VALUE") else None,
-                "y": float(r["YDNTS_VALUE"]) if r.get("YDNTS_VALUE") else None,
-                "signgu_cd": r.get("SIGNGU_CD"),
-                "signgu_cd_nm": r.get("SIGNGU_CD_NM"),
-                "adstrd_cd": r.get("ADSTRD_CD"),
-                "adstrd_cd_nm": r.get("ADSTRD_CD_NM"),
-                "area_m2": float(r["RELM_AR"]) if r.get("RELM_AR") else None,
-            }
-            obj, is_created = TradingArea.objects.update_or_create(
-                trdar_cd=trdar_cd, defaults=defaults
-            )
-            created += int(is_created)
-            updated += int(not is_created)
-        self.stdout.write(self.style.SUCCESS(f"TradingArea upserted: created={created}, updated={updated}"))
+        upserter.flush()
+        # x/y → lon/lat 일괄 변환 (배열 한 번에)
+        lonlat = fill_lonlat(batch_size=opts["batch_size"])
+        if upserter.created or upserter.updated:
+            rebuild_industry_rollup(batch_size=opts["batch_size"])  # 지역 코드 변경 반영
+        if upserter.created or upserter.updated or lonlat:
+            bump_version(TRADING_AREA)
+        self.stdout.write(self.style.SUCCESS(
+            f"TradingArea upserted: created={upserter.created}, updated={upserter.updated}, lonlat={lonlat}"
+        ))
@@ -0,0 +1,21 @@
+# analytics/management/commands/rebuild_industry_rollup.py
+import time
+from django.core.management.base import BaseCommand
+from analytics.services.csv_loader import DEFAULT_BATCH_SIZE
+from analytics.services.rollups import rebuild_industry_rollup
+from analytics.services.versioning import INDUSTRY_METRIC, bump_version
+
+class Command(BaseCommand):
+    help = "IndustryMetric → 지역/분기/업종 합계(IndustryRollup) 재생성"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--yyq", action="append", default=None, help="특정 분기만 (여러 번 지정 가능, 기본: 전체)")
+        parser.add_argument("--batch_size", type=int, default=DEFAULT_BATCH_SIZE)
+
+    def handle(self, *args, **opts):
+        started = time.monotonic()
+        written = rebuild_industry_rollup(opts["yyq"], batch_size=opts["batch_size"])
+        bump_version(INDUSTRY_METRIC)
+        self.stdout.write(self.style.SUCCESS(
+            f"IndustryRollup rebuilt: rows={written} ({time.monotonic() - started:.2f}s)"
+        ))
@@ -1,12 +1,22 @@
 # analytics/management/commands/sync_trading_areas.py
-from django.core.management.base import BaseCommand
-from django.db import transaction
+from django.core.management.base import BaseCommand, CommandError
 from analytics.models import TradingArea
-from analytics.services.seoul_openapi import iter_TbgisTrdarRelm
+from analytics.services.csv_loader import DEFAULT_BATCH_SIZE
+from analytics.services.rollups import rebuild_industry_rollup
+from analytics.services.seoul_openapi import iter_TbgisTrdarRelm, DEFAULT_WORKERS
+from analytics.services.trading_areas import IncompleteSyncError, fill_lonlat, sync_rows
+from analytics.services.versioning import TRADING_AREA, bump_version
 
 class Command(BaseCommand):
     help = "서울시 상권영역(TbgisTrdarRelm) 동기화"
 
+    def add_arguments(self, parser):
+        parser.add_argument("--page_size", type=int, default=1000, help="페이지당 행 수 (API 최대 1000)")
+        parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS, help="동시 페이지 요청 수 (1이면 순차)")
+        parser.add_argument("--batch_size", type=int, default=DEFAULT_BATCH_SIZE, help="한 번에 커밋할 행 수")
+        parser.add_argument("--delete_missing", action="store_true",
+                            help="API 응답에 없는 상권 삭제 (모든 페이지가 정상이고 건수가 list_total_count와 같을 때만)")
+
     def handle(self, *args, **options):
         self.stdout.write("Fetching TbgisTrdarRelm...")
 
@@ -14,7 +24,7 @@ class Command(BaseCommand):
 
         # ✅ 모델 실제 필드명에 맞춘 매핑
         mapping_candidates = {
-            # pk는 trdar_cd (update_or_create에서 별도 지정)
+            # pk는 trdar_cd (sync_rows에서 별도 지정)
             "trdar_se_cd": ("TRDAR_SE_CD",),
             "trdar_se_cd_nm": ("TRDAR_SE_CD_NM",),
             "trdar_cd_nm": ("TRDAR_CD_NM",),
@@ -35,9 +45,6 @@ class Command(BaseCommand):
             "area_m2": ("RELM_AR",),
         }
 
-        inserted = 0
-        updated = 0
-
         def cast_number_if_needed(field, val):
             if val in (None, ""):
                 return None
@@ -49,8 +56,10 @@ class Command(BaseCommand):
                     return None
             return val
 
-        with transaction.atomic():
-            for r in iter_TbgisTrdarRelm():
+        meta = {}
+
+        def api_rows():
+            for r in iter_TbgisTrdarRelm(page_size=options["page_size"], workers=options["workers"], meta=meta):
                 trdar_cd = r.get("TRDAR_CD")
                 if not trdar_cd:
                     continue
@@ -65,13 +74,29 @@ class Command(BaseCommand):
                             if val is not None:
                                 defaults[model_field] = val
                             break
+                yield trdar_cd, defaults
 
-                obj, created = TradingArea.objects.update_or_create(
-                    trdar_cd=trdar_cd, defaults=defaults
-                )
-                inserted += int(created)
-                updated += int(not created)
+        # 기존 행과 메모리에서 비교 → 실제로 바뀐 행만 batch_size개씩 커밋
+        # 삭제는 --delete_missing일 때만, 그리고 받은 상권 수가 전체 건수와 같을 때만
+        # 오류 페이지(OpenApiError)/건수 부족이어도 앞 배치는 커밋됨 → 좌표/롤업/버전은 그대로 처리하고 끝에 실패
+        incomplete = None
+        try:
+            stats = sync_rows(api_rows(), batch_size=options["batch_size"],
+                              delete_missing=options["delete_missing"], expected_total=lambda: meta.get("total"))
+        except IncompleteSyncError as e:
+            incomplete, stats = e, e.stats
+        lonlat = fill_lonlat(batch_size=options["batch_size"])
 
-        self.stdout.write(f"Inserted ~{inserted} rows (existing ignored).")
-        self.stdout.write("Reconciling deltas (name/coords/area)...")
-        self.stdout.write(f"Updated {updated} existing rows.")
+        self.stdout.write(
+            f"inserted={stats.inserted} updated={stats.updated} "
+            f"unchanged={stats.unchanged} deleted={stats.deleted}"
+        )
+        self.stdout.write(f"WGS84 lon/lat refreshed: {lonlat} rows")
+        if stats.changed:
+            # 상권의 자치구/행정동이 바뀌었을 수 있으니 지역 합계도 다시
+            self.stdout.write(f"IndustryRollup rebuilt: {rebuild_industry_rollup(batch_size=options['batch_size'])} rows")
+        if stats.changed or lonlat:
+            self.stdout.write(f"{TRADING_AREA} version → {bump_version(TRADING_AREA)}")
+        if incomplete is not None:
+            raise CommandError(f"{incomplete} — nothing deleted")
+        self.stdout.write(self.style.SUCCESS("TbgisTrdarRelm sync done"))
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.5 on 2026-10-16 22:34
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('analytics', '0007_storecount_counts_lcls_storecount_counts_mcls_and_more'),
+    ]
+
+    operations = [
+        migrations.AlterUniqueTogether(
+            name='closurestat',
+            unique_together={('year', 'signgu_cd_nm', 'category')},
+        ),
+    ]
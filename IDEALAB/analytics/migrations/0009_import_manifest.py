@@ -0,0 +1,47 @@
+# Generated by Django 5.2.5 on 2026-10-16 22:36
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('analytics', '0008_closurestat_unique_key'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ImportManifest',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('source', models.CharField(max_length=50)),
+                ('file_name', models.CharField(max_length=255)),
+                ('checksum', models.CharField(max_length=64)),
+                ('file_size', models.BigIntegerField(default=0)),
+                ('status', models.CharField(choices=[('running', 'running'), ('done', 'done'), ('failed', 'failed')], default='running', max_length=16)),
+                ('last_committed_row', models.IntegerField(default=0)),
+                ('created', models.IntegerField(default=0)),
+                ('updated', models.IntegerField(default=0)),
+                ('unchanged', models.IntegerField(default=0)),
+                ('started_at', models.DateTimeField(auto_now_add=True)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'db_table': 'analytics_import_manifest',
+                'unique_together': {('source', 'checksum')},
+            },
+        ),
+        migrations.CreateModel(
+            name='ImportRowHash',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('source', models.CharField(max_length=50)),
+                ('natural_key', models.CharField(max_length=191)),
+                ('row_hash', models.CharField(max_length=40)),
+            ],
+            options={
+                'db_table': 'analytics_import_row_hash',
+                'unique_together': {('source', 'natural_key')},
+            },
+        ),
+    ]
@@ -0,0 +1,76 @@
+# Generated by Django 5.2.5 on 2026-10-16 22:40
+
+import json
+import zlib
+
+from django.db import migrations, models
+
+
+# (model_name, RawPayload.source)
+RAW_MODELS = (
+    ("ChangeIndex", "change_index"),
+    ("IndustryMetric", "industry_metric"),
+    ("ClosureStat", "closure_stat"),
+    ("StoreCount", "store_count"),
+)
+BATCH = 2000
+
+
+def move_raw_data(apps, schema_editor):
+    RawPayload = apps.get_model("analytics", "RawPayload")
+    for model_name, source in RAW_MODELS:
+        Model = apps.get_model("analytics", model_name)
+        buf = []
+        for row_id, raw in Model.objects.exclude(raw_data={}).values_list("id", "raw_data").iterator(chunk_size=BATCH):
+            if not raw:
+                continue
+            if source == "change_index":
+                # original/snake 이중 저장 → original만
+                raw = raw.get("original") or raw
+            text = json.dumps(raw, ensure_ascii=False, separators=(",", ":"))
+            buf.append(RawPayload(source=source, row_id=row_id, data=zlib.compress(text.encode("utf-8"), 6)))
+            if len(buf) >= BATCH:
+                RawPayload.objects.bulk_create(buf)
+                buf = []
+        if buf:
+            RawPayload.objects.bulk_create(buf)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('analytics', '0009_import_manifest'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RawPayload',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('source', models.CharField(max_length=32)),
+                ('row_id', models.BigIntegerField()),
+                ('data', models.BinaryField()),
+            ],
+            options={
+                'db_table': 'analytics_raw_payload',
+                'unique_together': {('source', 'row_id')},
+            },
+        ),
+        migrations.RunPython(move_raw_data, migrations.RunPython.noop),
+        migrations.RemoveField(
+            model_name='changeindex',
+            name='raw_data',
+        ),
+        migrations.RemoveField(
+            model_name='closurestat',
+            name='raw_data',
+        ),
+        migrations.RemoveField(
+            model_name='industrymetric',
+            name='raw_data',
+        ),
+        migrations.RemoveField(
+            model_name='storecount',
+            name='raw_data',
+        ),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 5.2.5 on 2026-10-16 22:50
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('analytics', '0010_raw_payload_side_table'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='FetchCheckpoint',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('job', models.CharField(max_length=64)),
+                ('key', models.CharField(max_length=64)),
+                ('status', models.CharField(choices=[('done', 'done'), ('failed', 'failed')], max_length=16)),
+                ('attempts', models.IntegerField(default=0)),
+                ('pages', models.IntegerField(default=0)),
+                ('elapsed_ms', models.IntegerField(default=0)),
+                ('last_error', models.TextField(blank=True, default='')),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'db_table': 'analytics_fetch_checkpoint',
+                'indexes': [models.Index(fields=['job', 'status'], name='analytics_f_job_f64973_idx')],
+                'unique_together': {('job', 'key')},
+            },
+        ),
+    ]
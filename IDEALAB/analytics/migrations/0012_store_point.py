@@ -0,0 +1,36 @@
+# Generated by Django 5.2.5 on 2026-10-16 22:52
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('analytics', '0011_fetch_checkpoint'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StorePoint',
+            fields=[
+                ('bizes_id', models.CharField(max_length=30, primary_key=True, serialize=False)),
+                ('bizes_nm', models.CharField(blank=True, max_length=255, null=True)),
+                ('inds_lcls_cd', models.CharField(blank=True, max_length=10, null=True)),
+                ('inds_lcls_nm', models.CharField(blank=True, max_length=100, null=True)),
+                ('inds_mcls_cd', models.CharField(blank=True, max_length=10, null=True)),
+                ('inds_mcls_nm', models.CharField(blank=True, max_length=100, null=True)),
+                ('inds_scls_cd', models.CharField(blank=True, max_length=10, null=True)),
+                ('inds_scls_nm', models.CharField(blank=True, max_length=100, null=True)),
+                ('signgu_cd', models.CharField(blank=True, max_length=10, null=True)),
+                ('adstrd_cd', models.CharField(blank=True, max_length=20, null=True)),
+                ('lon', models.FloatField()),
+                ('lat', models.FloatField()),
+                ('x', models.FloatField()),
+                ('y', models.FloatField()),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'db_table': 'analytics_store_point',
+            },
+        ),
+    ]
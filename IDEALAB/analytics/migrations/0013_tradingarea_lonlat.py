@@ -0,0 +1,54 @@
+# Generated by Django 5.2.5 on 2026-10-16 22:55
+
+import numpy as np
+from django.db import migrations, models
+from pyproj import Transformer
+
+BATCH = 2000
+
+
+def _to_wgs84(x, y):
+    t = Transformer.from_crs("EPSG:2097", "EPSG:4326", always_xy=True)
+    return t.transform(np.asarray(x, dtype=np.float64), np.asarray(y, dtype=np.float64))
+
+
+def fill_coordinates(apps, schema_editor):
+    TradingArea = apps.get_model("analytics", "TradingArea")
+    StoreCount = apps.get_model("analytics", "StoreCount")
+
+    rows = list(TradingArea.objects.exclude(x=None).exclude(y=None).values_list("trdar_cd", "x", "y"))
+    if rows:
+        lon, lat = _to_wgs84([r[1] for r in rows], [r[2] for r in rows])
+        objs = [
+            TradingArea(trdar_cd=r[0], lon=round(a, 7), lat=round(b, 7))
+            for r, a, b in zip(rows, lon.tolist(), lat.tolist())
+        ]
+        TradingArea.objects.bulk_update(objs, ["lon", "lat"], batch_size=BATCH)
+
+    # StoreCount.cx/cy에 TM 값이 들어가 있던 행 → WGS84 (경도는 180을 넘을 수 없음)
+    rows = list(StoreCount.objects.filter(cx__gt=180).exclude(cy=None).values_list("id", "cx", "cy"))
+    if rows:
+        lon, lat = _to_wgs84([r[1] for r in rows], [r[2] for r in rows])
+        objs = [StoreCount(id=r[0], cx=a, cy=b) for r, a, b in zip(rows, lon.tolist(), lat.tolist())]
+        StoreCount.objects.bulk_update(objs, ["cx", "cy"], batch_size=BATCH)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('analytics', '0012_store_point'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='tradingarea',
+            name='lat',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='tradingarea',
+            name='lon',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.RunPython(fill_coordinates, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,80 @@
+# Generated by Django 5.2.5 on 2026-10-16 23:09
+
+from django.db import migrations, models
+
+CHUNK = 20000
+BATCH = 2000
+
+# analytics.services.rollups 규칙을 이 시점 기준으로 고정
+AMOUNT_FIELDS = ("thsmon_selng_amt", "thsmon_selng_co", "mdwk_selng_amt", "wkend_selng_amt")
+LEVEL_CITY, LEVEL_SIGNGU, LEVEL_ADSTRD = "city", "signgu", "adstrd"
+CITY_CD = "11"
+
+
+def fill_rollup(apps, schema_editor):
+    """기존 IndustryMetric으로 롤업 채움 (분기 하나씩 훑어 지역 × 업종 합계)"""
+    IndustryMetric = apps.get_model("analytics", "IndustryMetric")
+    IndustryRollup = apps.get_model("analytics", "IndustryRollup")
+    TradingArea = apps.get_model("analytics", "TradingArea")
+
+    regions = {}
+    for trdar_cd, signgu_cd, adstrd_cd in TradingArea.objects.values_list("trdar_cd", "signgu_cd", "adstrd_cd"):
+        keys = [(LEVEL_CITY, CITY_CD)]
+        if signgu_cd:
+            keys.append((LEVEL_SIGNGU, signgu_cd))
+        if adstrd_cd:
+            keys.append((LEVEL_ADSTRD, adstrd_cd))
+        regions[trdar_cd] = keys
+
+    yyqs = sorted(set(IndustryMetric.objects.order_by().values_list("yyq", flat=True).distinct()))
+    for yyq in yyqs:
+        sums = {}
+        qs = IndustryMetric.objects.filter(yyq=yyq).order_by().values_list("trdar_cd", "svc_induty_cd", *AMOUNT_FIELDS)
+        for trdar_cd, svc, *amounts in qs.iterator(chunk_size=CHUNK):
+            for level, code in regions.get(trdar_cd, ()):
+                acc = sums.setdefault((level, code, svc or ""), [0, None, None, None, None])
+                acc[0] += 1
+                for i, v in enumerate(amounts, 1):
+                    if v is not None:
+                        acc[i] = v if acc[i] is None else acc[i] + v
+        IndustryRollup.objects.bulk_create(
+            [
+                IndustryRollup(
+                    region_level=level, region_cd=code, yyq=yyq, svc_induty_cd=svc,
+                    row_count=acc[0], **dict(zip(AMOUNT_FIELDS, acc[1:])),
+                )
+                for (level, code, svc), acc in sums.items()
+            ],
+            batch_size=BATCH,
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('analytics', '0014_dataset_version'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='IndustryRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('region_level', models.CharField(max_length=10)),
+                ('region_cd', models.CharField(max_length=20)),
+                ('yyq', models.CharField(max_length=7)),
+                ('svc_induty_cd', models.CharField(blank=True, default='', max_length=10)),
+                ('row_count', models.IntegerField(default=0)),
+                ('thsmon_selng_amt', models.DecimalField(blank=True, decimal_places=2, max_digits=22, null=True)),
+                ('thsmon_selng_co', models.DecimalField(blank=True, decimal_places=2, max_digits=22, null=True)),
+                ('mdwk_selng_amt', models.DecimalField(blank=True, decimal_places=2, max_digits=22, null=True)),
+                ('wkend_selng_amt', models.DecimalField(blank=True, decimal_places=2, max_digits=22, null=True)),
+            ],
+            options={
+                'db_table': 'analytics_industry_rollup',
+                'indexes': [models.Index(fields=['yyq'], name='analytics_i_yyq_d2d8ce_idx')],
+                'unique_together': {('region_level', 'region_cd', 'yyq', 'svc_induty_cd')},
+            },
+        ),
+        migrations.RunPython(fill_rollup, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,79 @@
+# Generated by Django 5.2.5 on 2026-10-16 23:11
+
+import json
+import zlib
+
+from django.db import migrations, models
+
+BATCH = 2000
+
+# analytics.utils의 규칙을 이 시점 기준으로 고정
+SCORE_MAP = {
+    "HH": 3, "HL": 2, "LH": 1, "LL": 0,
+    "다이나믹": 3, "성장": 2, "정체": 1, "쇠퇴": 0,
+}
+CODE_TO_LEVEL = {"HH": "쇠퇴", "HL": "정체", "LH": "성장", "LL": "다이나믹"}
+
+
+def fill_code_score(apps, schema_editor):
+    """
+    원본 payload의 '상권_변화_지표' → change_code/change_score
+    - 점수는 코드(CODE_TO_LEVEL)로만 계산 (기존 레벨은 '상권_변화_지표_명' 라벨일 수 있어 믿지 않음)
+    - 기존 레벨은 그대로 두고, 비어 있을 때만 코드로 채움
+    """
+    ChangeIndex = apps.get_model("analytics", "ChangeIndex")
+    RawPayload = apps.get_model("analytics", "RawPayload")
+
+    last_id = 0
+    while True:
+        batch = list(ChangeIndex.objects.filter(id__gt=last_id).order_by("id").only("id", "change_level")[:BATCH])
+        if not batch:
+            break
+        last_id = batch[-1].id
+        raws = dict(
+            RawPayload.objects.filter(source="change_index", row_id__in=[o.id for o in batch])
+            .values_list("row_id", "data")
+        )
+        dirty = []
+        for obj in batch:
+            data = raws.get(obj.id)
+            raw = json.loads(zlib.decompress(bytes(data)).decode("utf-8")) if data else {}
+            code = (raw.get("상권_변화_지표") or "").strip().upper()
+            code = code if code in CODE_TO_LEVEL else None
+            if not code:
+                continue
+            obj.change_code = code
+            obj.change_score = SCORE_MAP[CODE_TO_LEVEL[code]]
+            obj.change_level = obj.change_level or CODE_TO_LEVEL[code]
+            dirty.append(obj)
+        if dirty:
+            ChangeIndex.objects.bulk_update(dirty, ["change_code", "change_score", "change_level"], batch_size=BATCH)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('analytics', '0015_industry_rollup'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='changeindex',
+            name='change_code',
+            field=models.CharField(blank=True, max_length=2, null=True),
+        ),
+        migrations.AddField(
+            model_name='changeindex',
+            name='change_score',
+            field=models.SmallIntegerField(blank=True, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='changeindex',
+            index=models.Index(fields=['yyq', 'change_code'], name='analytics_c_yyq_d48923_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='changeindex',
+            index=models.Index(fields=['yyq', 'change_score'], name='analytics_c_yyq_dcf8d8_idx'),
+        ),
+        migrations.RunPython(fill_code_score, migrations.RunPython.noop),
+    ]
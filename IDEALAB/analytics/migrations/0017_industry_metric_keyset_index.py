@@ -0,0 +1,17 @@
+# Generated by Django 5.2.5 on 2026-10-16 23:18
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('analytics', '0016_change_index_code_score'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='industrymetric',
+            index=models.Index(fields=['yyq', 'trdar_cd', 'svc_induty_cd'], name='analytics_i_yyq_3c7bdc_idx'),
+        ),
+    ]
@@ -0,0 +1,60 @@
+# Generated by Django 5.2.5 on 2026-10-16 23:23
+
+from django.db import migrations, models
+
+BATCH = 500
+LEVELS = (("lcls", "counts_lcls"), ("mcls", "counts_mcls"), ("scls", "counts_scls"))
+CATEGORY_MAX = 100
+
+
+def fill_category_counts(apps, schema_editor):
+    """기존 StoreCount의 JSON 집계 → StoreCategoryCount 행 (분류명이 비어 있던 'null' 키는 뺌)"""
+    StoreCount = apps.get_model("analytics", "StoreCount")
+    StoreCategoryCount = apps.get_model("analytics", "StoreCategoryCount")
+
+    last_id = 0
+    while True:
+        batch = list(
+            StoreCount.objects.filter(id__gt=last_id).order_by("id")
+            .values_list("id", "trdar_cd", "radius", *(f for _, f in LEVELS))[:BATCH]
+        )
+        if not batch:
+            break
+        last_id = batch[-1][0]
+        rows = []
+        for _, trdar_cd, radius, *counts in batch:
+            for (level, _), by_category in zip(LEVELS, counts):
+                for category, n in (by_category or {}).items():
+                    if category and category != "null":
+                        rows.append(StoreCategoryCount(
+                            trdar_cd=trdar_cd, radius=radius, level=level,
+                            category=category[:CATEGORY_MAX], count=int(n),
+                        ))
+        StoreCategoryCount.objects.bulk_create(rows, batch_size=2000, ignore_conflicts=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('analytics', '0017_industry_metric_keyset_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StoreCategoryCount',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('trdar_cd', models.CharField(max_length=10)),
+                ('radius', models.IntegerField()),
+                ('level', models.CharField(max_length=4)),
+                ('category', models.CharField(max_length=100)),
+                ('count', models.IntegerField()),
+            ],
+            options={
+                'db_table': 'analytics_store_category_count',
+                'indexes': [models.Index(fields=['trdar_cd', 'radius', 'level', 'count'], name='analytics_s_trdar_c_e26404_idx'), models.Index(fields=['level', 'category', 'radius', 'count'], name='analytics_s_level_8e3872_idx')],
+                'unique_together': {('trdar_cd', 'radius', 'level', 'category')},
+            },
+        ),
+        migrations.RunPython(fill_category_counts, migrations.RunPython.noop),
+    ]
@@ -1,5 +1,19 @@
 # analytics/models.py
 from django.db import models
+from django.utils.functional import cached_property
+
+
+class RawPayloadMixin:
+    """
+    원본 payload(CSV 행/API 응답)는 hot 테이블이 아니라 RawPayload에 압축 저장
+    - obj.raw 로 접근할 때만 조회 (여러 행이면 raw_store.load_raw로 한 번에)
+    """
+    RAW_SOURCE = None
+
+    @cached_property
+    def raw(self) -> dict:
+        from analytics.services.raw_store import load_raw_one
+        return load_raw_one(self.RAW_SOURCE, self.pk)
 
 class TradingArea(models.Model):
     """
@@ -12,6 +26,8 @@ class TradingArea(models.Model):
     trdar_se_cd_nm = models.CharField(max_length=50, blank=True, null=True)
     x = models.FloatField(blank=True, null=True)
     y = models.FloatField(blank=True, null=True)
+    lon = models.FloatField(blank=True, null=True)   # WGS84 — x/y에서 일괄 계산 (services/trading_areas.fill_lonlat)
+    lat = models.FloatField(blank=True, null=True)
     signgu_cd = models.CharField(max_length=10, blank=True, null=True)      # 자치구코드
     signgu_cd_nm = models.CharField(max_length=50, blank=True, null=True)   # 자치구명
     adstrd_cd = models.CharField(max_length=20, blank=True, null=True)      # 행정동코드
@@ -25,7 +41,7 @@ class TradingArea(models.Model):
         return f"{self.trdar_cd_nm or self.trdar_cd}"
 
 
-class IndustryMetric(models.Model):
+class IndustryMetric(RawPayloadMixin, models.Model):
     """
     업종/상권 단위의 분기 매출 지표 (CSV)
     - yyq: '2023Q4' 형식
@@ -45,15 +61,49 @@ class IndustryMetric(models.Model):
     mdwk_selng_amt = models.DecimalField(max_digits=18, decimal_places=2, null=True, blank=True)
     wkend_selng_amt = models.DecimalField(max_digits=18, decimal_places=2, null=True, blank=True)
 
-    raw_data = models.JSONField(default=dict, blank=True)
-
+    RAW_SOURCE = "industry_metric"
 
     class Meta:
         db_table = "analytics_industry_metric"
         unique_together = (("trdar_cd", "yyq", "svc_induty_cd"),)
+        indexes = [
+            # 분기 안에서 (상권, 업종) 순 키셋 페이지네이션
+            models.Index(fields=["yyq", "trdar_cd", "svc_induty_cd"]),
+        ]
+
+
+class IndustryRollup(models.Model):
+    """
+    IndustryMetric 지역 합계 — (지역 단위, 지역 코드, 분기, 업종)당 1행
+    - region_level: 'city'(서울 전체, region_cd='11') | 'signgu' | 'adstrd'
+    - TradingArea에 있는 상권만 포함 (뷰의 지역 필터와 같은 기준)
+    - services/rollups.py가 분기 단위로 다시 만듦 (적재 명령에서 자동 호출)
+    """
+    LEVEL_CITY = "city"
+    LEVEL_SIGNGU = "signgu"
+    LEVEL_ADSTRD = "adstrd"
+    CITY_CD = "11"
+
+    region_level = models.CharField(max_length=10)
+    region_cd = models.CharField(max_length=20)
+    yyq = models.CharField(max_length=7)
+    svc_induty_cd = models.CharField(max_length=10, blank=True, default="")  # IndustryMetric NULL → ''
+    row_count = models.IntegerField(default=0)  # 합친 IndustryMetric 행 수
+
+    thsmon_selng_amt = models.DecimalField(max_digits=22, decimal_places=2, null=True, blank=True)
+    thsmon_selng_co = models.DecimalField(max_digits=22, decimal_places=2, null=True, blank=True)
+    mdwk_selng_amt = models.DecimalField(max_digits=22, decimal_places=2, null=True, blank=True)
+    wkend_selng_amt = models.DecimalField(max_digits=22, decimal_places=2, null=True, blank=True)
+
+    class Meta:
+        db_table = "analytics_industry_rollup"
+        unique_together = (("region_level", "region_cd", "yyq", "svc_induty_cd"),)
+        indexes = [
+            models.Index(fields=["yyq"]),
+        ]
 
 
-class ChangeIndex(models.Model):
+class ChangeIndex(RawPayloadMixin, models.Model):
     """
     상권변화지표 (CSV) — 상권 단위 분기 인덱스
     """
@@ -61,17 +111,24 @@ class ChangeIndex(models.Model):
     yyq = models.CharField(max_length=7, db_index=True)
     change_index = models.DecimalField(max_digits=10, decimal_places=2, null=True, blank=True)
     change_level = models.CharField(max_length=32, null=True, blank=True)
+    # 적재 시 원본 '상권_변화_지표'에서 뽑아 둠 → 뷰는 payload를 풀지 않고 SQL로 집계
+    change_code = models.CharField(max_length=2, null=True, blank=True)  # HH/HL/LH/LL
+    change_score = models.SmallIntegerField(null=True, blank=True)  # utils.resolve_change_score
 
-    raw_data = models.JSONField(default=dict, blank=True)
-
+    # CSV 원본 행(헤더→값)만 RawPayload에 저장
+    RAW_SOURCE = "change_index"
 
     # 필요시 세부 인덱스 컬럼 더 추가
     class Meta:
         db_table = "analytics_change_index"
         unique_together = (("trdar_cd", "yyq"),)
+        indexes = [
+            models.Index(fields=["yyq", "change_code"]),
+            models.Index(fields=["yyq", "change_score"]),
+        ]
 
 
-class ClosureStat(models.Model):
+class ClosureStat(RawPayloadMixin, models.Model):
     """
     폐업 통계 (CSV) — 보유한 CSV가 자치구 기준이면 signgu 단위로 저장
     행정동 CSV가 있으면 adstrd 단위로도 저장 가능
@@ -85,11 +142,12 @@ class ClosureStat(models.Model):
     category = models.CharField(max_length=50)  # 예: '음식', '서비스', '소매' 등 CSV 컬럼 기준
     closures = models.IntegerField(null=True, blank=True)  # 폐업 점포 수
 
-    raw_data = models.JSONField(default=dict, blank=True)
-
+    RAW_SOURCE = "closure_stat"
 
     class Meta:
         db_table = "analytics_closure_stat"
+        # import_closures_csv의 upsert 키 (bulk_create update_conflicts 충돌 대상)
+        unique_together = (("year", "signgu_cd_nm", "category"),)
         indexes = [
             models.Index(fields=["year", "signgu_cd"]),
             models.Index(fields=["year", "adstrd_cd"]),
@@ -126,13 +184,15 @@ class StoreRadiusStat(models.Model):
         db_table = "analytics_store_radius_stat"
         unique_together = (("trdar_cd", "radius"),)
 
-class StoreCount(models.Model):
+class StoreCount(RawPayloadMixin, models.Model):
     trdar_cd = models.CharField(max_length=10, db_index=True)
     radius = models.IntegerField(default=2000)
     total = models.IntegerField(default=0)
     cx = models.FloatField(null=True, blank=True)  # WGS84 lon
     cy = models.FloatField(null=True, blank=True)  # WGS84 lat
-    raw_data = models.JSONField(default=dict, blank=True)
+
+    # API 첫 페이지 응답은 RawPayload로
+    RAW_SOURCE = "store_count"
 
     counts_lcls = models.JSONField(default=dict, blank=True)  # 대분류(indsLclsNm)
     counts_mcls = models.JSONField(default=dict, blank=True)  # 중분류(indsMclsNm)
@@ -144,3 +204,157 @@ class StoreCount(models.Model):
             models.Index(fields=["trdar_cd", "radius"]),
         ]
         unique_together = ("trdar_cd", "radius")
+
+
+class StoreCategoryCount(models.Model):
+    """
+    StoreCount.counts_lcls/mcls/scls를 (상권, 반경, 분류 단계, 분류명)당 1행으로 펼친 것
+    - 상권별 상위 N: (trdar_cd, radius, level) → count 역순
+    - 업종별 상권 순위: (level, category, radius) → count 역순 (지역은 서브쿼리)
+    - fetch_store_counts가 StoreCount와 같이 갱신 (services/store_counts.py)
+    """
+    LEVELS = ("lcls", "mcls", "scls")
+
+    trdar_cd = models.CharField(max_length=10)
+    radius = models.IntegerField()
+    level = models.CharField(max_length=4)  # lcls | mcls | scls
+    category = models.CharField(max_length=100)
+    count = models.IntegerField()
+
+    class Meta:
+        db_table = "analytics_store_category_count"
+        unique_together = (("trdar_cd", "radius", "level", "category"),)
+        indexes = [
+            models.Index(fields=["trdar_cd", "radius", "level", "count"]),
+            models.Index(fields=["level", "category", "radius", "count"]),
+        ]
+
+
+class StorePoint(models.Model):
+    """
+    상가업소 위치 — 소상공인 상가(상권)정보 덤프 또는 storeListInRadius 응답으로 적재
+    - x, y: TradingArea와 같은 TM 좌표(m) → 반경 계산은 services/store_index.py의 KD-tree로
+    """
+    bizes_id = models.CharField(max_length=30, primary_key=True)   # 상가업소번호
+    bizes_nm = models.CharField(max_length=255, blank=True, null=True)
+    inds_lcls_cd = models.CharField(max_length=10, blank=True, null=True)
+    inds_lcls_nm = models.CharField(max_length=100, blank=True, null=True)
+    inds_mcls_cd = models.CharField(max_length=10, blank=True, null=True)
+    inds_mcls_nm = models.CharField(max_length=100, blank=True, null=True)
+    inds_scls_cd = models.CharField(max_length=10, blank=True, null=True)
+    inds_scls_nm = models.CharField(max_length=100, blank=True, null=True)
+    signgu_cd = models.CharField(max_length=10, blank=True, null=True)
+    adstrd_cd = models.CharField(max_length=20, blank=True, null=True)
+    lon = models.FloatField()
+    lat = models.FloatField()
+    x = models.FloatField()
+    y = models.FloatField()
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = "analytics_store_point"
+
+
+class RawPayload(models.Model):
+    """
+    원본 payload 사이드 테이블 — (source, row_id) 당 1행, zlib 압축 JSON
+    - source: 'change_index' | 'industry_metric' | 'closure_stat' | 'store_count'
+    - row_id: 해당 테이블의 id
+    """
+    source = models.CharField(max_length=32)
+    row_id = models.BigIntegerField()
+    data = models.BinaryField()
+
+    class Meta:
+        db_table = "analytics_raw_payload"
+        unique_together = (("source", "row_id"),)
+
+
+class ImportManifest(models.Model):
+    """
+    CSV 적재 이력 — 파일 체크섬 단위
+    - 같은 source + checksum이 done이면 재실행 시 파일 전체를 건너뜀
+    - running/failed로 남아 있으면 last_committed_row 다음 행부터 재개
+    """
+    STATUS_RUNNING = "running"
+    STATUS_DONE = "done"
+    STATUS_FAILED = "failed"
+    STATUS_CHOICES = (
+        (STATUS_RUNNING, "running"),
+        (STATUS_DONE, "done"),
+        (STATUS_FAILED, "failed"),
+    )
+
+    source = models.CharField(max_length=50)          # 예: 'change_index', 'industry_metric'
+    file_name = models.CharField(max_length=255)
+    checksum = models.CharField(max_length=64)        # sha256
+    file_size = models.BigIntegerField(default=0)
+    status = models.CharField(max_length=16, choices=STATUS_CHOICES, default=STATUS_RUNNING)
+
+    last_committed_row = models.IntegerField(default=0)  # 마지막으로 커밋된 배치의 CSV 행 번호(1부터)
+    created = models.IntegerField(default=0)
+    updated = models.IntegerField(default=0)
+    unchanged = models.IntegerField(default=0)
+
+    started_at = models.DateTimeField(auto_now_add=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        db_table = "analytics_import_manifest"
+        unique_together = (("source", "checksum"),)
+
+
+class ImportRowHash(models.Model):
+    """
+    자연키(예: trdar_cd|yyq)별 마지막으로 기록한 행 내용 해시
+    - 해시가 같으면 다음 적재에서 해당 행 쓰기를 생략
+    """
+    source = models.CharField(max_length=50)
+    natural_key = models.CharField(max_length=191)
+    row_hash = models.CharField(max_length=40)        # sha1
+
+    class Meta:
+        db_table = "analytics_import_row_hash"
+        unique_together = (("source", "natural_key"),)
+
+
+class FetchCheckpoint(models.Model):
+    """
+    외부 API 수집 체크포인트 — (job, key) 당 1행
+    - job: 예) 'store_counts:2000' (명령 + 반경), key: 예) trdar_cd
+    - done이면 재실행 시 건너뜀, failed는 다시 시도 (--restart면 전부 다시)
+    """
+    STATUS_DONE = "done"
+    STATUS_FAILED = "failed"
+    STATUS_CHOICES = (
+        (STATUS_DONE, "done"),
+        (STATUS_FAILED, "failed"),
+    )
+
+    job = models.CharField(max_length=64)
+    key = models.CharField(max_length=64)
+    status = models.CharField(max_length=16, choices=STATUS_CHOICES)
+    attempts = models.IntegerField(default=0)         # 마지막 실행에서의 HTTP 시도 수(재시도 포함)
+    pages = models.IntegerField(default=0)
+    elapsed_ms = models.IntegerField(default=0)
+    last_error = models.TextField(blank=True, default="")
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = "analytics_fetch_checkpoint"
+        unique_together = (("job", "key"),)
+        indexes = [models.Index(fields=["job", "status"])]
+
+
+class DatasetVersion(models.Model):
+    """
+    데이터셋별 변경 카운터 — 적재/동기화가 실제로 데이터를 바꾸면 +1
+    - name: 'trading_area' | 'industry_metric' | ... (services/versioning.py)
+    - 캐시는 이 값이 바뀌었는지만 보고 무효화
+    """
+    name = models.CharField(max_length=50, unique=True)
+    version = models.BigIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = "analytics_dataset_version"
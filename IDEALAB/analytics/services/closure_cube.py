@@ -0,0 +1,119 @@
+# analytics/services/closure_cube.py
+# 폐업 통계 큐브 (연도 × 자치구 × 업종) — 테이블 전체가 수천 행 수준이라 워커 메모리에 통째로
+#
+#   cube = get_closure_cube()                     # closure_stat 버전이 바뀌었을 때만 DB 한 번
+#   d = cube.district("11740", None)              # 자치구 위치 (없으면 None)
+#   cube.totals[cube.year_pos(2023), d]           # 자치구 총 폐업 수 — 나머지도 배열 인덱싱만
+#
+# 총합 규칙(예전 뷰와 같음): '전체' 행이 있으면 그 값, 없으면 '전체/합계'를 뺀 업종 합
+import threading
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+from analytics.models import ClosureStat
+from analytics.services.region import SIGNGU_NAME_TO_CODE
+from analytics.services.versioning import CLOSURE_STAT, cached_version
+
+TOTAL_CATEGORY = "전체"
+SUMMARY_CATEGORIES = ("전체", "합계")
+
+
+class ClosureCube:
+    def __init__(self, rows):
+        """rows: (year, signgu_cd, signgu_cd_nm, category, closures) — id 순 (업종 순서는 처음 나온 순)"""
+        rows = list(rows)
+        self.years: List[int] = sorted({r[0] for r in rows})
+        self.names: List[str] = sorted({r[2] or "" for r in rows})
+        self.categories: List[str] = list(dict.fromkeys(r[3] for r in rows))
+        self._year_pos = {y: i for i, y in enumerate(self.years)}
+        self._name_pos = {n: i for i, n in enumerate(self.names)}
+        cat_pos = {c: i for i, c in enumerate(self.categories)}
+
+        shape = (len(self.years), len(self.names), len(self.categories))
+        self.values = np.full(shape, np.nan)       # 값이 비어 있는 행도 NaN
+        self.present = np.zeros(shape, dtype=bool)  # 행 존재 여부 (items 목록용)
+        codes: Dict[int, str] = {}
+        for year, code, name, category, closures in rows:
+            y, d, c = self._year_pos[year], self._name_pos[name or ""], cat_pos[category]
+            self.present[y, d, c] = True
+            if closures is not None:
+                self.values[y, d, c] = closures
+            if code:
+                codes.setdefault(d, code)
+        # 코드가 비어 있으면(백필 전) 이름으로 채움
+        self.codes: List[Optional[str]] = [codes.get(d) or SIGNGU_NAME_TO_CODE.get(n) for d, n in enumerate(self.names)]
+        self._code_pos = {code: d for d, code in enumerate(self.codes) if code}
+        self.totals = self._totals()  # (연도, 자치구)
+
+    @classmethod
+    def from_db(cls) -> "ClosureCube":
+        return cls(ClosureStat.objects.order_by("id").values_list(
+            "year", "signgu_cd", "signgu_cd_nm", "category", "closures",
+        ))
+
+    def _totals(self) -> np.ndarray:
+        leaf = np.array([c not in SUMMARY_CATEGORIES for c in self.categories], dtype=bool)
+        leaf_sum = np.nansum(self.values[:, :, leaf], axis=2) if leaf.any() else np.zeros(self.values.shape[:2])
+        if TOTAL_CATEGORY not in self.categories:
+            return leaf_sum
+        total_row = self.values[:, :, self.categories.index(TOTAL_CATEGORY)]
+        return np.where(np.isnan(total_row), leaf_sum, total_row)
+
+    # ---- 위치 ----
+    def year_pos(self, year: int) -> Optional[int]:
+        return self._year_pos.get(year)
+
+    def year_slice(self, start: int, end: int) -> List[int]:
+        """[start, end] 연도 중 데이터가 있는 연도의 위치"""
+        return [i for i, y in enumerate(self.years) if start <= y <= end]
+
+    def district(self, signgu_cd: Optional[str], signgu_nm: Optional[str]) -> Optional[int]:
+        if signgu_cd:
+            return self._code_pos.get(signgu_cd)
+        return self._name_pos.get(signgu_nm or "")
+
+    # ---- 조회 ----
+    def items(self, y: int, districts: Sequence[int]) -> List[dict]:
+        """(연도, 자치구들)의 행 — 예전 items와 같은 {category, closures}"""
+        out = []
+        for d in districts:
+            for c in np.flatnonzero(self.present[y, d]):
+                v = self.values[y, d, c]
+                out.append({"category": self.categories[c], "closures": None if np.isnan(v) else int(v)})
+        return out
+
+    def total(self, y: Optional[int], districts: Sequence[int]) -> Optional[int]:
+        if y is None:
+            return None
+        return int(self.totals[y, list(districts)].sum())
+
+    def ranking(self, years: Sequence[int]) -> List[dict]:
+        """연도들 합계 기준 자치구 순위 (폐업 많은 순)"""
+        sums = self.totals[list(years)].sum(axis=0)
+        order = np.argsort(-sums, kind="stable")
+        city = sums.sum()
+        return [
+            {
+                "rank": rank,
+                "signgu_cd": self.codes[d],
+                "signgu_cd_nm": self.names[d] or None,
+                "closures_sum": int(sums[d]),
+                "share": round(float(sums[d] / city), 4) if city else None,
+            }
+            for rank, d in enumerate(order, 1)
+        ]
+
+
+_lock = threading.Lock()
+_cached: Dict[str, object] = {"version": None, "cube": None}
+
+
+def get_closure_cube() -> ClosureCube:
+    version = cached_version(CLOSURE_STAT)
+    if version == _cached["version"]:
+        return _cached["cube"]
+    with _lock:
+        if version != _cached["version"]:
+            _cached["cube"], _cached["version"] = ClosureCube.from_db(), version
+    return _cached["cube"]
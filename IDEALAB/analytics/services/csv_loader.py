@@ -1,6 +1,21 @@
-# analytics/services/csv_loader.py
 import csv
-from typing import Dict, Iterator, Optional
+import io
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from django.db import connections, router, transaction
+from django.db.models import Q
+
+from analytics.services.csv_schema import BoundSchema, CsvSchema, iter_schema_rows, read_records, resolve_encoding
+
+# 한 트랜잭션에 기록할 기본 행 수 (명령마다 --batch_size로 조정)
+DEFAULT_BATCH_SIZE = 2000
+
+# --workers 모드에서 프로세스 하나가 맡는 바이트 구간 크기
+DEFAULT_CHUNK_BYTES = 4 * 1024 * 1024
+
 
 def read_csv_rows(path: str, encoding: str = "cp949") -> Iterator[Dict[str, str]]:
     with open(path, "r", encoding=encoding, newline="") as f:
@@ -18,3 +33,224 @@ def to_decimal_safe(val: Optional[str]):
         return s
     except Exception:
         return None
+
+
+def _read_header(path: str, encoding: str) -> Tuple[List[str], int]:
+    """첫 줄(헤더)을 파싱하고, 데이터가 시작되는 바이트 오프셋을 돌려줌"""
+    with open(path, "rb") as f:
+        line = f.readline()
+    text = line.decode(encoding)
+    header = next(csv.reader([text]), [])
+    return [h.strip() for h in header], len(line)
+
+
+def split_line_ranges(path: str, start: int, chunk_bytes: int = DEFAULT_CHUNK_BYTES) -> List[Tuple[int, int]]:
+    """
+    [start, EOF)를 chunk_bytes 근처에서 줄바꿈 경계에 맞춰 자른 (시작, 끝) 목록
+    - 따옴표 안에 줄바꿈이 있는 CSV는 지원하지 않음 (공공데이터 CSV는 해당 없음)
+    - cp949/utf-8 모두 멀티바이트 문자 중간에 0x0A가 나오지 않으므로 바이트 단위로 잘라도 안전
+    """
+    size = os.path.getsize(path)
+    ranges = []
+    with open(path, "rb") as f:
+        pos = start
+        while pos < size:
+            f.seek(min(pos + chunk_bytes, size))
+            f.readline()  # 다음 줄 시작까지 이동
+            end = min(f.tell(), size)
+            ranges.append((pos, end))
+            pos = end
+    return ranges
+
+
+def _parse_range(path: str, encoding: str, bound: BoundSchema, start: int, end: int) -> list:
+    """자식 프로세스에서 실행: 바이트 구간을 디코드 → 스키마 레코드(tuple) 목록"""
+    with open(path, "rb") as f:
+        f.seek(start)
+        text = f.read(end - start).decode(encoding)
+    return list(iter_schema_rows(io.StringIO(text, newline=""), bound))
+
+
+def iter_records(
+    path: str,
+    schema: CsvSchema,
+    encoding: Optional[str] = "auto",
+    workers: int = 1,
+    chunk_bytes: int = DEFAULT_CHUNK_BYTES,
+) -> Iterator[Optional[tuple]]:
+    """
+    CSV를 스키마 레코드(tuple, 필수값 누락 행은 None)로 파일 순서대로 반환
+    - encoding="auto": BOM/utf-8/cp949 자동 판별
+    - workers <= 1: 순차 파싱
+    - workers > 1: 줄 경계 바이트 구간을 ProcessPoolExecutor로 병렬 파싱/변환,
+      호출 측(DB writer)은 하나로 유지
+    """
+    encoding = resolve_encoding(path, encoding)
+    if workers <= 1:
+        yield from read_records(path, schema, encoding=encoding)
+        return
+
+    header, data_start = _read_header(path, encoding)
+    bound = schema.bind(header)  # 필수 칼럼 누락은 여기서 바로 CsvSchemaError
+    ranges = split_line_ranges(path, data_start, chunk_bytes)
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        # 진행 중인 구간 수를 제한해서 결과가 메모리에 쌓이지 않게 함 (순서 보장)
+        pending = deque()
+        it = iter(ranges)
+        for start, end in it:
+            pending.append(pool.submit(_parse_range, path, encoding, bound, start, end))
+            if len(pending) >= workers * 2:
+                break
+        while pending:
+            rows = pending.popleft().result()
+            nxt = next(it, None)
+            if nxt is not None:
+                pending.append(pool.submit(_parse_range, path, encoding, bound, nxt[0], nxt[1]))
+            yield from rows
+
+
+class BulkUpserter:
+    """
+    update_or_create(행마다 SELECT + INSERT/UPDATE) 대신 배치 단위 upsert
+    - add()로 넣은 행을 자연키(unique_fields) 기준으로 버퍼링 → batch_size마다
+      bulk_create(update_conflicts=True) 한 번으로 기록 (배치당 트랜잭션 1개)
+    - 같은 배치 안에서 키가 겹치면 마지막 행이 이김 (update_or_create 순차 실행과 동일)
+    - created/updated는 기록 직전에 배치 키의 기존 존재 여부를 한 번 조회해서 계산
+    - 키에 NULL이 있는 행은 upsert가 충돌로 못 잡으므로(NULL ≠ NULL) 따로:
+      기존 행은 pk로 bulk_update, 없으면 그냥 INSERT
+    - tracker(import_manifest.ImportTracker)를 주면 내용 해시가 같은 행은 쓰지 않고
+      unchanged로 셈. 행 해시/진행 위치는 배치와 같은 트랜잭션으로 커밋
+    - raw_source를 주면 행의 raw_data는 모델이 아니라 RawPayload(raw_store)에 압축 저장
+    - on_batch를 주면 배치마다 실제로 기록한 행({키: 값}, unchanged 제외)으로 호출 (커밋 후)
+    """
+
+    def __init__(
+        self,
+        model,
+        unique_fields: Sequence[str],
+        update_fields: Sequence[str],
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        using: Optional[str] = None,
+        tracker=None,
+        raw_source: Optional[str] = None,
+        on_batch: Optional[Callable[[Dict[tuple, dict]], None]] = None,
+    ):
+        self.model = model
+        self.unique_fields = tuple(unique_fields)
+        self.update_fields = [f for f in update_fields if f not in self.unique_fields and f != "raw_data"]
+        self.batch_size = max(1, int(batch_size or DEFAULT_BATCH_SIZE))
+        self.using = using or router.db_for_write(model)
+        self.tracker = tracker
+        self.raw_source = raw_source
+        self.on_batch = on_batch
+
+        self.created = 0
+        self.updated = 0
+        self.unchanged = 0
+        self.batches = 0
+        self._buf: Dict[tuple, dict] = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        # 예외로 빠져나갈 때는 남은 버퍼를 버린다 (이미 커밋된 배치는 유지)
+        if exc_type is None:
+            self.flush()
+
+    def key_of(self, values: dict) -> tuple:
+        return tuple(values.get(f) for f in self.unique_fields)
+
+    def add(self, **values):
+        self._buf[self.key_of(values)] = values
+        if len(self._buf) >= self.batch_size:
+            self.flush()
+
+    def extend(self, rows: Iterable[dict]):
+        for values in rows:
+            self.add(**values)
+
+    def _keys_qs(self, keys: set):
+        """배치 키 후보 쿼리 (필드별 IN 조건으로 좁힘 → 정확한 매칭은 파이썬에서)"""
+        qs = self.model._default_manager.using(self.using).all()
+        for i, field in enumerate(self.unique_fields):
+            vals = {k[i] for k in keys}
+            cond = Q(**{f"{field}__in": vals - {None}})
+            if None in vals:
+                # NULL은 IN으로 못 잡으므로 isnull 조건을 같이 건다
+                cond |= Q(**{f"{field}__isnull": True})
+            qs = qs.filter(cond)
+        return qs
+
+    def _existing_keys(self, keys: set) -> set:
+        """배치 키 중 DB에 이미 있는 것"""
+        return set(self._keys_qs(keys).values_list(*self.unique_fields)) & keys
+
+    def _write_null_keys(self, batch: Dict[tuple, dict]) -> set:
+        """키에 NULL이 있는 행 기록 → 이미 있던 키 집합"""
+        pks: Dict[tuple, List] = {}
+        for row in self._keys_qs(set(batch)).values_list(*self.unique_fields, "pk"):
+            if tuple(row[:-1]) in batch:
+                pks.setdefault(tuple(row[:-1]), []).append(row[-1])
+        manager = self.model._default_manager.using(self.using)
+        updates = [self.model(pk=pk, **batch[k]) for k, ids in pks.items() for pk in ids]
+        if updates and self.update_fields:
+            manager.bulk_update(updates, self.update_fields)
+        creates = [self.model(**values) for k, values in batch.items() if k not in pks]
+        if creates:
+            manager.bulk_create(creates)
+        return set(pks)
+
+    def _save_raw(self, raws: Dict[tuple, dict]):
+        from analytics.services.raw_store import save_raw
+
+        raws = {k: v for k, v in raws.items() if v}
+        if not raws:
+            return
+        # bulk_create가 MySQL에서 pk를 돌려주지 않으므로 키로 id를 다시 조회
+        ids = {
+            tuple(row[:-1]): row[-1]
+            for row in self._keys_qs(set(raws)).values_list(*self.unique_fields, "pk")
+        }
+        save_raw(self.raw_source, {ids[k]: v for k, v in raws.items() if k in ids})
+
+    def _conflict_target(self):
+        # MySQL(ON DUPLICATE KEY UPDATE)은 충돌 대상 컬럼 지정을 지원하지 않음
+        features = connections[self.using].features
+        return list(self.unique_fields) if features.supports_update_conflicts_with_target else None
+
+    def flush(self):
+        if not self._buf:
+            return
+        batch, self._buf = self._buf, {}
+        total = len(batch)
+
+        with transaction.atomic(using=self.using):
+            if self.tracker is not None:
+                batch = self.tracker.filter_batch(batch)
+            keys = set(batch.keys())
+            written = dict(batch)
+            raws = {k: values.pop("raw_data", None) for k, values in batch.items()}
+            null_keyed = {k: batch.pop(k) for k in keys if None in k}
+            existing = self._write_null_keys(null_keyed) if null_keyed else set()
+            if batch:
+                existing |= self._existing_keys(set(batch))
+                self.model._default_manager.using(self.using).bulk_create(
+                    [self.model(**values) for values in batch.values()],
+                    update_conflicts=True,
+                    unique_fields=self._conflict_target(),
+                    update_fields=self.update_fields,
+                )
+            if self.raw_source:
+                self._save_raw(raws)
+            created = len(keys) - len(existing)
+            if self.tracker is not None:
+                self.tracker.commit_batch(created, len(existing), total - len(keys))
+
+        self.created += created
+        self.updated += len(existing)
+        self.unchanged += total - len(keys)
+        self.batches += 1
+        if self.on_batch is not None and written:
+            self.on_batch(written)
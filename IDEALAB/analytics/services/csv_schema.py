@@ -0,0 +1,178 @@
+# analytics/services/csv_schema.py
+# 스키마 기반 CSV 파서 — 헤더 위치는 한 번만 찾고, 행은 타입 변환된 tuple로 반환
+#
+#   schema = CsvSchema(
+#       Column("trdar_cd", "상권_코드", "TRDAR_CD", required=True),
+#       Column("change_index", "상권_변화_지표", type=number),
+#   )
+#   for rec in iter_records(path, schema):      # rec = ("3110008", 1.0) 또는 None(필수값 누락)
+#       values = schema.as_dict(rec)
+import codecs
+import csv
+from decimal import Decimal
+from typing import Callable, Iterator, List, Optional, Sequence, Tuple
+
+NULL_TOKENS = frozenset({"", "NULL", "NaN", "nan"})
+
+ENCODING_SAMPLE_BYTES = 64 * 1024
+
+
+class CsvSchemaError(ValueError):
+    pass
+
+
+# ---- 타입 변환기 (모듈 최상위 함수여야 --workers에서 pickle 가능) ----
+def text(s: str) -> str:
+    return s
+
+
+def unquoted(s: str) -> str:
+    return s.replace('"', "").replace("'", "")
+
+
+def integer(s: str) -> int:
+    return int(s.replace(",", ""))
+
+
+def number(s: str) -> float:
+    return float(s.replace(",", ""))
+
+
+def decimal(s: str) -> Decimal:
+    return Decimal(s.replace(",", ""))
+
+
+class Column:
+    """
+    name: 결과 필드명 / aliases: CSV 헤더 후보(앞에서부터 먼저 있는 것 사용, None은 무시)
+    - 후보가 하나도 헤더에 없으면 항상 None
+    required=True면 값이 비었을 때 행 전체를 None으로
+    """
+    __slots__ = ("name", "aliases", "type", "required", "null_tokens")
+
+    def __init__(
+        self,
+        name: str,
+        *aliases: Optional[str],
+        type: Callable[[str], object] = text,
+        required: bool = False,
+        null_tokens: frozenset = NULL_TOKENS,
+    ):
+        self.name = name
+        self.aliases = tuple(a for a in aliases if a)
+        self.type = type
+        self.required = required
+        self.null_tokens = null_tokens
+
+    def convert(self, raw: Optional[str]):
+        if raw is None:
+            return None
+        raw = raw.strip()
+        if raw in self.null_tokens:
+            return None
+        try:
+            return self.type(raw)
+        except (ValueError, ArithmeticError):
+            return None
+
+
+class CsvSchema:
+    """
+    keep_raw=True면 레코드 마지막 원소로 원본 행 dict(헤더→값, strip)를 덧붙임
+    (as_dict에서 raw_data 키로 나감)
+    """
+    __slots__ = ("columns", "keep_raw")
+
+    def __init__(self, *columns: Column, keep_raw: bool = False):
+        self.columns = tuple(columns)
+        self.keep_raw = keep_raw
+
+    @property
+    def fields(self) -> Tuple[str, ...]:
+        return tuple(c.name for c in self.columns)
+
+    def bind(self, header: Sequence[str]) -> "BoundSchema":
+        header = [h.strip() for h in header]
+        pos = {h: i for i, h in enumerate(header)}
+        positions = []
+        for col in self.columns:
+            idx = next((pos[a] for a in col.aliases if a in pos), -1)
+            if idx < 0 and col.required:
+                raise CsvSchemaError(f"필수 칼럼이 없습니다: {col.name} (후보: {', '.join(col.aliases)})")
+            positions.append(idx)
+        return BoundSchema(self, header, tuple(positions))
+
+    def as_dict(self, rec: tuple) -> dict:
+        values = dict(zip(self.fields, rec))
+        if self.keep_raw:
+            values["raw_data"] = rec[-1]
+        return values
+
+
+class BoundSchema:
+    """헤더 위치가 결정된 스키마 — 행(list[str]) → 타입 변환된 tuple"""
+    __slots__ = ("schema", "header", "positions")
+
+    def __init__(self, schema: CsvSchema, header: List[str], positions: Tuple[int, ...]):
+        self.schema = schema
+        self.header = header
+        self.positions = positions
+
+    def convert(self, row: List[str]) -> Optional[tuple]:
+        n = len(row)
+        out = []
+        for col, i in zip(self.schema.columns, self.positions):
+            v = col.convert(row[i] if 0 <= i < n else None)
+            if v is None and col.required:
+                return None
+            out.append(v)
+        if self.schema.keep_raw:
+            out.append({h: v.strip() for h, v in zip(self.header, row)})
+        return tuple(out)
+
+
+def detect_encoding(path: str) -> str:
+    """
+    BOM이 있으면 utf-8-sig, utf-8로 디코드되면 utf-8, 아니면 cp949 (공공데이터 CSV 기본)
+    """
+    with open(path, "rb") as f:
+        head = f.read(ENCODING_SAMPLE_BYTES)
+    if head.startswith(codecs.BOM_UTF8):
+        return "utf-8-sig"
+    try:
+        head.decode("utf-8")
+        return "utf-8"
+    except UnicodeDecodeError as e:
+        # 샘플 끝에서 멀티바이트 문자가 잘린 경우는 utf-8로 봄
+        if e.start >= len(head) - 3 and e.reason == "unexpected end of data":
+            return "utf-8"
+        return "cp949"
+
+
+def resolve_encoding(path: str, encoding: Optional[str]) -> str:
+    if not encoding or encoding == "auto":
+        return detect_encoding(path)
+    return encoding
+
+
+def read_header(path: str, encoding: Optional[str] = "auto") -> List[str]:
+    with open(path, "r", encoding=resolve_encoding(path, encoding), newline="") as f:
+        return [h.strip() for h in next(csv.reader(f), [])]
+
+
+def iter_schema_rows(lines, bound: BoundSchema) -> Iterator[Optional[tuple]]:
+    for row in csv.reader(lines):
+        if not row:
+            continue
+        yield bound.convert(row)
+
+
+def read_records(path: str, schema: CsvSchema, encoding: Optional[str] = "auto") -> Iterator[Optional[tuple]]:
+    """순차 파싱 — 필수값이 빠진 행은 None"""
+    with open(path, "r", encoding=resolve_encoding(path, encoding), newline="") as f:
+        reader = csv.reader(f)
+        bound = schema.bind(next(reader, []))
+        for row in reader:
+            if not row:
+                continue
+            yield bound.convert(row)
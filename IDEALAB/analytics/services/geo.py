@@ -0,0 +1,22 @@
+# analytics/services/geo.py
+# 좌표 변환 — TradingArea x/y(TM중부 보정, m) <-> WGS84(lon/lat), numpy 배열 단위
+import numpy as np
+from pyproj import Transformer
+
+TM_CRS = "EPSG:2097"
+WGS84 = "EPSG:4326"
+
+_to_tm = Transformer.from_crs(WGS84, TM_CRS, always_xy=True)
+_to_wgs84 = Transformer.from_crs(TM_CRS, WGS84, always_xy=True)
+
+
+def wgs84_to_tm(lon, lat):
+    """경도/위도(스칼라 또는 배열) → TM x, y (m)"""
+    x, y = _to_tm.transform(np.asarray(lon, dtype=np.float64), np.asarray(lat, dtype=np.float64))
+    return x, y
+
+
+def tm_to_wgs84(x, y):
+    """TM x, y(스칼라 또는 배열) → 경도, 위도"""
+    lon, lat = _to_wgs84.transform(np.asarray(x, dtype=np.float64), np.asarray(y, dtype=np.float64))
+    return lon, lat
@@ -0,0 +1,237 @@
+# analytics/services/http_cache.py
+# 외부 API 응답 디스크 캐시 — 서울 열린데이터 / data.go.kr 공용
+#
+# 모드 (ANALYTICS_HTTP_CACHE)
+#   off     캐시 안 씀 (기본)
+#   on      TTL 안이면 캐시, 지나면 ETag/Last-Modified가 있을 때 조건부 요청(304면 캐시 재사용)
+#   replay  캐시에서만 응답 — 없으면 ReplayMiss (네트워크 안 씀, 오프라인 재실행/벤치용)
+#
+# 키 = (URL 경로[서비스/범위], 정렬된 쿼리 파라미터)의 sha256 — API 키는 빼고 계산
+# 파일 = <ANALYTICS_HTTP_CACHE_DIR>/<키 앞 2자리>/<키>.bin : JSON 메타 한 줄 + 본문 바이트
+# 용량이 ANALYTICS_HTTP_CACHE_MAX_MB를 넘으면 오래 안 쓴(mtime) 파일부터 삭제 (LRU)
+# HTTP 200이어도 본문이 JSON이 아니거나 결과 코드가 오류면 저장 안 함 (일시 오류가 TTL 동안/replay에서 굳지 않게)
+# (data.go.kr은 키 오류 등을 HTTP 200 + XML 본문으로 돌려줌)
+import hashlib
+import json
+import os
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, Optional, Tuple
+
+import requests
+from django.conf import settings
+
+MODES = ("off", "on", "replay")
+SECRET_PARAMS = {"servicekey", "service_key", "apikey", "api_key", "key"}
+EVICT_TO = 0.9  # 넘치면 상한의 90%까지 비움
+SEOUL_OK_CODE = "INFO-000"  # 서울 열린데이터 RESULT.CODE
+DATA_GO_KR_OK_CODE = "00"  # data.go.kr header.resultCode
+NOT_JSON = "NOT_JSON"  # 본문이 JSON 객체가 아님 (XML 오류 응답 등)
+
+
+def error_result(body: bytes) -> Optional[str]:
+    """
+    본문의 결과 코드가 정상이 아니면 그 코드 (정상이면 None)
+    - 서울 열린데이터: RESULT.CODE (최상위 또는 서비스 블록 안)
+    - data.go.kr: header.resultCode
+    - JSON 객체로 안 읽히면 NOT_JSON
+    """
+    try:
+        payload = json.loads(body)
+    except ValueError:
+        return NOT_JSON
+    if not isinstance(payload, dict):
+        return NOT_JSON
+    header = payload.get("header")
+    if isinstance(header, dict) and header.get("resultCode") not in (None, DATA_GO_KR_OK_CODE):
+        return str(header["resultCode"])
+    blocks = [payload] + [v for v in payload.values() if isinstance(v, dict)]
+    for block in blocks:
+        result = block.get("RESULT")
+        if isinstance(result, dict) and result.get("CODE") not in (None, SEOUL_OK_CODE):
+            return str(result["CODE"])
+    return None
+
+
+class ReplayMiss(requests.RequestException):
+    """replay 모드에서 캐시에 없는 요청 (재시도 대상 아님)"""
+
+
+@dataclass
+class CachedResponse:
+    status: int
+    body: bytes
+    headers: Dict[str, str]
+    stored_at: float
+    url: str
+
+    @property
+    def validators(self) -> Dict[str, str]:
+        """조건부 요청 헤더 (업스트림이 ETag/Last-Modified를 줬을 때만)"""
+        h = {}
+        if self.headers.get("etag"):
+            h["If-None-Match"] = self.headers["etag"]
+        if self.headers.get("last-modified"):
+            h["If-Modified-Since"] = self.headers["last-modified"]
+        return h
+
+    def to_response(self) -> requests.Response:
+        resp = requests.Response()
+        resp.status_code = self.status
+        resp._content = self.body
+        resp.url = self.url
+        resp.headers.update(self.headers)
+        resp.encoding = requests.utils.get_encoding_from_headers(resp.headers) or "utf-8"
+        resp.from_cache = True
+        return resp
+
+
+class HttpCache:
+    def __init__(self, root: str, ttl: float = 3600, max_bytes: int = 512 * 1024 * 1024,
+                 mode: str = "on", secrets: Tuple[str, ...] = ()):
+        if mode not in MODES:
+            raise ValueError(f"unknown cache mode: {mode}")
+        self.root = root
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.mode = mode
+        self.secrets = tuple(s for s in secrets if s)
+        self._size: Optional[int] = None
+        self._lock = threading.Lock()
+
+    # ---- 키/경로 ----
+    def key(self, url: str, params: Optional[dict] = None) -> str:
+        for s in self.secrets:
+            url = url.replace(s, "*")
+        items = sorted(
+            (str(k), str(v)) for k, v in (params or {}).items()
+            if str(k).lower() not in SECRET_PARAMS and v is not None
+        )
+        return hashlib.sha256(json.dumps([url, items], ensure_ascii=False).encode("utf-8")).hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.root, key[:2], f"{key}.bin")
+
+    # ---- 읽기/쓰기 ----
+    def lookup(self, key: str) -> Optional[CachedResponse]:
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                meta = json.loads(f.readline())
+                body = f.read()
+            os.utime(path)  # LRU: 최근 사용 시각 = mtime
+        except (OSError, ValueError):
+            return None
+        return CachedResponse(meta["status"], body, meta.get("headers") or {}, meta["stored_at"], meta.get("url", ""))
+
+    def is_fresh(self, entry: CachedResponse) -> bool:
+        return self.mode == "replay" or time.time() - entry.stored_at < self.ttl
+
+    def store(self, key: str, url: str, status: int, headers, body: bytes) -> CachedResponse:
+        for s in self.secrets:
+            url = url.replace(s, "*")
+        keep = {k.lower(): v for k, v in headers.items() if k.lower() in ("content-type", "etag", "last-modified")}
+        entry = CachedResponse(status, body, keep, time.time(), url)
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        meta = json.dumps({"status": status, "headers": keep, "stored_at": entry.stored_at, "url": url})
+        tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp, "wb") as f:
+            f.write(meta.encode("utf-8") + b"\n")
+            f.write(body)
+        try:
+            old = os.path.getsize(path)
+        except OSError:
+            old = 0
+        os.replace(tmp, path)
+        self._grow(os.path.getsize(path) - old)
+        return entry
+
+    @staticmethod
+    def cacheable(status: int, body: bytes) -> bool:
+        return status == 200 and error_result(body) is None
+
+    def revalidated(self, key: str, entry: CachedResponse) -> CachedResponse:
+        """304 — 본문은 그대로, 저장 시각만 갱신"""
+        return self.store(key, entry.url, entry.status, entry.headers, entry.body)
+
+    # ---- 용량 제한 (LRU) ----
+    def _files(self):
+        for sub in os.scandir(self.root):
+            if sub.is_dir():
+                for e in os.scandir(sub.path):
+                    if e.name.endswith(".bin"):
+                        yield e
+
+    def _grow(self, delta: int):
+        with self._lock:
+            if self._size is None:
+                self._size = sum(e.stat().st_size for e in self._files())
+            else:
+                self._size += delta
+            if self._size > self.max_bytes:
+                self._evict()
+
+    def _evict(self):
+        entries = sorted(((e.stat().st_mtime, e.stat().st_size, e.path) for e in self._files()))
+        size = sum(s for _, s, _ in entries)
+        target = self.max_bytes * EVICT_TO
+        for _, s, path in entries:
+            if size <= target:
+                break
+            try:
+                os.remove(path)
+                size -= s
+            except OSError:
+                pass
+        self._size = size
+
+    # ---- 동기 GET ----
+    def get(self, url: str, params: Optional[dict], send: Callable[[dict], requests.Response]) -> requests.Response:
+        """
+        send(추가 헤더) → requests.Response 를 캐시로 감쌈
+        - 200이고 본문이 JSON + 결과 코드 정상인 응답만 저장, 그 밖의 응답은 그대로 반환
+        """
+        key = self.key(url, params)
+        entry = self.lookup(key)
+        if entry is not None and self.is_fresh(entry):
+            return entry.to_response()
+        if self.mode == "replay":
+            raise ReplayMiss(f"not in cache (replay mode): {self.key_url(url)}")
+
+        resp = send(entry.validators if entry is not None else {})
+        if resp.status_code == 304 and entry is not None:
+            return self.revalidated(key, entry).to_response()
+        if self.cacheable(resp.status_code, resp.content):
+            # resp.url엔 퍼센트 인코딩된 키가 들어 있어 마스킹이 안 됨 → 파라미터 없는 호출 URL만 저장
+            self.store(key, self.key_url(url), resp.status_code, resp.headers, resp.content)
+        return resp
+
+    def key_url(self, url: str) -> str:
+        for s in self.secrets:
+            url = url.replace(s, "*")
+        return url
+
+
+_cache_lock = threading.Lock()
+_caches: Dict[tuple, HttpCache] = {}
+
+
+def get_http_cache() -> Optional[HttpCache]:
+    """settings 기준 프로세스 공용 캐시 — off면 None (override_settings로 바꾸면 새 인스턴스)"""
+    mode = (getattr(settings, "ANALYTICS_HTTP_CACHE", "off") or "off").lower()
+    root = getattr(settings, "ANALYTICS_HTTP_CACHE_DIR", "") or ""
+    if mode == "off" or not root:
+        return None
+    ttl = float(getattr(settings, "ANALYTICS_HTTP_CACHE_TTL", 3600))
+    max_bytes = int(float(getattr(settings, "ANALYTICS_HTTP_CACHE_MAX_MB", 512)) * 1024 * 1024)
+    secrets = (
+        getattr(settings, "SEOUL_OPENAPI_KEY", None) or os.getenv("SEOUL_OPENAPI_KEY", ""),
+        getattr(settings, "SMSC_API_KEY", None) or "",
+    )
+    conf = (mode, root, ttl, max_bytes, secrets)
+    with _cache_lock:
+        if conf not in _caches:
+            _caches[conf] = HttpCache(root, ttl=ttl, max_bytes=max_bytes, mode=mode, secrets=secrets)
+        return _caches[conf]
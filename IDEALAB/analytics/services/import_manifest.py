@@ -0,0 +1,125 @@
+# analytics/services/import_manifest.py
+# CSV 적재 매니페스트 (파일 체크섬 + 행 해시) — 변경분만 쓰고, 중단되면 이어서 적재
+import hashlib
+import json
+import os
+from typing import Dict
+
+from django.db import connection
+from django.utils import timezone
+
+from analytics.models import ImportManifest, ImportRowHash
+
+
+def file_checksum(path: str, chunk_size: int = 1024 * 1024) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(chunk_size), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def row_hash(values: dict) -> str:
+    payload = json.dumps(values, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+
+def _conflict_target(fields):
+    # MySQL은 충돌 대상 컬럼 지정 불가 (csv_loader.BulkUpserter와 동일)
+    return list(fields) if connection.features.supports_update_conflicts_with_target else None
+
+
+def natural_key_str(key: tuple) -> str:
+    return "|".join("" if v is None else str(v) for v in key)
+
+
+class ImportTracker:
+    """
+    BulkUpserter(tracker=...)와 같이 사용
+    - begin(): 매니페스트 조회/생성 → already_done / resume_from 결정
+    - advance(pos): 명령이 CSV 행 번호를 넘길 때마다 호출
+    - filter_batch(): 배치 중 해시가 바뀐 행만 남김 (배치 트랜잭션 안에서 호출됨)
+    - commit_batch(): 행 해시 + last_committed_row를 데이터와 같은 트랜잭션으로 기록
+    - force=True면 저장된 해시/완료 이력을 무시하고 전부 다시 씀
+    """
+
+    def __init__(self, source: str, path: str, force: bool = False):
+        self.source = source
+        self.path = path
+        self.force = force
+
+        self.manifest = None
+        self.already_done = False
+        self.resume_from = 0
+        self.position = 0
+        self._pending: Dict[str, str] = {}
+
+    def begin(self):
+        checksum = file_checksum(self.path)
+        manifest, created = ImportManifest.objects.get_or_create(
+            source=self.source,
+            checksum=checksum,
+            defaults={
+                "file_name": os.path.basename(self.path),
+                "file_size": os.path.getsize(self.path),
+            },
+        )
+        self.manifest = manifest
+
+        if not created and not self.force:
+            if manifest.status == ImportManifest.STATUS_DONE:
+                self.already_done = True
+                return self
+            # running(중단) / failed → 마지막 커밋 배치 다음부터
+            self.resume_from = manifest.last_committed_row
+
+        if created or self.force:
+            manifest.last_committed_row = 0
+            manifest.created = manifest.updated = manifest.unchanged = 0
+        manifest.status = ImportManifest.STATUS_RUNNING
+        manifest.finished_at = None
+        manifest.save()
+        return self
+
+    def advance(self, position: int):
+        self.position = position
+
+    def filter_batch(self, batch: Dict[tuple, dict]) -> Dict[tuple, dict]:
+        hashes = {natural_key_str(k): row_hash(v) for k, v in batch.items()}
+        stored = {}
+        if not self.force:
+            stored = dict(
+                ImportRowHash.objects.filter(source=self.source, natural_key__in=list(hashes))
+                .values_list("natural_key", "row_hash")
+            )
+        self._pending = {nk: h for nk, h in hashes.items() if stored.get(nk) != h}
+        return {k: v for k, v in batch.items() if natural_key_str(k) in self._pending}
+
+    def commit_batch(self, created: int, updated: int, unchanged: int):
+        if self._pending:
+            ImportRowHash.objects.bulk_create(
+                [ImportRowHash(source=self.source, natural_key=nk, row_hash=h) for nk, h in self._pending.items()],
+                update_conflicts=True,
+                unique_fields=_conflict_target(("source", "natural_key")),
+                update_fields=["row_hash"],
+            )
+            self._pending = {}
+
+        m = self.manifest
+        m.last_committed_row = self.position
+        m.created += created
+        m.updated += updated
+        m.unchanged += unchanged
+        m.save(update_fields=["last_committed_row", "created", "updated", "unchanged"])
+
+    def finish(self):
+        self.manifest.status = ImportManifest.STATUS_DONE
+        self.manifest.finished_at = timezone.now()
+        self.manifest.save(update_fields=["status", "finished_at"])
+
+    def fail(self):
+        if self.manifest is None:
+            return
+        self.manifest.status = ImportManifest.STATUS_FAILED
+        self.manifest.save(update_fields=["status"])
+
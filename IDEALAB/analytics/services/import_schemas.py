@@ -0,0 +1,113 @@
+# analytics/services/import_schemas.py
+# 적재 명령별 CSV 스키마 (칼럼명 옵션은 첫 번째 후보로 들어감)
+from typing import Optional, Sequence
+
+from analytics.services.csv_schema import Column, CsvSchema, decimal, integer, number, unquoted
+from analytics.utils import CODE_TO_LEVEL
+
+
+def change_code(s: str) -> str:
+    """상권변화지표 코드 HH/HL/LH/LL (그 밖의 값은 None)"""
+    s = s.upper()
+    if s not in CODE_TO_LEVEL:
+        raise ValueError(s)
+    return s
+
+
+def change_index_schema(
+    yyq_col: Optional[str] = None,
+    trdar_col: Optional[str] = None,
+    idx_col: Optional[str] = None,
+    lvl_col: Optional[str] = None,
+) -> CsvSchema:
+    """상권변화지표 CSV → ChangeIndex (원본 행은 RawPayload로)"""
+    return CsvSchema(
+        Column("yyq", yyq_col, "기준_년분기_코드", "STDR_YYQU_CD", required=True),
+        Column("trdar_cd", trdar_col, "상권_코드", "TRDAR_CD", required=True),
+        Column("change_index", idx_col, "상권_변화_지표", "CHG_IDX", type=number),
+        Column("change_code", idx_col, "상권_변화_지표", "CHG_IDX", type=change_code),
+        # '상권_변화_지표_명'(상권확장/상권축소 …)은 점수 체계가 달라 레벨로 쓰지 않음 → 레벨은 코드로 유추
+        Column("change_level", lvl_col, "상권_변화_지표_등급", "CHG_LVL"),
+        keep_raw=True,
+    )
+
+
+def industry_metric_schema(
+    yyq_col: str = "STDR_YYQU_CD",
+    trdar_col: str = "TRDAR_CD",
+    svc_cd_col: str = "SVC_INDUTY_CD",
+    svc_nm_col: str = "SVC_INDUTY_CD_NM",
+    amt_col: str = "THSMON_SELNG_AMT",
+    cnt_col: str = "THSMON_SELNG_CO",
+) -> CsvSchema:
+    """VwsmTrdarSelngQq CSV → IndustryMetric"""
+    return CsvSchema(
+        Column("trdar_cd", trdar_col, required=True),
+        Column("yyq", yyq_col, required=True),
+        Column("svc_induty_cd", svc_cd_col),
+        Column("svc_induty_cd_nm", svc_nm_col),
+        Column("thsmon_selng_amt", amt_col, type=decimal),
+        Column("thsmon_selng_co", cnt_col, type=decimal),
+        Column("mdwk_selng_amt", "MDWK_SELNG_AMT", type=decimal),
+        Column("wkend_selng_amt", "WKEND_SELNG_AMT", type=decimal),
+    )
+
+
+def trading_area_schema() -> CsvSchema:
+    """상권영역 CSV → TradingArea"""
+    return CsvSchema(
+        Column("trdar_cd", "TRDAR_CD", "trdar_cd", required=True),
+        Column("trdar_cd_nm", "TRDAR_CD_NM", "name"),
+        Column("trdar_se_cd", "TRDAR_SE_CD"),
+        Column("trdar_se_cd_nm", "TRDAR_SE_CD_NM"),
+        Column("x", "XCNTS_VALUE", type=number),
+        Column("y", "YDNTS_VALUE", type=number),
+        Column("signgu_cd", "SIGNGU_CD"),
+        Column("signgu_cd_nm", "SIGNGU_CD_NM"),
+        Column("adstrd_cd", "ADSTRD_CD"),
+        Column("adstrd_cd_nm", "ADSTRD_CD_NM"),
+        Column("area_m2", "RELM_AR", type=number),
+    )
+
+
+def closures_wide_schema(signgu_nm_col: str, melt_cols: Sequence[str]) -> CsvSchema:
+    """가로형 폐업 CSV: 자치구 | 전체 | 외식업 | ... (카테고리 칼럼 순서 = melt_cols)"""
+    return CsvSchema(
+        Column("signgu_cd_nm", signgu_nm_col, type=unquoted, required=True),
+        *[Column(cat, cat, type=integer) for cat in melt_cols],
+        keep_raw=True,
+    )
+
+
+def closures_long_schema(
+    signgu_nm_col: str,
+    year_col: Optional[str] = None,
+    category_col: Optional[str] = None,
+    count_col: Optional[str] = None,
+) -> CsvSchema:
+    """세로형 폐업 CSV: 연도 | 자치구 | 카테고리 | 값"""
+    return CsvSchema(
+        Column("year", year_col, type=integer),
+        Column("signgu_cd_nm", signgu_nm_col, type=unquoted, required=True),
+        Column("category", category_col, type=unquoted),
+        Column("closures", count_col, type=integer),
+        keep_raw=True,
+    )
+
+
+def store_point_schema() -> CsvSchema:
+    """소상공인 상가(상권)정보 CSV(한글 헤더) 또는 API 필드명 → StorePoint (x, y는 적재 시 계산)"""
+    return CsvSchema(
+        Column("bizes_id", "상가업소번호", "bizesId", required=True),
+        Column("bizes_nm", "상호명", "bizesNm"),
+        Column("inds_lcls_cd", "상권업종대분류코드", "indsLclsCd"),
+        Column("inds_lcls_nm", "상권업종대분류명", "indsLclsNm"),
+        Column("inds_mcls_cd", "상권업종중분류코드", "indsMclsCd"),
+        Column("inds_mcls_nm", "상권업종중분류명", "indsMclsNm"),
+        Column("inds_scls_cd", "상권업종소분류코드", "indsSclsCd"),
+        Column("inds_scls_nm", "상권업종소분류명", "indsSclsNm"),
+        Column("signgu_cd", "시군구코드", "signguCd"),
+        Column("adstrd_cd", "행정동코드", "adongCd"),
+        Column("lon", "경도", "lon", type=number, required=True),
+        Column("lat", "위도", "lat", type=number, required=True),
+    )
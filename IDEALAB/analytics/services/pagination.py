@@ -0,0 +1,63 @@
+# analytics/services/pagination.py
+# 키셋(커서) 페이지네이션 — OFFSET 없이 "마지막으로 본 키 다음부터"
+#
+#   rows, next_cursor = keyset_page(qs.values(...), ("trdar_cd", "svc_induty_cd"), cursor, limit=1000)
+#
+# 커서 = 마지막 행의 키 값(JSON)을 base64url로 — 클라이언트는 그대로 다음 요청의 ?cursor= 로
+# 정렬은 키 오름차순, NULL은 앞 (MySQL/SQLite 기본과 같음)
+import base64
+import binascii
+import json
+import operator
+from functools import reduce
+from typing import List, Optional, Sequence, Tuple
+
+from django.db.models import F, Q
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def encode_cursor(values: Sequence) -> str:
+    raw = json.dumps(list(values), ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, n_keys: int) -> list:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        values = json.loads(raw)
+    except (binascii.Error, ValueError):
+        raise InvalidCursor(cursor)
+    if not isinstance(values, list) or len(values) != n_keys:
+        raise InvalidCursor(cursor)
+    return values
+
+
+def _after_q(keys: Sequence[str], values: Sequence) -> Q:
+    """(k1, k2, ...) > (v1, v2, ...) — NULL은 모든 값보다 작게"""
+    terms, eq = [], Q()
+    for k, v in zip(keys, values):
+        gt = Q(**{f"{k}__isnull": False}) if v is None else Q(**{f"{k}__gt": v})
+        terms.append(eq & gt)
+        eq &= Q(**{f"{k}__isnull": True}) if v is None else Q(**{k: v})
+    q = reduce(operator.or_, terms)
+    if values[0] is not None:
+        q &= Q(**{f"{keys[0]}__gte": values[0]})  # 첫 키는 범위 조건으로도 (인덱스 range scan)
+    return q
+
+
+def keyset_page(qs, keys: Sequence[str], cursor: Optional[str], limit: int) -> Tuple[List[dict], Optional[str]]:
+    """
+    qs(.values() 쿼리셋, keys 포함)의 cursor 다음 limit행 → (행 목록, 다음 커서 | 마지막이면 None)
+    - 한 행 더 읽어서 다음 페이지 유무 판단 (COUNT 없음)
+    """
+    if cursor:
+        qs = qs.filter(_after_q(keys, decode_cursor(cursor, len(keys))))
+    qs = qs.order_by(*[F(k).asc(nulls_first=True) for k in keys])
+    rows = list(qs[:limit + 1])
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    return rows, encode_cursor([rows[-1][k] for k in keys])
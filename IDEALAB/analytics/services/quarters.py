@@ -0,0 +1,29 @@
+# analytics/services/quarters.py
+# 분기 코드 보조 — 원본 CSV는 '20244', API 문서/프런트는 '2024Q4' 형식을 씀
+#
+#   q = parse_yyq("2024Q4")        # 분기 서수 (year*4 + 분기-1), 형식이 틀리면 None
+#   yyq_label(q)  -> "2024Q4"      # 응답용
+#   yyq_codes(q)  -> ("20244", "2024Q4")   # DB 필터용 (어느 형식으로 적재됐든 매칭)
+import re
+from typing import List, Optional, Tuple
+
+_YYQ = re.compile(r"^(\d{4})[Qq]?([1-4])$")
+
+
+def parse_yyq(value: Optional[str]) -> Optional[int]:
+    m = _YYQ.match((value or "").strip())
+    if not m:
+        return None
+    return int(m.group(1)) * 4 + int(m.group(2)) - 1
+
+
+def yyq_label(q: int) -> str:
+    return f"{q // 4}Q{q % 4 + 1}"
+
+
+def yyq_codes(q: int) -> Tuple[str, str]:
+    return f"{q // 4}{q % 4 + 1}", yyq_label(q)
+
+
+def quarter_range(start: int, end: int) -> List[int]:
+    return list(range(start, end + 1))
@@ -0,0 +1,65 @@
+# analytics/services/ratelimit.py
+# 토큰 버킷 레이트 리미터 — 외부 API 일일/초당 쿼터 보호용
+import asyncio
+import threading
+import time
+
+
+class AsyncTokenBucket:
+    """
+    초당 rate개 토큰이 쌓이고 최대 burst개까지 보관
+    - await bucket.acquire() 한 번 = 요청 1건
+    - 이벤트 루프 하나에서 공유 (코루틴 여러 개가 같은 버킷을 써야 전역 제한이 됨)
+    """
+
+    def __init__(self, rate: float, burst: int = 1):
+        if rate <= 0:
+            raise ValueError("rate must be > 0")
+        self.rate = float(rate)
+        self.capacity = max(1, int(burst))
+        self.tokens = float(self.capacity)
+        self.updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    async def acquire(self, tokens: float = 1.0):
+        # lock을 잡은 채로 기다려야 먼저 온 요청이 먼저 나감 (FIFO)
+        async with self._lock:
+            self._refill()
+            while self.tokens < tokens:
+                await asyncio.sleep((tokens - self.tokens) / self.rate)
+                self._refill()
+            self.tokens -= tokens
+
+
+class TokenBucket:
+    """
+    AsyncTokenBucket의 동기(스레드) 버전 — bucket.acquire()가 토큰이 생길 때까지 블록
+    - 스레드 여러 개가 같은 버킷을 공유해도 됨
+    """
+
+    def __init__(self, rate: float, burst: int = 1):
+        if rate <= 0:
+            raise ValueError("rate must be > 0")
+        self.rate = float(rate)
+        self.capacity = max(1, int(burst))
+        self.tokens = float(self.capacity)
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def acquire(self, tokens: float = 1.0):
+        with self._lock:
+            self._refill()
+            while self.tokens < tokens:
+                time.sleep((tokens - self.tokens) / self.rate)
+                self._refill()
+            self.tokens -= tokens
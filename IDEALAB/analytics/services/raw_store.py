@@ -0,0 +1,49 @@
+# analytics/services/raw_store.py
+# 원본 payload 사이드 테이블(RawPayload) 읽기/쓰기 — zlib 압축 JSON
+import json
+import zlib
+from typing import Dict, Iterable
+
+from django.db import connection
+
+from analytics.models import RawPayload
+
+COMPRESS_LEVEL = 6
+
+
+def pack(payload: dict) -> bytes:
+    text = json.dumps(payload, ensure_ascii=False, separators=(",", ":"), default=str)
+    return zlib.compress(text.encode("utf-8"), COMPRESS_LEVEL)
+
+
+def unpack(data) -> dict:
+    if not data:
+        return {}
+    return json.loads(zlib.decompress(bytes(data)).decode("utf-8"))
+
+
+def save_raw(source: str, payloads: Dict[int, dict]):
+    """{row_id: payload} upsert (빈 payload는 저장하지 않음)"""
+    objs = [
+        RawPayload(source=source, row_id=row_id, data=pack(payload))
+        for row_id, payload in payloads.items()
+        if payload
+    ]
+    if not objs:
+        return
+    target = ["source", "row_id"] if connection.features.supports_update_conflicts_with_target else None
+    RawPayload.objects.bulk_create(objs, update_conflicts=True, unique_fields=target, update_fields=["data"])
+
+
+def load_raw(source: str, row_ids: Iterable[int]) -> Dict[int, dict]:
+    """여러 행의 payload를 한 번에 조회 → {row_id: dict} (없는 행은 빠짐)"""
+    ids = list(row_ids)
+    if not ids:
+        return {}
+    rows = RawPayload.objects.filter(source=source, row_id__in=ids).values_list("row_id", "data")
+    return {row_id: unpack(data) for row_id, data in rows}
+
+
+def load_raw_one(source: str, row_id: int) -> dict:
+    return load_raw(source, [row_id]).get(row_id, {})
+
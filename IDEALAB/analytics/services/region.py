@@ -40,3 +40,11 @@ def normalize_signgu_name_to_code(name: str) -> str:
         return ""
     return SIGNGU_NAME_TO_CODE.get(name.strip(), "")
 
+
+
+def name_to_signgu_cd(name: str):
+    """
+    normalize_signgu_name_to_code와 같지만 못 찾으면 None (DB NULL 유지용)
+    - import_closures_csv / backfill_closure_signgu_codes에서 사용
+    """
+    return normalize_signgu_name_to_code(name) or None
@@ -0,0 +1,61 @@
+# analytics/services/region_index.py
+# 자치구/행정동 → 상권코드 목록 (워커별 메모리 캐시)
+#
+#   trdars = get_region_index().trdars(signgu_cd, adstrd_cd)     # 쿼리 없음 (정렬된 tuple)
+#   qs = IndustryMetric.objects.filter(region_trdar_q(signgu_cd, adstrd_cd), yyq=yyq)
+#
+# TradingArea가 바뀌면(sync/import가 trading_area 버전을 올리면) 다음 요청에서 다시 빌드
+import threading
+from collections import defaultdict
+from typing import Dict, Optional, Tuple
+
+from django.db.models import Q
+
+from analytics.models import TradingArea
+from analytics.services.versioning import TRADING_AREA, cached_version
+from analytics.utils import filter_trading_areas_by_region
+
+
+class RegionIndex:
+    def __init__(self, rows):
+        by_signgu, by_adstrd, every = defaultdict(list), defaultdict(list), []
+        for trdar_cd, signgu_cd, adstrd_cd in rows:
+            every.append(trdar_cd)
+            if signgu_cd:
+                by_signgu[signgu_cd].append(trdar_cd)
+            if adstrd_cd:
+                by_adstrd[adstrd_cd].append(trdar_cd)
+        self.all: Tuple[str, ...] = tuple(every)
+        self.by_signgu: Dict[str, Tuple[str, ...]] = {k: tuple(v) for k, v in by_signgu.items()}
+        self.by_adstrd: Dict[str, Tuple[str, ...]] = {k: tuple(v) for k, v in by_adstrd.items()}
+
+    @classmethod
+    def from_db(cls) -> "RegionIndex":
+        return cls(TradingArea.objects.order_by("trdar_cd").values_list("trdar_cd", "signgu_cd", "adstrd_cd"))
+
+    def trdars(self, signgu_cd: Optional[str], adstrd_cd: Optional[str]) -> Tuple[str, ...]:
+        """filter_trading_areas_by_region과 같은 규칙 — 행정동 우선, 둘 다 없으면 전체"""
+        if adstrd_cd:
+            return self.by_adstrd.get(adstrd_cd, ())
+        if signgu_cd:
+            return self.by_signgu.get(signgu_cd, ())
+        return self.all
+
+
+_lock = threading.Lock()
+_cached: Dict[str, object] = {"version": None, "index": None}
+
+
+def get_region_index() -> RegionIndex:
+    version = cached_version(TRADING_AREA)
+    if version == _cached["version"]:
+        return _cached["index"]
+    with _lock:
+        if version != _cached["version"]:
+            _cached["index"], _cached["version"] = RegionIndex.from_db(), version
+    return _cached["index"]
+
+
+def region_trdar_q(signgu_cd: Optional[str], adstrd_cd: Optional[str]) -> Q:
+    """지역 조건을 서브쿼리로 — 상권코드 수백 개를 IN (...) 리스트로 보내지 않음"""
+    return Q(trdar_cd__in=filter_trading_areas_by_region(TradingArea, signgu_cd, adstrd_cd).values("trdar_cd"))
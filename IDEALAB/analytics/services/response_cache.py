@@ -0,0 +1,139 @@
+# analytics/services/response_cache.py
+# 분석 API 응답 캐시 — (경로, 정렬된 쿼리 파라미터, 응답 형식, 데이터셋 버전)을 키로
+#
+#   class ChangeIndexByRegionView(VersionedResponseMixin, APIView):
+#       cache_datasets = (TRADING_AREA, CHANGE_INDEX)
+#
+# - ETag = 키 해시 (강한 ETag) — 적재/동기화 명령이 bump_version하면 키가 바뀌어 자동 무효화
+# - If-None-Match가 맞으면 304 (본문 캐시에서 밀려났어도 버전만 확인)
+# - 아니면 워커 메모리의 렌더링된 본문 (LRU, 개수/용량 상한) → 없을 때만 뷰 실행
+# - 인증/권한/스로틀은 캐시보다 먼저 (APIView.initial 다음에 확인)
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+from django.conf import settings
+from django.http import HttpResponse, HttpResponseNotModified
+from django.utils.cache import patch_cache_control
+from django.utils.http import parse_etags
+
+from analytics.services.versioning import cached_versions
+
+
+class ResponseCache:
+    """렌더링된 응답 본문 LRU — 스레드 안전, max_entries가 0이면 저장 안 함"""
+
+    def __init__(self, max_entries: int = 512, max_bytes: int = 64 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.size = 0
+        self._data: "OrderedDict[str, Tuple[bytes, str]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._data)
+
+    def get(self, key: str) -> Optional[Tuple[bytes, str]]:
+        with self._lock:
+            hit = self._data.get(key)
+            if hit is not None:
+                self._data.move_to_end(key)
+            return hit
+
+    def set(self, key: str, body: bytes, content_type: str) -> None:
+        if not self.max_entries or len(body) > self.max_bytes:
+            return
+        with self._lock:
+            old = self._data.pop(key, None)
+            if old is not None:
+                self.size -= len(old[0])
+            self._data[key] = (body, content_type)
+            self.size += len(body)
+            while len(self._data) > self.max_entries or self.size > self.max_bytes:
+                _, (b, _) = self._data.popitem(last=False)
+                self.size -= len(b)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self.size = 0
+
+
+_cache_lock = threading.Lock()
+_caches = {}
+
+
+def get_response_cache() -> ResponseCache:
+    """settings 기준 워커 공용 캐시 (override_settings로 바꾸면 새 인스턴스)"""
+    conf = (
+        int(getattr(settings, "ANALYTICS_RESPONSE_CACHE_ENTRIES", 512)),
+        int(float(getattr(settings, "ANALYTICS_RESPONSE_CACHE_MAX_MB", 64)) * 1024 * 1024),
+    )
+    with _cache_lock:
+        if conf not in _caches:
+            _caches[conf] = ResponseCache(*conf)
+        return _caches[conf]
+
+
+def response_key(path: str, query_params, media_type: str, versions: Tuple[int, ...]) -> str:
+    """빈 값은 빼고 파라미터 이름순 (같은 이름의 값 순서는 유지)"""
+    params = sorted((k, [v for v in vs if v != ""]) for k, vs in query_params.lists())
+    params = [(k, vs) for k, vs in params if vs]
+    raw = json.dumps([path, params, media_type, versions], ensure_ascii=False)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()[:32]
+
+
+class _CachedResponse(Exception):
+    """initial()에서 캐시로 끝난 요청 — handle_exception이 응답으로 돌려줌 (뷰 본문은 안 탐)"""
+
+    def __init__(self, response):
+        self.response = response
+
+
+class VersionedResponseMixin:
+    """
+    APIView용 GET 응답 캐시 — cache_datasets에 응답이 의존하는 데이터셋 이름을 나열
+    (versioning.py 상수, 그 데이터를 바꾸는 명령은 모두 bump_version 해야 함)
+    """
+
+    cache_datasets: Tuple[str, ...] = ()
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        self._cache_key = None
+        if request.method not in ("GET", "HEAD") or not self.cache_datasets:
+            return
+        key = response_key(request.path, request.query_params, request.accepted_media_type or "",
+                           cached_versions(self.cache_datasets))
+        self._cache_key = key
+        etag = f'"{key}"'
+
+        if etag in parse_etags(request.META.get("HTTP_IF_NONE_MATCH", "")):
+            raise _CachedResponse(self._tag(HttpResponseNotModified(), etag))
+        hit = get_response_cache().get(key)
+        if hit is not None:
+            body, content_type = hit
+            raise _CachedResponse(self._tag(HttpResponse(body, content_type=content_type), etag))
+
+    def handle_exception(self, exc):
+        if isinstance(exc, _CachedResponse):
+            return exc.response
+        return super().handle_exception(exc)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+        key = getattr(self, "_cache_key", None)
+        if key and response.status_code == 200 and not response.has_header("ETag"):
+            if not response.streaming:  # 스트리밍 응답은 본문을 모으지 않음 (ETag/304만)
+                response.render()  # 저장할 바이트가 필요 (DRF Response는 원래 나중에 렌더링)
+                get_response_cache().set(key, response.content, response["Content-Type"])
+            self._tag(response, f'"{key}"')
+        return response
+
+    @staticmethod
+    def _tag(response, etag: str):
+        response["ETag"] = etag
+        patch_cache_control(response, private=True, no_cache=True)  # 브라우저는 저장하되 매번 재검증(304)
+        return response
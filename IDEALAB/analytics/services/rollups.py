@@ -0,0 +1,116 @@
+# analytics/services/rollups.py
+# IndustryMetric → IndustryRollup (지역 × 분기 × 업종 합계)
+#
+#   rebuild_industry_rollup(["20244"])   # 적재한 분기만
+#   rebuild_industry_rollup()            # 전체 (TradingArea 지역 코드가 바뀐 뒤)
+#
+# 분기 하나씩: 원본 행을 한 번 훑어 서울/자치구/행정동 합계를 메모리에서 만든 뒤
+# 그 분기의 롤업 행을 지우고 다시 넣음 (분기마다 트랜잭션 하나)
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from django.db import transaction
+from django.db.models import Sum
+
+from analytics.models import IndustryMetric, IndustryRollup, TradingArea
+from analytics.services.csv_loader import DEFAULT_BATCH_SIZE
+
+AMOUNT_FIELDS = ("thsmon_selng_amt", "thsmon_selng_co", "mdwk_selng_amt", "wkend_selng_amt")
+CHUNK = 20000
+
+
+def _region_keys() -> Dict[str, List[Tuple[str, str]]]:
+    """trdar_cd → [(region_level, region_cd), ...]"""
+    keys = {}
+    for trdar_cd, signgu_cd, adstrd_cd in TradingArea.objects.values_list("trdar_cd", "signgu_cd", "adstrd_cd"):
+        k = [(IndustryRollup.LEVEL_CITY, IndustryRollup.CITY_CD)]
+        if signgu_cd:
+            k.append((IndustryRollup.LEVEL_SIGNGU, signgu_cd))
+        if adstrd_cd:
+            k.append((IndustryRollup.LEVEL_ADSTRD, adstrd_cd))
+        keys[trdar_cd] = k
+    return keys
+
+
+def _add(acc: list, values) -> None:
+    acc[0] += 1
+    for i, v in enumerate(values, 1):
+        if v is not None:
+            acc[i] = v if acc[i] is None else acc[i] + v
+
+
+def _rollup_rows(yyq: str, regions: Dict[str, List[Tuple[str, str]]]) -> List[IndustryRollup]:
+    sums: Dict[tuple, list] = {}
+    qs = IndustryMetric.objects.filter(yyq=yyq).order_by().values_list("trdar_cd", "svc_induty_cd", *AMOUNT_FIELDS)
+    for trdar_cd, svc, *amounts in qs.iterator(chunk_size=CHUNK):
+        for level, code in regions.get(trdar_cd, ()):
+            key = (level, code, svc or "")
+            acc = sums.get(key)
+            if acc is None:
+                acc = sums[key] = [0, None, None, None, None]
+            _add(acc, amounts)
+    return [
+        IndustryRollup(
+            region_level=level, region_cd=code, yyq=yyq, svc_induty_cd=svc,
+            row_count=acc[0], **dict(zip(AMOUNT_FIELDS, acc[1:])),
+        )
+        for (level, code, svc), acc in sums.items()
+    ]
+
+
+def rebuild_industry_rollup(yyqs: Optional[Iterable[str]] = None, batch_size: int = DEFAULT_BATCH_SIZE) -> int:
+    """
+    yyqs 분기의 롤업을 다시 만듦 (None이면 원본/롤업에 있는 모든 분기) → 기록한 롤업 행 수
+    - 원본에서 사라진 분기는 롤업도 비워짐
+    """
+    if yyqs is None:
+        yyqs = set(IndustryMetric.objects.order_by().values_list("yyq", flat=True).distinct())
+        yyqs |= set(IndustryRollup.objects.order_by().values_list("yyq", flat=True).distinct())
+    regions = _region_keys()
+    written = 0
+    for yyq in sorted(set(yyqs)):
+        rows = _rollup_rows(yyq, regions)
+        with transaction.atomic():
+            IndustryRollup.objects.filter(yyq=yyq).delete()
+            IndustryRollup.objects.bulk_create(rows, batch_size=batch_size)
+        written += len(rows)
+    return written
+
+
+def _rollup_region(signgu_cd: Optional[str], adstrd_cd: Optional[str]) -> Tuple[str, str]:
+    if adstrd_cd:
+        return IndustryRollup.LEVEL_ADSTRD, adstrd_cd
+    if signgu_cd:
+        return IndustryRollup.LEVEL_SIGNGU, signgu_cd
+    return IndustryRollup.LEVEL_CITY, IndustryRollup.CITY_CD
+
+
+def industry_rollup_aggregate(signgu_cd: Optional[str], adstrd_cd: Optional[str], yyq: str) -> Optional[dict]:
+    """
+    지역 합계를 롤업에서 한 번의 인덱스 조회로 (뷰 aggregate와 같은 키)
+    - 롤업에 그 지역/분기 행이 없으면 None → 호출 측이 원본으로 확인
+    """
+    level, code = _rollup_region(signgu_cd, adstrd_cd)
+    agg = IndustryRollup.objects.filter(region_level=level, region_cd=code, yyq=yyq).aggregate(
+        row_count=Sum("row_count"),
+        **{f"{f}_sum": Sum(f) for f in AMOUNT_FIELDS},
+    )
+    if not agg.pop("row_count"):
+        return None
+    return agg
+
+
+def industry_rollup_series(signgu_cd: Optional[str], adstrd_cd: Optional[str], yyqs: Sequence[str],
+                           svc_induty_cd: Optional[str] = None) -> Dict[str, dict]:
+    """
+    분기별 지역 합계 (GROUP BY yyq 한 번) → {yyq: {row_count, thsmon_selng_amt, ...}}
+    - 롤업에 행이 없는 분기는 빠짐
+    """
+    level, code = _rollup_region(signgu_cd, adstrd_cd)
+    qs = IndustryRollup.objects.filter(region_level=level, region_cd=code, yyq__in=list(yyqs))
+    if svc_induty_cd:
+        qs = qs.filter(svc_induty_cd=svc_induty_cd)
+    rows = qs.order_by().values("yyq").annotate(row_count_sum=Sum("row_count"), **{f"{f}_sum": Sum(f) for f in AMOUNT_FIELDS})
+    return {
+        r["yyq"]: {"row_count": r["row_count_sum"], **{f: r[f"{f}_sum"] for f in AMOUNT_FIELDS}}
+        for r in rows
+    }
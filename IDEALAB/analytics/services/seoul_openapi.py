@@ -1,8 +1,17 @@
 import os
+import random
+import threading
+import time
 import requests
-from typing import Dict, Any, Iterator, List
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
+from typing import Dict, Any, Callable, Iterator, List, Optional
 import logging
 from urllib.parse import urlencode
+
+from analytics.services.http_cache import get_http_cache
+
 logger = logging.getLogger(__name__)
 
 
@@ -10,69 +19,211 @@ SEOUL_API_KEY = os.getenv("SEOUL_OPENAPI_KEY", "").strip()
 
 BASE = "http://openapi.seoul.go.kr:8088"
 
+# 페이지 동시 요청 수 (서울 열린데이터 API는 페이지당 최대 1000행)
+DEFAULT_WORKERS = int(os.getenv("SEOUL_OPENAPI_WORKERS", "4"))
+MAX_RETRIES = 3
+BACKOFF_BASE = 0.5  # 초, 시도마다 2배 + jitter
+OK_CODE = "INFO-000"  # RESULT.CODE 정상
+
+
+class OpenApiError(RuntimeError):
+    """HTTP 200이지만 본문이 오류(RESULT.CODE)이거나 응답이 불완전한 경우"""
+
+_session_lock = threading.Lock()
+_session: Optional[requests.Session] = None
+_pool_size = 0
+
+
+def get_session(pool_size: int = DEFAULT_WORKERS) -> requests.Session:
+    """
+    프로세스 공용 keep-alive 세션 (커넥션 풀 = 동시 요청 수 이상)
+    - 더 큰 pool_size로 부르면 어댑터를 키워서 다시 마운트 (동시 요청이 풀을 넘어 연결을 버리지 않게)
+    """
+    global _session, _pool_size
+    pool = max(pool_size, 10)
+    if _session is None or pool > _pool_size:
+        with _session_lock:
+            if _session is None:
+                _session = requests.Session()
+            if pool > _pool_size:
+                _session.mount("http://", HTTPAdapter(pool_connections=2, pool_maxsize=pool))
+                _session.mount("https://", HTTPAdapter(pool_connections=2, pool_maxsize=pool))
+                _pool_size = pool
+    return _session
+
+
+def _retryable(exc: Exception) -> bool:
+    if isinstance(exc, requests.HTTPError) and exc.response is not None:
+        code = exc.response.status_code
+        return code == 429 or code >= 500
+    return isinstance(exc, (requests.ConnectionError, requests.Timeout))
+
+
+def get_with_retry(url: str, params: Optional[dict] = None, timeout: int = 20,
+                   retries: int = MAX_RETRIES) -> requests.Response:
+    """
+    GET + 재시도 (연결 오류/타임아웃/429/5xx만, 지수 backoff + jitter)
+    - 4xx 같은 영구 오류는 바로 raise
+    - ANALYTICS_HTTP_CACHE가 켜져 있으면 디스크 캐시를 먼저 봄 (services/http_cache.py)
+    """
+    cache = get_http_cache()
+    if cache is None:
+        return _get_with_retry(url, params, timeout, retries)
+    return cache.get(url, params, lambda headers: _get_with_retry(url, params, timeout, retries, headers))
+
+
+def _get_with_retry(url: str, params: Optional[dict], timeout: int, retries: int,
+                    headers: Optional[dict] = None) -> requests.Response:
+    for attempt in range(retries + 1):
+        try:
+            resp = get_session().get(url, params=params, timeout=timeout, headers=headers)
+            resp.raise_for_status()
+            return resp
+        except requests.RequestException as e:
+            if attempt >= retries or not _retryable(e):
+                raise
+            delay = BACKOFF_BASE * (2 ** attempt) * (1 + random.random())
+            logger.warning("retry %s/%s in %.1fs: %s (%s)", attempt + 1, retries, delay, url, e)
+            time.sleep(delay)
+
+
+def get_json_with_retry(url: str, params: Optional[dict] = None, timeout: int = 20,
+                        retries: int = MAX_RETRIES) -> Dict[str, Any]:
+    """get_with_retry + JSON 파싱 (본문이 깨져서 온 경우도 재시도)"""
+    for attempt in range(retries + 1):
+        resp = get_with_retry(url, params=params, timeout=timeout, retries=retries)
+        try:
+            return resp.json()
+        except ValueError:
+            if attempt >= retries:
+                raise
+            time.sleep(BACKOFF_BASE * (2 ** attempt) * (1 + random.random()))
+
+
+def page_ranges(total: int, page_size: int, first_end: int):
+    """첫 페이지(1..first_end) 이후 남은 (start, end) 구간들"""
+    start = first_end + 1
+    while start <= total:
+        end = min(start + page_size - 1, total)
+        yield start, end
+        start = end + 1
+
+
+def iter_pages_concurrently(
+    fetch_rows: Callable[[int, int], List[Dict[str, Any]]],
+    ranges,
+    workers: int = DEFAULT_WORKERS,
+) -> Iterator[Dict[str, Any]]:
+    """
+    (start, end) 구간들을 최대 workers개씩 동시에 요청하되 행은 구간 순서대로 yield
+    - 앞 페이지가 느려도 뒤 페이지는 미리 받아두고, 메모리는 workers*2 페이지로 제한
+    """
+    ranges = iter(ranges)
+    if workers <= 1:
+        for start, end in ranges:
+            yield from fetch_rows(start, end)
+        return
+
+    get_session(workers)  # 커넥션 풀을 workers에 맞춤
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        pending = deque()
+        for start, end in ranges:
+            pending.append(pool.submit(fetch_rows, start, end))
+            if len(pending) >= workers * 2:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
+
+
 def fetch_TbgisTrdarRelm(start: int, end: int) -> Dict[str, Any]:
     if not SEOUL_API_KEY:
         raise RuntimeError("SEOUL_API_KEY not set")
     url = f"{BASE}/{SEOUL_API_KEY}/json/TbgisTrdarRelm/{start}/{end}"
-    resp = requests.get(url, timeout=20)
-    resp.raise_for_status()
-    return resp.json()
-
-def iter_TbgisTrdarRelm(page_size: int = 1000) -> Iterator[Dict[str, Any]]:
+    return get_json_with_retry(url, timeout=20)
+
+def _TbgisTrdarRelm_block(start: int, end: int) -> Dict[str, Any]:
+    """한 페이지 블록 — 200이어도 RESULT가 정상(INFO-000)이 아니거나 row 목록이 없으면 raise"""
+    payload = fetch_TbgisTrdarRelm(start, end)
+    block = payload.get("TbgisTrdarRelm")
+    header = (block or {}).get("RESULT") or payload.get("RESULT") or {}
+    if header.get("CODE") != OK_CODE or not isinstance((block or {}).get("row"), list):
+        raise OpenApiError(f"TbgisTrdarRelm {start}-{end}: {header.get('CODE')} {header.get('MESSAGE')}")
+    return block
+
+def _TbgisTrdarRelm_rows(start: int, end: int) -> List[Dict[str, Any]]:
+    return _TbgisTrdarRelm_block(start, end)["row"]
+
+def iter_TbgisTrdarRelm(page_size: int = 1000, workers: int = DEFAULT_WORKERS,
+                        meta: Optional[dict] = None) -> Iterator[Dict[str, Any]]:
     """
     페이지네이션 반복자 (list_total_count를 이용해 전량 조회)
+    - 첫 페이지로 전체 건수를 알면 나머지 페이지는 workers개씩 동시에 받음 (순서는 유지)
+    - 오류 페이지가 있거나 받은 행 수가 list_total_count와 다르면 OpenApiError (일부만 준 채로 끝나지 않음)
+    - meta에 dict를 넘기면 meta["total"] = list_total_count
     """
-    start, end = 1, page_size
-    first = fetch_TbgisTrdarRelm(start, end)
-    root = first.get("TbgisTrdarRelm", {})
+    root = _TbgisTrdarRelm_block(1, page_size)
     total = int(root.get("list_total_count", 0))
-    rows = root.get("row", []) or []
-    for r in rows:
+    if meta is not None:
+        meta["total"] = total
+    count = 0
+    for r in root["row"]:
+        count += 1
         yield r
-    while end < total:
-        start = end + 1
-        end = min(end + page_size, total)
-        js = fetch_TbgisTrdarRelm(start, end)
-        rows = js.get("TbgisTrdarRelm", {}).get("row", []) or []
-        for r in rows:
-            yield r
-
-def iter_industry_metrics(trdar=None, year=None):
+    for r in iter_pages_concurrently(_TbgisTrdarRelm_rows, page_ranges(total, page_size, page_size), workers):
+        count += 1
+        yield r
+    if count != total:
+        raise OpenApiError(f"TbgisTrdarRelm: got {count} rows, list_total_count={total}")
+
+def _industry_metric_row(r: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "trdar_cd": r.get("TRDAR_CD"),
+        "year": int(r.get("STDR_YY")),
+        "avg_sales": float(r.get("AVG_SALE", 0)),
+        "growth_rate": float(r.get("GROWTH_RATE", 0)),
+        "closure_rate": float(r.get("CLOSURE_RATE", 0)),
+        "change_index": float(r.get("CHANGE_IDX", 0)),
+    }
+
+def iter_industry_metrics(trdar=None, year=None, page_size: int = 1000, workers: int = DEFAULT_WORKERS):
     """
     서울열린데이터 '유망업종/평균매출/성장률/상권변화지표' API 호출 → dict 반복자
     (API 실제 스펙에 맞춰 SERVICE 이름, 필드명 수정 필요)
+    - list_total_count가 오면 남은 페이지는 동시 요청, 없으면 빈 페이지까지 순차 요청
     """
     base_url = "http://openapi.seoul.go.kr:8088"
     service = "VwsmTrdarSelngQq"  # 실제 서비스명으로 교체 필요
-    start, end = 1, 1000
+    params = {}
+    if trdar:
+        params["TRDAR_CD"] = trdar
+    if year:
+        params["STDR_YY"] = year
 
-    while True:
+    def fetch_block(start, end):
         url = f"{base_url}/{SEOUL_API_KEY}/json/{service}/{start}/{end}"
-        params = {}
-        if trdar:
-            params["TRDAR_CD"] = trdar
-        if year:
-            params["STDR_YY"] = year
-
-        resp = requests.get(url, params=params, timeout=20)
-        resp.raise_for_status()
-        data = resp.json().get(service, {})
-        rows = data.get("row", [])
-        if not rows:
-            break
+        return get_json_with_retry(url, params=params, timeout=20).get(service, {})
+
+    def fetch_rows(start, end):
+        return [_industry_metric_row(r) for r in fetch_block(start, end).get("row", []) or []]
+
+    first = fetch_block(1, page_size)
+    rows = first.get("row", []) or []
+    yield from (_industry_metric_row(r) for r in rows)
+    if not rows:
+        return
 
-        for r in rows:
-            yield {
-                "trdar_cd": r.get("TRDAR_CD"),
-                "year": int(r.get("STDR_YY")),
-                "avg_sales": float(r.get("AVG_SALE", 0)),
-                "growth_rate": float(r.get("GROWTH_RATE", 0)),
-                "closure_rate": float(r.get("CLOSURE_RATE", 0)),
-                "change_index": float(r.get("CHANGE_IDX", 0)),
-            }
+    total = first.get("list_total_count")
+    if total is not None:
+        yield from iter_pages_concurrently(fetch_rows, page_ranges(int(total), page_size, page_size), workers)
+        return
 
-        start += 1000
-        end += 1000
+    start = page_size + 1
+    while True:
+        rows = fetch_rows(start, start + page_size - 1)
+        if not rows:
+            break
+        yield from rows
+        start += page_size
 
 def _build_url(service: str, start: int, end: int, params: dict) -> str:
     """
@@ -89,8 +240,7 @@ def _build_url(service: str, start: int, end: int, params: dict) -> str:
 
 def fetch_service(service: str, start: int, end: int, **params):
     url = _build_url(service, start, end, params)
-    resp = requests.get(url, timeout=20)
-    resp.raise_for_status()
+    resp = get_with_retry(url, timeout=20)
     text = resp.text.strip()
 
     # 혹시나 HTML/XML이 오면 바로 에러 메시지 노출
@@ -0,0 +1,199 @@
+# analytics/services/snapshot.py
+# ChangeIndex / IndustryMetric 컬럼형(NumPy) 스냅샷 — export_analytics_snapshot으로 생성
+#
+# 디렉터리 구조 (ANALYTICS_SNAPSHOT_DIR)
+#   CURRENT                 ← 현재 스냅샷 폴더 이름 (원자적으로 교체)
+#   .<이름>.<uuid>/          ← 쓰는 중인 폴더 (다 쓰면 <이름>/으로 옮김, 정리 대상 아님)
+#   <YYYYmmddTHHMMSSffffff>/
+#     meta.json             ← 문자열 사전(trdar/yyq/svc/signgu/adstrd) + 생성 시각 + 데이터셋 버전
+#     ta_signgu.npy, ta_adstrd.npy           ← trdar 인덱스 → 자치구/행정동 인덱스
+#                                              (-1 = 코드 없음, -2 = TradingArea에 없는 상권)
+#     ci_*.npy, im_*.npy                     ← yyq 순으로 정렬된 행 + yyq별 offset
+#                                              (금액은 원 단위 ×100 정수 + NULL 마스크 → 합계가 DB Decimal과 같음)
+#
+# 웹 워커는 np.load(mmap_mode="r")로 열기 때문에 같은 서버의 워커들이 page cache 한 벌을 공유
+# meta의 versions가 현재 데이터셋 버전과 다르면(내보낸 뒤 적재/동기화) 스냅샷은 안 씀 → DB 경로
+import json
+import os
+import shutil
+import threading
+import uuid
+from decimal import Decimal
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+from django.conf import settings
+
+from analytics.services.versioning import CHANGE_INDEX, INDUSTRY_METRIC, TRADING_AREA, cached_versions
+from analytics.utils import SCORE_TO_LEVEL
+
+META_FILE = "meta.json"
+CURRENT_FILE = "CURRENT"
+TMP_PREFIX = "."  # 쓰는 중인 폴더/파일
+
+NO_REGION = -1
+NOT_IN_TRADING_AREA = -2
+_NO_MATCH = -3  # 사전에 없는 지역 코드 → 어떤 상권과도 매칭 안 됨
+
+INDUSTRY_AMOUNT_FIELDS = ("thsmon_selng_amt", "thsmon_selng_co", "mdwk_selng_amt", "wkend_selng_amt")
+AMOUNT_DECIMALS = 2  # DecimalField(decimal_places=2) → 스냅샷에는 10**2 배 정수로
+
+# 스냅샷에 담긴 데이터셋 — 내보낼 때의 버전을 meta["versions"]에 기록
+SNAPSHOT_DATASETS = (TRADING_AREA, CHANGE_INDEX, INDUSTRY_METRIC)
+
+
+def snapshot_root() -> str:
+    return getattr(settings, "ANALYTICS_SNAPSHOT_DIR", "") or ""
+
+
+def write_snapshot(root: str, name: str, meta: dict, arrays: Dict[str, np.ndarray]) -> str:
+    """
+    임시 폴더에 배열 + meta를 다 쓴 뒤 root/name 으로 옮기고, 그 다음에 CURRENT를 교체
+    - 있는 폴더에는 절대 덮어쓰지 않음 (워커가 mmap한 .npy를 자르면 SIGBUS)
+    """
+    path = os.path.join(root, name)
+    tmp_dir = os.path.join(root, f"{TMP_PREFIX}{name}.{uuid.uuid4().hex}")
+    os.makedirs(tmp_dir)
+    try:
+        for key, arr in arrays.items():
+            np.save(os.path.join(tmp_dir, f"{key}.npy"), arr)
+        with open(os.path.join(tmp_dir, META_FILE), "w", encoding="utf-8") as f:
+            json.dump(meta, f, ensure_ascii=False)
+        if os.path.exists(path):
+            raise FileExistsError(path)
+        os.replace(tmp_dir, path)
+    except BaseException:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        raise
+
+    tmp = os.path.join(root, f"{TMP_PREFIX}{CURRENT_FILE}.{uuid.uuid4().hex}")
+    with open(tmp, "w") as f:
+        f.write(name)
+    os.replace(tmp, os.path.join(root, CURRENT_FILE))
+    return path
+
+
+class AnalyticsSnapshot:
+    def __init__(self, path: str):
+        self.path = path
+        with open(os.path.join(path, META_FILE), encoding="utf-8") as f:
+            self.meta = json.load(f)
+
+        self.trdars: List[str] = self.meta["trdar"]
+        self.trdar_pos = {cd: i for i, cd in enumerate(self.trdars)}
+        self.signgu_pos = {cd: i for i, cd in enumerate(self.meta["signgu"])}
+        self.adstrd_pos = {cd: i for i, cd in enumerate(self.meta["adstrd"])}
+        self.yyq_pos = {
+            "change_index": {q: i for i, q in enumerate(self.meta["ci_yyq"])},
+            "industry_metric": {q: i for i, q in enumerate(self.meta["im_yyq"])},
+        }
+
+        self.ta_signgu = self._load("ta_signgu")
+        self.ta_adstrd = self._load("ta_adstrd")
+
+        self.ci_offsets = self._load("ci_yyq_offsets")
+        self.ci_trdar = self._load("ci_trdar")
+        self.ci_score = self._load("ci_score")
+
+        self.im_offsets = self._load("im_yyq_offsets")
+        self.im_trdar = self._load("im_trdar")
+        self.im_amounts = {f: self._load(f"im_{f}") for f in INDUSTRY_AMOUNT_FIELDS}
+        self.im_nulls = {f: self._load(f"im_{f}_null") for f in INDUSTRY_AMOUNT_FIELDS}
+        versions = self.meta.get("versions") or {}
+        self.versions = tuple(versions.get(n) for n in SNAPSHOT_DATASETS)
+
+    def is_current(self) -> bool:
+        return self.versions == cached_versions(SNAPSHOT_DATASETS)
+
+    def _load(self, key: str) -> np.ndarray:
+        return np.load(os.path.join(self.path, f"{key}.npy"), mmap_mode="r")
+
+    # ---- 지역 → 상권 ----
+    def region_trdar_mask(self, signgu_cd: Optional[str], adstrd_cd: Optional[str]) -> np.ndarray:
+        """filter_trading_areas_by_region과 같은 규칙 (adstrd 우선, 둘 다 없으면 전체)"""
+        if adstrd_cd:
+            pos = self.adstrd_pos.get(adstrd_cd, _NO_MATCH)
+            return np.asarray(self.ta_adstrd) == pos
+        if signgu_cd:
+            pos = self.signgu_pos.get(signgu_cd, _NO_MATCH)
+            return np.asarray(self.ta_signgu) == pos
+        # 전체: TradingArea에 있는 상권만 (지표에만 있는 코드는 제외)
+        return np.asarray(self.ta_signgu) != NOT_IN_TRADING_AREA
+
+    def trdar_codes(self, mask: np.ndarray) -> List[str]:
+        return [self.trdars[i] for i in np.flatnonzero(mask)]
+
+    def trdar_mask_of(self, codes: Sequence[str]) -> np.ndarray:
+        mask = np.zeros(len(self.trdars), dtype=bool)
+        idx = [self.trdar_pos[c] for c in codes if c in self.trdar_pos]
+        mask[idx] = True
+        return mask
+
+    # ---- 분기 슬라이스 ----
+    def _slice(self, table: str, yyq: str) -> Optional[slice]:
+        q = self.yyq_pos[table].get(yyq)
+        if q is None:
+            return None
+        offsets = self.ci_offsets if table == "change_index" else self.im_offsets
+        return slice(int(offsets[q]), int(offsets[q + 1]))
+
+    def has_yyq(self, table: str, yyq: str) -> bool:
+        return yyq in self.yyq_pos[table]
+
+    def industry_aggregate(self, yyq: str, trdar_mask: np.ndarray):
+        """(행 수, {필드_sum: 합계}) — IndustryMetricsByRegionView aggregate와 같은 키/타입 (Decimal, 값이 없으면 None)"""
+        sl = self._slice("industry_metric", yyq)
+        if sl is None:
+            return 0, {}
+        rows = trdar_mask[self.im_trdar[sl]]
+        n = int(rows.sum())
+        agg = {}
+        for field, arr in self.im_amounts.items():
+            if self.im_nulls[field][sl][rows].all():
+                agg[f"{field}_sum"] = None
+            else:
+                agg[f"{field}_sum"] = Decimal(int(arr[sl][rows].sum())).scaleb(-AMOUNT_DECIMALS)
+        return n, agg
+
+    def change_index_aggregate(self, yyq: str, trdar_mask: np.ndarray):
+        """(행 수, 평균 점수, {레벨: 개수}) — 점수 없는 행(NaN)은 평균/개수에서 제외"""
+        sl = self._slice("change_index", yyq)
+        if sl is None:
+            return 0, None, {}
+        rows = trdar_mask[self.ci_trdar[sl]]
+        scores = self.ci_score[sl][rows]
+        valid = scores[~np.isnan(scores)]
+        bins = np.bincount(valid.astype(np.int64), minlength=len(SCORE_TO_LEVEL)) if valid.size else []
+        level_counts = {
+            SCORE_TO_LEVEL[score]: int(n) for score, n in enumerate(bins) if n and score in SCORE_TO_LEVEL
+        }
+        return int(rows.sum()), (float(valid.mean()) if valid.size else None), level_counts
+
+
+_lock = threading.Lock()
+_cached: Dict[str, object] = {"name": None, "snapshot": None}
+
+
+def get_snapshot() -> Optional[AnalyticsSnapshot]:
+    """
+    현재 스냅샷 (없으면 None) — 워커별로 한 번 열고, CURRENT가 바뀌면 다시 염
+    - 내보낸 뒤 데이터셋 버전이 바뀌었으면(버전 기록이 없는 예전 스냅샷 포함) None
+    """
+    root = snapshot_root()
+    if not root:
+        return None
+    try:
+        with open(os.path.join(root, CURRENT_FILE)) as f:
+            name = f.read().strip()
+    except OSError:
+        return None
+    if not name or name != _cached["name"]:
+        with _lock:
+            if name != _cached["name"]:
+                try:
+                    snap = AnalyticsSnapshot(os.path.join(root, name))
+                except (OSError, ValueError, KeyError):
+                    snap = None
+                _cached["name"], _cached["snapshot"] = name, snap
+    snap = _cached["snapshot"]
+    return snap if snap is not None and snap.is_current() else None
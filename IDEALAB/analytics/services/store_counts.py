@@ -0,0 +1,335 @@
+# analytics/services/store_counts.py
+# 반경 내 상가업소(storeListInRadius) 수집 → StoreCount + 분류별 StoreCategoryCount 저장 (fetch_store_counts에서 사용)
+#
+# 비동기 모드: 상권 concurrency개를 동시에 처리하고, 모든 HTTP 요청은 전역 토큰 버킷을 통과
+#   fetcher = AsyncStoreCountFetcher(base, api_key, radii=[500, 1000, 2000], concurrency=8, rate=5)
+#   results = asyncio.run(fetcher.run(areas))      # areas = [(trdar_cd, lon, lat, x, y), ...]
+#
+# 반경 여러 개는 가장 큰 반경만 API로 받고 안쪽 링은 거리 정렬로 계산 (ring_counts)
+import asyncio
+import json
+import math
+import random
+import time
+from collections import Counter
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Sequence, Set, Tuple
+
+import httpx
+import numpy as np
+from asgiref.sync import sync_to_async
+from django.db import connections, transaction
+
+from analytics.models import FetchCheckpoint, StoreCategoryCount, StoreCount
+from analytics.services.csv_loader import BulkUpserter
+from analytics.services.geo import wgs84_to_tm
+from analytics.services.http_cache import ReplayMiss, get_http_cache
+from analytics.services.ratelimit import AsyncTokenBucket
+from analytics.services.store_index import add_store_points, rows_from_api_items, store_point_upserter
+
+PAGE_ROWS = 1000
+MAX_RETRIES = 4
+BACKOFF_BASE = 1.0  # 초, full jitter: uniform(0, BACKOFF_BASE * 2**attempt)
+
+
+def count_items(items: Iterable[dict], c_l: Counter, c_m: Counter, c_s: Counter):
+    for it in items:
+        c_l[it.get("indsLclsNm")] += 1
+        c_m[it.get("indsMclsNm")] += 1
+        c_s[it.get("indsSclsNm")] += 1
+
+
+def ring_counts(items: Sequence[dict], x: float, y: float, radii: Sequence[int]):
+    """
+    가장 큰 반경으로 받은 items → 반경별 누적 [(radius, 점포 수, 대/중/소분류 Counter), ...]
+    - 점포 경도/위도를 TM으로 바꿔 상권 중심(x, y: TM)과의 거리순으로 정렬 → 안쪽 링부터 한 번에 누적
+    - 가장 큰 반경은 API가 준 items 전부 (좌표 없는 점포 포함)
+    """
+    radii = sorted(set(radii))
+    c_l, c_m, c_s = Counter(), Counter(), Counter()
+    result = []
+    rest = items
+    if len(radii) > 1:
+        lon = np.array([_to_float(it.get("lon")) for it in items], dtype=np.float64)
+        lat = np.array([_to_float(it.get("lat")) for it in items], dtype=np.float64)
+        located = np.flatnonzero(~(np.isnan(lon) | np.isnan(lat)))
+        px, py = wgs84_to_tm(lon[located], lat[located])
+        dist = np.hypot(px - x, py - y)
+        order = np.argsort(dist, kind="stable")
+        ordered = [items[i] for i in located[order]]
+        cuts = np.searchsorted(dist[order], radii[:-1], side="right").tolist()
+
+        prev = 0
+        for radius, cut in zip(radii[:-1], cuts):
+            count_items(ordered[prev:cut], c_l, c_m, c_s)
+            prev = cut
+            result.append((radius, cut, Counter(c_l), Counter(c_m), Counter(c_s)))
+        unlocated = np.ones(len(items), dtype=bool)
+        unlocated[located] = False
+        rest = ordered[prev:] + [items[i] for i in np.flatnonzero(unlocated)]
+
+    count_items(rest, c_l, c_m, c_s)
+    result.append((radii[-1], len(items), c_l, c_m, c_s))
+    return result
+
+
+def _to_float(v) -> float:
+    try:
+        return float(v)
+    except (TypeError, ValueError):
+        return float("nan")
+
+
+def save_ring_counts(trdar_cd, cx, cy, rings, total, first_page) -> int:
+    """
+    ring_counts 결과를 StoreCount에 한 번의 bulk upsert로 → 새로 만든 행 수
+    - cx/cy: 상권 중심 WGS84 (경도/위도)
+    - 가장 큰 반경의 total은 API totalCount, 첫 페이지 원본은 그 행의 RawPayload로
+    """
+    upserter = BulkUpserter(
+        StoreCount,
+        unique_fields=("trdar_cd", "radius"),
+        update_fields=("cx", "cy", "total", "counts_lcls", "counts_mcls", "counts_scls"),
+        batch_size=len(rings),
+        raw_source=StoreCount.RAW_SOURCE,
+    )
+    outer = rings[-1][0]
+    for radius, n, c_l, c_m, c_s in rings:
+        upserter.add(
+            trdar_cd=trdar_cd, radius=radius, cx=cx, cy=cy,
+            total=total if radius == outer else n,
+            counts_lcls=dict(c_l), counts_mcls=dict(c_m), counts_scls=dict(c_s),
+            raw_data=first_page if radius == outer else None,
+        )
+    upserter.flush()
+    replace_category_counts(
+        [trdar_cd], [radius for radius, *_ in rings],
+        [row for radius, _, c_l, c_m, c_s in rings for row in category_count_rows(trdar_cd, radius, c_l, c_m, c_s)],
+    )
+    return upserter.created
+
+
+def category_count_rows(trdar_cd, radius, c_l, c_m, c_s) -> List[StoreCategoryCount]:
+    """대/중/소분류 카운터 → StoreCategoryCount 행 (분류명 없는 점포는 뺌)"""
+    cap = StoreCategoryCount._meta.get_field("category").max_length
+    return [
+        StoreCategoryCount(trdar_cd=trdar_cd, radius=radius, level=level, category=category[:cap], count=n)
+        for level, counts in zip(StoreCategoryCount.LEVELS, (c_l, c_m, c_s))
+        for category, n in counts.items()
+        if category and category != "null"
+    ]
+
+
+def replace_category_counts(trdar_cds: Sequence[str], radii: Sequence[int], rows: List[StoreCategoryCount],
+                            batch_size: int = 2000):
+    """(상권 × 반경) 조합의 분류별 행을 통째로 교체 — 사라진 분류가 남지 않도록 지우고 다시 넣음"""
+    with transaction.atomic():
+        StoreCategoryCount.objects.filter(trdar_cd__in=set(trdar_cds), radius__in=set(radii)).delete()
+        StoreCategoryCount.objects.bulk_create(rows, batch_size=batch_size, ignore_conflicts=True)
+
+
+def save_store_points(items: List[dict]) -> int:
+    """API 응답 items를 로컬 점포 데이터(StorePoint)에도 반영 → 반영한 점포 수"""
+    upserter = store_point_upserter()
+    add_store_points(upserter, rows_from_api_items(items))
+    upserter.flush()
+    return upserter.created + upserter.updated
+
+
+# ---- 체크포인트 ----
+def checkpoint_job(radii: Sequence[int]) -> str:
+    return "store_counts:" + ",".join(str(r) for r in sorted(set(radii)))
+
+
+def done_keys(job: str) -> Set[str]:
+    return set(
+        FetchCheckpoint.objects.filter(job=job, status=FetchCheckpoint.STATUS_DONE).values_list("key", flat=True)
+    )
+
+
+def mark_checkpoint(job: str, key: str, ok: bool, attempts: int = 0, pages: int = 0,
+                    elapsed_ms: int = 0, error: str = ""):
+    FetchCheckpoint.objects.update_or_create(
+        job=job, key=key,
+        defaults={
+            "status": FetchCheckpoint.STATUS_DONE if ok else FetchCheckpoint.STATUS_FAILED,
+            "attempts": attempts,
+            "pages": pages,
+            "elapsed_ms": elapsed_ms,
+            "last_error": error[:2000],
+        },
+    )
+
+
+def reset_checkpoints(job: str) -> int:
+    return FetchCheckpoint.objects.filter(job=job).delete()[0]
+
+
+# ---- 비동기 수집 ----
+@dataclass
+class AreaResult:
+    trdar_cd: str
+    ok: bool = False
+    rows: int = 0       # 기록한 StoreCount 행 수 (반경 수)
+    created: int = 0
+    total: int = 0
+    pages: int = 0
+    attempts: int = 0
+    retries: int = 0
+    elapsed: float = 0.0
+    error: str = ""
+
+
+class _Retryable(Exception):
+    pass
+
+
+class AsyncStoreCountFetcher:
+    def __init__(
+        self,
+        base: str,
+        api_key: str,
+        radii: Sequence[int],
+        concurrency: int = 8,
+        rate: float = 5.0,
+        burst: int = 5,
+        retries: int = MAX_RETRIES,
+        timeout: float = 30.0,
+        save_points: bool = False,
+        on_result=None,
+    ):
+        self.url = f"{base}/storeListInRadius"
+        self.api_key = api_key
+        self.radii = sorted(set(radii))
+        self.radius = self.radii[-1]  # API는 가장 큰 반경으로 한 번만
+        self.concurrency = max(1, concurrency)
+        self.bucket = AsyncTokenBucket(rate, burst)
+        self.retries = retries
+        self.timeout = timeout
+        self.job = checkpoint_job(self.radii)
+        self.save_points = save_points  # 받은 점포를 StorePoint에도 upsert (로컬 인덱스 갱신용)
+        self.on_result = on_result  # 상권 하나 끝날 때마다 호출 (진행 로그용)
+        self.cache = get_http_cache()  # ANALYTICS_HTTP_CACHE=off면 None
+
+    async def _get_json(self, client: httpx.AsyncClient, params: dict, res: AreaResult) -> dict:
+        # 캐시 파일 읽기/쓰기는 스레드에서 (이벤트 루프를 막지 않게)
+        cache, key, entry = self.cache, None, None
+        if cache is not None:
+            key = cache.key(self.url, params)
+            entry = await asyncio.to_thread(cache.lookup, key)
+            if entry is not None and cache.is_fresh(entry):
+                return json.loads(entry.body)
+            if cache.mode == "replay":
+                raise ReplayMiss(f"not in cache (replay mode): {self.url}")
+
+        for attempt in range(self.retries + 1):
+            await self.bucket.acquire()
+            res.attempts += 1
+            try:
+                r = await client.get(self.url, params=params, headers=entry.validators if entry else None)
+                if r.status_code == 304 and entry is not None:
+                    return json.loads((await asyncio.to_thread(cache.revalidated, key, entry)).body)
+                if r.status_code == 429 or r.status_code >= 500:
+                    raise _Retryable(f"HTTP {r.status_code}")
+                r.raise_for_status()
+                data = r.json()
+                if cache is not None and cache.cacheable(r.status_code, r.content):
+                    await asyncio.to_thread(cache.store, key, self.url, r.status_code, r.headers, r.content)
+                return data
+            except (_Retryable, httpx.TransportError) as e:
+                if attempt >= self.retries:
+                    raise
+                res.retries += 1
+                await asyncio.sleep(random.uniform(0, BACKOFF_BASE * (2 ** attempt)))
+
+    async def fetch_area(self, client: httpx.AsyncClient, trdar_cd: str,
+                         lon: float, lat: float, x: float, y: float) -> AreaResult:
+        res = AreaResult(trdar_cd=trdar_cd)
+        started = time.monotonic()
+        try:
+            params = {
+                "ServiceKey": self.api_key,
+                "type": "json",
+                "radius": self.radius,
+                "cx": lon,
+                "cy": lat,
+                "pageNo": 1,
+                "numOfRows": PAGE_ROWS,
+            }
+            data = await self._get_json(client, params, res)
+            body = (data or {}).get("body") or {}
+            items = body.get("items") or []
+            res.total = int(body.get("totalCount") or 0)
+            num = int(body.get("numOfRows") or 0)
+            res.pages = 1
+
+            items = list(items)
+            if res.total > num > 0:
+                for page in range(2, math.ceil(res.total / num) + 1):
+                    dd = await self._get_json(client, {**params, "pageNo": page}, res)
+                    items.extend(((dd or {}).get("body") or {}).get("items") or [])
+                    res.pages += 1
+
+            rings = ring_counts(items, x, y, self.radii)
+            res.rows = len(rings)
+            res.created = await sync_to_async(save_ring_counts)(trdar_cd, lon, lat, rings, res.total, data)
+            if self.save_points and items:
+                await sync_to_async(save_store_points)(items)
+            res.ok = True
+        except (httpx.HTTPError, _Retryable, ReplayMiss, ValueError) as e:
+            res.error = f"{type(e).__name__}: {e}"
+        res.elapsed = time.monotonic() - started
+        await sync_to_async(mark_checkpoint)(
+            self.job, trdar_cd, res.ok, res.attempts, res.pages, int(res.elapsed * 1000), res.error
+        )
+        if self.on_result:
+            self.on_result(res)
+        return res
+
+    async def run(self, areas: Sequence[Tuple[str, float, float, float, float]]) -> List[AreaResult]:
+        queue: asyncio.Queue = asyncio.Queue()
+        for area in areas:
+            queue.put_nowait(area)
+        results: List[AreaResult] = []
+        limits = httpx.Limits(max_connections=self.concurrency, max_keepalive_connections=self.concurrency)
+
+        async with httpx.AsyncClient(timeout=self.timeout, limits=limits) as client:
+            async def worker():
+                while True:
+                    try:
+                        area = queue.get_nowait()
+                    except asyncio.QueueEmpty:
+                        return
+                    results.append(await self.fetch_area(client, *area))
+
+            await asyncio.gather(*(worker() for _ in range(self.concurrency)))
+        # sync_to_async 전용 스레드의 DB 커넥션 정리
+        await sync_to_async(connections.close_all)()
+        return results
+
+
+def summarize(results: Sequence[AreaResult], elapsed: float) -> Dict[str, object]:
+    """상권별 지연/실패 지표 요약"""
+    ok = [r for r in results if r.ok]
+    failed = [r for r in results if not r.ok]
+    lat = np.asarray([r.elapsed for r in ok], dtype=np.float64)
+    summary = {
+        "areas": len(results),
+        "ok": len(ok),
+        "failed": len(failed),
+        "rows": sum(r.rows for r in ok),
+        "created": sum(r.created for r in ok),
+        "requests": sum(r.attempts for r in results),
+        "retries": sum(r.retries for r in results),
+        "elapsed_s": round(elapsed, 2),
+        "areas_per_s": round(len(results) / elapsed, 2) if elapsed else None,
+        "latency_s": None,
+        "errors": Counter(r.error.split(":", 1)[0] for r in failed).most_common(5),
+    }
+    if lat.size:
+        p50, p95, p99 = np.percentile(lat, [50, 95, 99])
+        summary["latency_s"] = {
+            "p50": round(float(p50), 3), "p95": round(float(p95), 3),
+            "p99": round(float(p99), 3), "max": round(float(lat.max()), 3),
+        }
+    return summary
@@ -0,0 +1,184 @@
+# analytics/services/store_index.py
+# 상가업소(StorePoint) 반경 검색 인덱스 — scipy cKDTree
+#
+#   index = get_store_index()                    # 없으면 None
+#   idx = index.query(x, y, radius)              # 반경(m) 안 점포들의 인덱스 (TM 좌표)
+#   top = index.counts(idx, "mcls")              # {중분류명: 개수} (bincount)
+#   aggregate_counts(index.rows(idx))            # store_radius.aggregate_counts도 그대로 사용 가능
+#
+# build_store_index 명령이 ANALYTICS_SNAPSHOT_DIR/store_index.npz로 저장하면 워커는 파일만 읽어서 트리를 만듦
+# (파일이 없으면 StorePoint 테이블에서 한 번 빌드해 프로세스에 캐시)
+import os
+import threading
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+from scipy.spatial import cKDTree
+
+from analytics.models import StorePoint
+from analytics.services.csv_loader import BulkUpserter, DEFAULT_BATCH_SIZE
+from analytics.services.geo import wgs84_to_tm
+from analytics.services.snapshot import snapshot_root
+from analytics.services.versioning import STORE_POINT, cached_version
+
+INDEX_FILE = "store_index.npz"
+LEVELS = ("lcls", "mcls", "scls")
+API_NAME_KEYS = {"lcls": "indsLclsNm", "mcls": "indsMclsNm", "scls": "indsSclsNm"}
+CHUNK = 20000
+
+
+def _encode(values: List[Optional[str]]) -> Tuple[np.ndarray, List[str]]:
+    """문자열 → (int32 코드 배열, 이름 사전), 빈 값은 -1"""
+    names = sorted({v for v in values if v})
+    pos = {v: i for i, v in enumerate(names)}
+    return np.fromiter((pos.get(v, -1) for v in values), dtype=np.int32, count=len(values)), names
+
+
+class StoreIndex:
+    def __init__(self, xy: np.ndarray, codes: Dict[str, np.ndarray], names: Dict[str, List[str]]):
+        self.xy = np.asarray(xy, dtype=np.float64).reshape(-1, 2)
+        self.codes = codes
+        self.names = names
+        self.tree = cKDTree(self.xy) if len(self.xy) else None
+
+    def __len__(self):
+        return len(self.xy)
+
+    @classmethod
+    def from_db(cls) -> "StoreIndex":
+        qs = StorePoint.objects.order_by().values_list("x", "y", "inds_lcls_nm", "inds_mcls_nm", "inds_scls_nm")
+        xy, cats = [], ([], [], [])
+        for x, y, l, m, s in qs.iterator(chunk_size=CHUNK):
+            xy.append((x, y))
+            cats[0].append(l)
+            cats[1].append(m)
+            cats[2].append(s)
+        codes, names = {}, {}
+        for level, values in zip(LEVELS, cats):
+            codes[level], names[level] = _encode(values)
+        return cls(np.asarray(xy, dtype=np.float64), codes, names)
+
+    @classmethod
+    def load(cls, path: str) -> "StoreIndex":
+        with np.load(path, allow_pickle=False) as z:
+            codes = {level: z[f"{level}_code"] for level in LEVELS}
+            names = {level: z[f"{level}_names"].tolist() for level in LEVELS}
+            return cls(z["xy"], codes, names)
+
+    def save(self, path: str):
+        """임시 파일에 쓴 뒤 교체 (읽는 워커가 반쯤 쓴 파일을 보지 않도록)"""
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        tmp = path + ".tmp"
+        arrays = {"xy": self.xy}
+        for level in LEVELS:
+            arrays[f"{level}_code"] = self.codes[level]
+            arrays[f"{level}_names"] = np.asarray(self.names[level], dtype=np.str_)
+        with open(tmp, "wb") as f:
+            np.savez(f, **arrays)
+        os.replace(tmp, path)
+
+    # ---- 조회 ----
+    def query(self, x: float, y: float, radius: float) -> np.ndarray:
+        if self.tree is None:
+            return np.empty(0, dtype=np.int64)
+        return np.asarray(self.tree.query_ball_point((x, y), r=radius), dtype=np.int64)
+
+    def counts(self, idx: np.ndarray, level: str = "mcls") -> Dict[str, int]:
+        """{분류명: 개수} — 분류 없는 점포는 제외"""
+        names = self.names[level]
+        codes = self.codes[level][idx]
+        codes = codes[codes >= 0]
+        bins = np.bincount(codes, minlength=len(names))
+        return {names[i]: int(bins[i]) for i in np.flatnonzero(bins)}
+
+    def rows(self, idx: np.ndarray) -> Iterator[dict]:
+        """API row 모양(indsLclsNm/indsMclsNm/indsSclsNm) — aggregate_counts 입력용"""
+        for i in idx:
+            row = {}
+            for level in LEVELS:
+                code = self.codes[level][i]
+                row[API_NAME_KEYS[level]] = self.names[level][code] if code >= 0 else None
+            yield row
+
+
+def index_path() -> str:
+    root = snapshot_root()
+    return os.path.join(root, INDEX_FILE) if root else ""
+
+
+_lock = threading.Lock()
+_cached: Dict[str, object] = {"key": None, "index": None}
+
+
+def get_store_index() -> Optional[StoreIndex]:
+    """
+    프로세스별 캐시 — 파일이 바뀌면(mtime) 다시 읽음
+    - 파일이 없으면 StorePoint에서 빌드, store_point 버전이 바뀌면 다시 빌드
+    - 점포가 하나도 없으면 None (캐시하지 않음 → 적재 후 바로 빌드)
+    """
+    path = index_path()
+    try:
+        key = (path, os.stat(path).st_mtime_ns) if path else None
+    except OSError:
+        key = None
+    if key is None:
+        key = ("db", cached_version(STORE_POINT))
+    if key == _cached["key"]:
+        return _cached["index"]
+
+    with _lock:
+        if key != _cached["key"]:
+            if key[0] == "db":
+                if not StorePoint.objects.exists():
+                    return None
+                index = StoreIndex.from_db()
+            else:
+                index = StoreIndex.load(path)
+            _cached["key"], _cached["index"] = key, index
+    return _cached["index"]
+
+
+# ---- 적재 (CSV 덤프 / API 응답 공용) ----
+STORE_POINT_UPDATE_FIELDS = (
+    "bizes_nm", "inds_lcls_cd", "inds_lcls_nm", "inds_mcls_cd", "inds_mcls_nm",
+    "inds_scls_cd", "inds_scls_nm", "signgu_cd", "adstrd_cd", "lon", "lat", "x", "y", "updated_at",
+)
+API_FIELDS = {
+    "bizes_id": "bizesId", "bizes_nm": "bizesNm",
+    "inds_lcls_cd": "indsLclsCd", "inds_lcls_nm": "indsLclsNm",
+    "inds_mcls_cd": "indsMclsCd", "inds_mcls_nm": "indsMclsNm",
+    "inds_scls_cd": "indsSclsCd", "inds_scls_nm": "indsSclsNm",
+    "signgu_cd": "signguCd", "adstrd_cd": "adongCd",
+}
+
+
+def store_point_upserter(batch_size: int = DEFAULT_BATCH_SIZE) -> BulkUpserter:
+    return BulkUpserter(
+        StorePoint,
+        unique_fields=("bizes_id",),
+        update_fields=STORE_POINT_UPDATE_FIELDS,
+        batch_size=batch_size,
+    )
+
+
+def add_store_points(upserter: BulkUpserter, rows: List[dict]):
+    """경도/위도를 배열로 한 번에 TM 변환한 뒤 upserter에 추가"""
+    if not rows:
+        return
+    x, y = wgs84_to_tm([r["lon"] for r in rows], [r["lat"] for r in rows])
+    for r, xi, yi in zip(rows, x.tolist(), y.tolist()):
+        upserter.add(**r, x=xi, y=yi)
+
+
+def rows_from_api_items(items: List[dict]) -> List[dict]:
+    """storeListInRadius items → StorePoint 값 dict (ID/좌표 없는 항목은 제외)"""
+    rows = []
+    for it in items:
+        try:
+            lon, lat = float(it["lon"]), float(it["lat"])
+        except (KeyError, TypeError, ValueError):
+            continue
+        if not it.get("bizesId"):
+            continue
+        rows.append({field: it.get(key) for field, key in API_FIELDS.items()} | {"lon": lon, "lat": lat})
+    return rows
@@ -1,20 +1,35 @@
 import os
-import time
 import math
-import requests
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterable, Iterator
+
+from analytics.services.ratelimit import TokenBucket
+from analytics.services.seoul_openapi import get_json_with_retry
 
 SEOUL_API_KEY = os.getenv("SEOUL_OPENAPI_KEY")  # 환경변수에 넣어두세요
 BASE_URL = "http://openapi.seoul.go.kr:8088"
 SERVICE = "storeListInRadius"
 
 DEFAULT_NUM_ROWS = 2000  # API가 허용하는 최대치 기준으로 조정
+DEFAULT_RATE = 6.0  # 초당 요청 수 (예전 페이지 사이 sleep 0.15초와 비슷한 수준)
+
+# 같은 API 키를 쓰는 클라이언트끼리 쿼터를 나눠 쓰도록 프로세스 공용
+_shared_limiter = TokenBucket(DEFAULT_RATE, burst=2)
+
 
 class StoreRadiusClient:
-    def __init__(self, api_key: str | None = None):
+    """
+    반경 내 상가 조회 — 페이지 단위 스트리밍
+      for page in client.iter_pages(cx, cy, radius): ...      # 다음 페이지는 백그라운드에서 미리 받음
+      l, m, s, total, meta = client.aggregate(cx, cy, radius)  # 페이지마다 카운터만 갱신 (행 목록을 쌓지 않음)
+    """
+
+    def __init__(self, api_key: str | None = None, limiter: TokenBucket | None = None):
         self.api_key = api_key or SEOUL_API_KEY
         if not self.api_key:
             raise RuntimeError("환경변수 SEOUL_API_KEY 가 필요합니다.")
+        self.limiter = limiter or _shared_limiter
 
     def _endpoint(self, page_no: int, num_rows: int) -> str:
         # /{KEY}/json/storeListInRadius/{pageNo}/{numOfRows}/
@@ -27,9 +42,8 @@ class StoreRadiusClient:
             "cy": cy,
             "radius": radius,
         }
-        r = requests.get(url, params=params, timeout=20)
-        r.raise_for_status()
-        j = r.json()
+        self.limiter.acquire()
+        j = get_json_with_retry(url, params=params, timeout=20)
         # 에러 처리 포맷 방어
         block = j.get(SERVICE) or j.get(SERVICE[0].lower() + SERVICE[1:]) or {}
         return {
@@ -38,38 +52,60 @@ class StoreRadiusClient:
             "raw": block,
         }
 
-    def fetch_all(self, cx: int, cy: int, radius: int = 2000, sleep_sec: float = 0.15):
-        # 1페이지 먼저
-        page_no = 1
-        first = self.fetch_page(cx, cy, radius, page_no)
+    def iter_pages(self, cx: int, cy: int, radius: int = 2000, num_rows: int = DEFAULT_NUM_ROWS) -> Iterator[dict]:
+        """
+        페이지 dict를 순서대로 yield — 호출 측이 현재 페이지를 처리하는 동안 다음 페이지를 받아둠
+        - 메모리에는 처리 중인 페이지 + 받는 중인 페이지 하나만
+        - 중간에 멈추면(break) 받던 페이지는 버림
+        """
+        first = self.fetch_page(cx, cy, radius, 1, num_rows)
         total = int(first["total"] or 0)
-        rows = list(first["rows"])
-        raw_meta = {"first_result": first.get("raw", {})}
-
-        if total <= len(rows):
-            return rows, total, raw_meta
-
-        # 나머지 페이지
-        num_rows = DEFAULT_NUM_ROWS
-        total_pages = math.ceil(total / num_rows)
-        for page_no in range(2, total_pages + 1):
-            time.sleep(sleep_sec)  # 과도 호출 방지
-            page = self.fetch_page(cx, cy, radius, page_no, num_rows)
+        total_pages = math.ceil(total / num_rows) if total > len(first["rows"]) else 1
+        if total_pages <= 1:
+            yield first
+            return
+
+        pool = ThreadPoolExecutor(max_workers=1)
+        try:
+            nxt = pool.submit(self.fetch_page, cx, cy, radius, 2, num_rows)
+            yield first
+            del first
+            for page_no in range(2, total_pages + 1):
+                page = nxt.result()
+                if page_no < total_pages:
+                    nxt = pool.submit(self.fetch_page, cx, cy, radius, page_no + 1, num_rows)
+                yield page
+        finally:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    def iter_rows(self, cx: int, cy: int, radius: int = 2000) -> Iterator[dict]:
+        for page in self.iter_pages(cx, cy, radius):
+            yield from page["rows"]
+
+    def aggregate(self, cx: int, cy: int, radius: int = 2000):
+        """페이지마다 대/중/소분류 카운터만 갱신 → (l, m, s, total, raw_meta)"""
+        l, m, s = defaultdict(int), defaultdict(int), defaultdict(int)
+        total, raw_meta = 0, {}
+        for page in self.iter_pages(cx, cy, radius):
+            if not raw_meta:
+                total = int(page["total"] or 0)
+                raw_meta = {"first_result": page.get("raw", {})}
+            update_counts(page["rows"], l, m, s)
+        return dict(l), dict(m), dict(s), total, raw_meta
+
+    def fetch_all(self, cx: int, cy: int, radius: int = 2000):
+        """행 전체가 필요할 때만 — 집계만 할 거면 aggregate()"""
+        rows, total, raw_meta = [], 0, {}
+        for page in self.iter_pages(cx, cy, radius):
+            if not raw_meta:
+                total = int(page["total"] or 0)
+                raw_meta = {"first_result": page.get("raw", {})}
             rows.extend(page["rows"])
         return rows, total, raw_meta
 
 
-def aggregate_counts(rows: list[dict]):
-    """
-    API row 예시(문서 기준):
-      - indsLclsCd / indsLclsNm (대분류)
-      - indsMclsCd / indsMclsNm (중분류)
-      - indsSclsCd / indsSclsNm (소분류)
-    """
-    l = defaultdict(int)
-    m = defaultdict(int)
-    s = defaultdict(int)
-
+def update_counts(rows: Iterable[dict], l, m, s):
+    """rows의 분류별 개수를 l/m/s(defaultdict(int))에 더함"""
     for r in rows:
         # 이름 우선, 없으면 코드로 대체
         ln = r.get("indsLclsNm") or r.get("indsLclsCd")
@@ -80,4 +116,18 @@ def aggregate_counts(rows: list[dict]):
         if mn: m[mn] += 1
         if sn: s[sn] += 1
 
-    return dict(l), dict(m), dict(s)
\ No newline at end of file
+
+def aggregate_counts(rows: Iterable[dict]):
+    """
+    API row 예시(문서 기준):
+      - indsLclsCd / indsLclsNm (대분류)
+      - indsMclsCd / indsMclsNm (중분류)
+      - indsSclsCd / indsSclsNm (소분류)
+    로컬 점포 인덱스 결과도 같은 키로 넘길 수 있음: aggregate_counts(index.rows(idx))
+    제너레이터도 그대로 받음 (리스트로 모으지 않음)
+    """
+    l = defaultdict(int)
+    m = defaultdict(int)
+    s = defaultdict(int)
+    update_counts(rows, l, m, s)
+    return dict(l), dict(m), dict(s)
@@ -0,0 +1,49 @@
+# analytics/services/streaming.py
+# 큰 응답(서울 전체 items 등)을 JSON 조각으로 흘려보내기 — 전체 리스트를 메모리에 만들지 않음
+#
+#   body = stream_json(head, "items", rows, tail)      # tail()은 rows를 다 보낸 뒤 호출 (aggregate 등)
+#   return StreamingHttpResponse(body, content_type="application/json")
+#
+#   rows = iter_keyset(qs.values(...), ("trdar_cd", "svc_induty_cd"))   # 키셋 배치로 끝까지
+#
+# MySQL 드라이버는 iterator()도 결과 전체를 클라이언트 메모리에 받으므로,
+# 배치마다 키셋 쿼리(인덱스 range scan)를 새로 던져 어떤 DB에서든 메모리를 배치 크기로 고정
+from typing import Callable, Iterable, Iterator, Optional, Sequence
+
+from rest_framework.utils.encoders import JSONEncoder
+
+from analytics.services.pagination import keyset_page
+
+BATCH_SIZE = 2000
+FLUSH_ROWS = 200  # 이 정도 행을 모아서 한 조각으로 (조각이 너무 잘면 오버헤드)
+
+# DRF JSONRenderer와 같은 출력 (Decimal → float, 한글 그대로, 공백 없음)
+_encoder = JSONEncoder(ensure_ascii=False, separators=(",", ":"))
+
+
+def iter_keyset(qs, keys: Sequence[str], batch_size: int = BATCH_SIZE) -> Iterator[dict]:
+    cursor: Optional[str] = None
+    while True:
+        rows, cursor = keyset_page(qs, keys, cursor, batch_size)
+        yield from rows
+        if cursor is None:
+            return
+
+
+def stream_json(head: dict, items_key: str, items: Iterable[dict], tail: Callable[[], dict]) -> Iterator[bytes]:
+    """{**head, items_key: [...items], **tail()} 를 bytes 조각으로"""
+    opening = _encoder.encode(head)[:-1]
+    yield f'{opening}{"," if head else ""}"{items_key}":['.encode("utf-8")
+
+    buf, first = [], True
+    for row in items:
+        buf.append(_encoder.encode(row) if first else "," + _encoder.encode(row))
+        first = False
+        if len(buf) >= FLUSH_ROWS:
+            yield "".join(buf).encode("utf-8")
+            buf = []
+    if buf:
+        yield "".join(buf).encode("utf-8")
+
+    rest = tail()
+    yield (f"],{_encoder.encode(rest)[1:]}" if rest else "]}").encode("utf-8")
@@ -0,0 +1,231 @@
+# analytics/services/synthetic.py
+# 벤치마크용 가짜 서울 데이터 — 실제 CSV/API와 같은 칼럼·인코딩으로 파일을 만듦
+#
+#   data = SyntheticSeoul(trading_areas=1650, years=3, industries=5, seed=42)
+#   paths = data.write(out_dir)      # {"trading_areas": ..., "change_index": ..., ...}
+#
+# 같은 seed면 항상 같은 파일 (커밋 간 비교용)
+import csv
+import json
+import os
+import random
+from collections import Counter
+from typing import Dict, Iterator, List
+
+from analytics.services.geo import tm_to_wgs84
+from analytics.services.region import SIGNGU_NAME_TO_CODE
+from analytics.utils import CODE_TO_LEVEL
+
+TRDAR_SE = [("A", "골목상권"), ("D", "발달상권"), ("R", "전통시장"), ("U", "관광특구")]
+
+INDUSTRIES = [
+    ("CS100001", "한식음식점"), ("CS100002", "중식음식점"), ("CS100003", "일식음식점"),
+    ("CS100005", "제과점"), ("CS100010", "커피-음료"), ("CS200001", "일반교습학원"),
+    ("CS200028", "미용실"), ("CS300001", "슈퍼마켓"), ("CS300002", "편의점"), ("CS300011", "일반의류"),
+]
+
+STORE_CATEGORIES = {
+    "음식": {"한식": ["백반/한정식", "국/탕/찌개류"], "비알코올": ["카페"], "주점": ["일반 유흥 주점"]},
+    "소매": {"종합 소매": ["슈퍼마켓", "편의점"], "섬유·의복·신발 소매": ["남녀 의류 소매업"]},
+    "수리·개인": {"이용·미용": ["미용실", "네일숍"], "세탁": ["세탁소"]},
+    "교육": {"일반 교육": ["입시·교과학원"]},
+}
+
+# 서울 TM(EPSG:2097) 대략 범위
+TM_X = (183000.0, 215000.0)
+TM_Y = (437000.0, 466000.0)
+
+CHANGE_INDEX_HEADER = [
+    "기준_년분기_코드", "상권_구분_코드", "상권_구분_코드_명", "상권_코드", "상권_코드_명",
+    "상권_변화_지표", "상권_변화_지표_명", "운영_영업_개월_평균", "폐업_영업_개월_평균",
+    "서울_운영_영업_개월_평균", "서울_폐업_영업_개월_평균",
+]
+INDUSTRY_HEADER = [
+    "STDR_YYQU_CD", "TRDAR_CD", "TRDAR_CD_NM", "SVC_INDUTY_CD", "SVC_INDUTY_CD_NM",
+    "THSMON_SELNG_AMT", "THSMON_SELNG_CO", "MDWK_SELNG_AMT", "WKEND_SELNG_AMT",
+]
+TRADING_AREA_HEADER = [
+    "TRDAR_CD", "TRDAR_CD_NM", "TRDAR_SE_CD", "TRDAR_SE_CD_NM", "XCNTS_VALUE", "YDNTS_VALUE",
+    "SIGNGU_CD", "SIGNGU_CD_NM", "ADSTRD_CD", "ADSTRD_CD_NM", "RELM_AR",
+]
+CLOSURE_CATEGORIES = ["전체", "외식업", "서비스업", "소매업"]
+STORE_POINT_HEADER = [
+    "상가업소번호", "상호명", "상권업종대분류명", "상권업종중분류명", "상권업종소분류명",
+    "시군구코드", "행정동코드", "경도", "위도",
+]
+
+
+class SyntheticSeoul:
+    """
+    trading_areas개 상권을 25개 자치구에 고르게 나눔 (자치구당 행정동 dongs개)
+    - 분기: end_year부터 거꾸로 years년 × 4분기 (yyq = "20244" 형식)
+    """
+
+    def __init__(
+        self,
+        trading_areas: int = 1650,
+        years: int = 3,
+        industries: int = 5,
+        dongs: int = 16,
+        end_year: int = 2024,
+        store_radii=(500, 1000, 2000),
+        stores_per_area: int = 40,
+        seed: int = 42,
+    ):
+        self.rng = random.Random(seed)
+        self.years = list(range(end_year - years + 1, end_year + 1))
+        self.quarters = [f"{y}{q}" for y in self.years for q in range(1, 5)]
+        self.industries = INDUSTRIES[:max(1, min(industries, len(INDUSTRIES)))]
+        self.store_radii = tuple(store_radii)
+        self.stores_per_area = stores_per_area
+        self.districts = list(SIGNGU_NAME_TO_CODE.items())
+        self.areas = self._make_areas(trading_areas, dongs)
+        lon, lat = tm_to_wgs84([a["XCNTS_VALUE"] for a in self.areas], [a["YDNTS_VALUE"] for a in self.areas])
+        self.area_lonlat = list(zip(lon.tolist(), lat.tolist()))
+
+    def _make_areas(self, n: int, dongs: int) -> List[dict]:
+        rng = self.rng
+        centers = {
+            cd: (rng.uniform(*TM_X), rng.uniform(*TM_Y)) for _, cd in self.districts
+        }
+        areas = []
+        for i in range(n):
+            name, signgu_cd = self.districts[i % len(self.districts)]
+            dong = (i // len(self.districts)) % dongs
+            se_cd, se_nm = TRDAR_SE[rng.randrange(len(TRDAR_SE))]
+            cx, cy = centers[signgu_cd]
+            areas.append({
+                "TRDAR_CD": str(3110000 + i + 1),
+                "TRDAR_CD_NM": f"{name} 상권{i + 1}",
+                "TRDAR_SE_CD": se_cd,
+                "TRDAR_SE_CD_NM": se_nm,
+                "XCNTS_VALUE": round(cx + rng.gauss(0, 1500), 1),
+                "YDNTS_VALUE": round(cy + rng.gauss(0, 1500), 1),
+                "SIGNGU_CD": signgu_cd,
+                "SIGNGU_CD_NM": name,
+                "ADSTRD_CD": f"{signgu_cd}{(dong + 1) * 5:03d}",
+                "ADSTRD_CD_NM": f"{name[:-1]}{dong + 1}동",
+                "RELM_AR": rng.randint(20000, 400000),
+            })
+        return areas
+
+    # ---- 행 생성기 ----
+    def change_index_rows(self) -> Iterator[list]:
+        rng = self.rng
+        codes = list(CODE_TO_LEVEL)
+        for q in self.quarters:
+            seoul_open, seoul_close = rng.randint(90, 110), rng.randint(45, 55)
+            for a in self.areas:
+                code = codes[rng.randrange(len(codes))]
+                yield [
+                    q, a["TRDAR_SE_CD"], a["TRDAR_SE_CD_NM"], a["TRDAR_CD"], a["TRDAR_CD_NM"],
+                    code, CODE_TO_LEVEL[code], rng.randint(30, 150), rng.randint(20, 80),
+                    seoul_open, seoul_close,
+                ]
+
+    def industry_rows(self) -> Iterator[list]:
+        rng = self.rng
+        for q in self.quarters:
+            for a in self.areas:
+                for svc_cd, svc_nm in self.industries:
+                    amt = rng.randint(1_000_000, 900_000_000)
+                    mdwk = int(amt * rng.uniform(0.6, 0.8))
+                    yield [
+                        q, a["TRDAR_CD"], a["TRDAR_CD_NM"], svc_cd, svc_nm,
+                        amt, rng.randint(10, 20000), mdwk, amt - mdwk,
+                    ]
+
+    def closure_rows(self) -> Iterator[list]:
+        """가로형(자치구 × 카테고리) — 첫 행은 서울시 합계 (실제 파일과 동일)"""
+        rng = self.rng
+        rows = []
+        for name, _ in self.districts:
+            parts = [rng.randint(300, 1500) for _ in CLOSURE_CATEGORIES[1:]]
+            rows.append([name, sum(parts), *parts])
+        total = [sum(r[k] for r in rows) for k in range(1, len(CLOSURE_CATEGORIES) + 1)]
+        yield ["서울시", *total]
+        yield from rows
+
+    def store_count_pages(self) -> Iterator[dict]:
+        """storeListInRadius 첫 페이지 모양의 JSON + 저장될 집계"""
+        rng = self.rng
+        flat = [
+            (l, m, s)
+            for l, mids in STORE_CATEGORIES.items()
+            for m, smalls in mids.items()
+            for s in smalls
+        ]
+        for a, (lon, lat) in zip(self.areas, self.area_lonlat):
+            for radius in self.store_radii:
+                total = int(rng.randint(20, 60) * (radius / 100) ** 1.5)
+                picks = [flat[rng.randrange(len(flat))] for _ in range(min(total, 1000))]
+                items = [
+                    {"bizesId": f"MA{a['TRDAR_CD']}{radius}{k:05d}", "indsLclsNm": l, "indsMclsNm": m, "indsSclsNm": s}
+                    for k, (l, m, s) in enumerate(picks)
+                ]
+                yield {
+                    "trdar_cd": a["TRDAR_CD"],
+                    "radius": radius,
+                    "cx": lon,
+                    "cy": lat,
+                    "total": total,
+                    "counts_lcls": dict(Counter(l for l, _, _ in picks)),
+                    "counts_mcls": dict(Counter(m for _, m, _ in picks)),
+                    "counts_scls": dict(Counter(s for _, _, s in picks)),
+                    "raw": {
+                        "header": {"resultCode": "00", "resultMsg": "NORMAL SERVICE"},
+                        "body": {"items": items[:20], "numOfRows": 1000, "pageNo": 1, "totalCount": total},
+                    },
+                }
+
+    def store_point_rows(self) -> Iterator[list]:
+        """상가(상권)정보 덤프 모양 — 상권 중심 주변에 점포를 흩뿌림 (좌표는 경도/위도)"""
+        rng = self.rng
+        flat = [
+            (l, m, s)
+            for l, mids in STORE_CATEGORIES.items()
+            for m, smalls in mids.items()
+            for s in smalls
+        ]
+        for a in self.areas:
+            n = self.stores_per_area
+            xs = [a["XCNTS_VALUE"] + rng.gauss(0, 400) for _ in range(n)]
+            ys = [a["YDNTS_VALUE"] + rng.gauss(0, 400) for _ in range(n)]
+            lons, lats = tm_to_wgs84(xs, ys)
+            for k, (lon, lat) in enumerate(zip(lons.tolist(), lats.tolist())):
+                l, m, s = flat[rng.randrange(len(flat))]
+                yield [
+                    f"MA{a['TRDAR_CD']}{k:04d}", f"{s} {k}", l, m, s,
+                    a["SIGNGU_CD"], a["ADSTRD_CD"], round(lon, 7), round(lat, 7),
+                ]
+
+    # ---- 파일 쓰기 ----
+    def write(self, out_dir: str) -> Dict[str, str]:
+        """실제 원본과 같은 인코딩: 변화지표 cp949, 폐업 utf-8-sig, 나머지 utf-8"""
+        os.makedirs(out_dir, exist_ok=True)
+        paths = {
+            "trading_areas": os.path.join(out_dir, "trading_areas.csv"),
+            "change_index": os.path.join(out_dir, "change_index.csv"),
+            "industry_metrics": os.path.join(out_dir, "industry_metrics.csv"),
+            "closures": os.path.join(out_dir, "closures.csv"),
+            "store_counts": os.path.join(out_dir, "store_counts.jsonl"),
+            "store_points": os.path.join(out_dir, "store_points.csv"),
+        }
+        _write_csv(paths["trading_areas"], TRADING_AREA_HEADER,
+                   ([a[h] for h in TRADING_AREA_HEADER] for a in self.areas), "utf-8")
+        _write_csv(paths["change_index"], CHANGE_INDEX_HEADER, self.change_index_rows(), "cp949", quote_all=True)
+        _write_csv(paths["industry_metrics"], INDUSTRY_HEADER, self.industry_rows(), "utf-8")
+        _write_csv(paths["closures"], ["자치구별(1)", *CLOSURE_CATEGORIES], self.closure_rows(), "utf-8-sig")
+        _write_csv(paths["store_points"], STORE_POINT_HEADER, self.store_point_rows(), "cp949")
+        with open(paths["store_counts"], "w", encoding="utf-8") as f:
+            for page in self.store_count_pages():
+                f.write(json.dumps(page, ensure_ascii=False))
+                f.write("\n")
+        return paths
+
+
+def _write_csv(path: str, header: List[str], rows, encoding: str, quote_all: bool = False):
+    with open(path, "w", encoding=encoding, newline="") as f:
+        w = csv.writer(f, quoting=csv.QUOTE_ALL if quote_all else csv.QUOTE_MINIMAL)
+        w.writerow(header)
+        w.writerows(rows)
@@ -0,0 +1,107 @@
+# analytics/services/timeseries.py
+# 분기 시계열 — 지역/상권의 매출 합계와 상권변화지표 평균을 분기 범위 전체에 대해 한 번에
+#
+#   quarters = quarter_range(parse_yyq("2019Q1"), parse_yyq("2024Q4"))
+#   sales = sales_series(quarters, signgu_cd="11680")          # {필드: np.ndarray(len(quarters))}
+#   qoq, yoy = deltas(sales["thsmon_selng_amt"], relative=True)
+#
+# 값이 없는 분기는 NaN (응답에서는 None)
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+from django.db.models import Count, Q, Sum
+
+from analytics.models import ChangeIndex, IndustryMetric
+from analytics.services.quarters import yyq_codes
+from analytics.services.region_index import region_trdar_q
+from analytics.services.rollups import AMOUNT_FIELDS, industry_rollup_series
+
+QOQ_LAG = 1
+YOY_LAG = 4
+
+
+def _positions(quarters: List[int]) -> Dict[str, int]:
+    """DB yyq 문자열('20244' / '2024Q4') → 배열 위치"""
+    return {code: i for i, q in enumerate(quarters) for code in yyq_codes(q)}
+
+
+def _region_q(signgu_cd, adstrd_cd, trdar_cd) -> Q:
+    return Q(trdar_cd=trdar_cd) if trdar_cd else region_trdar_q(signgu_cd, adstrd_cd)
+
+
+def _fill(rows: Iterable[Tuple[str, dict]], pos: Dict[str, int], fields, n: int) -> Dict[str, np.ndarray]:
+    out = {f: np.full(n, np.nan) for f in fields}
+    for yyq, values in rows:
+        i = pos.get(yyq)
+        if i is None:
+            continue
+        for f in fields:
+            v = values.get(f)
+            if v is None:
+                continue
+            out[f][i] = float(v) if np.isnan(out[f][i]) else out[f][i] + float(v)  # 두 형식이 섞여 있으면 합산
+    return out
+
+
+def sales_series(quarters: List[int], signgu_cd: Optional[str] = None, adstrd_cd: Optional[str] = None,
+                 trdar_cd: Optional[str] = None, svc_induty_cd: Optional[str] = None) -> Dict[str, np.ndarray]:
+    """
+    분기별 매출 합계 {row_count, thsmon_selng_amt, ...}
+    - 지역은 IndustryRollup에서 GROUP BY yyq 한 번
+    - 롤업에 없는 분기(또는 상권 지정)만 원본에서 GROUP BY yyq 한 번 더
+    """
+    pos = _positions(quarters)
+    fields = ("row_count",) + AMOUNT_FIELDS
+    by_yyq = {} if trdar_cd else industry_rollup_series(signgu_cd, adstrd_cd, list(pos), svc_induty_cd)
+    covered = {pos[yyq] for yyq in by_yyq}
+    missing = [yyq for yyq, i in pos.items() if i not in covered]  # 분기의 두 형식 모두
+    if missing:
+        qs = IndustryMetric.objects.filter(_region_q(signgu_cd, adstrd_cd, trdar_cd), yyq__in=missing)
+        if svc_induty_cd:
+            qs = qs.filter(svc_induty_cd=svc_induty_cd)
+        rows = qs.order_by().values("yyq").annotate(n=Count("id"), **{f"{f}_sum": Sum(f) for f in AMOUNT_FIELDS})
+        by_yyq.update(
+            (r["yyq"], {"row_count": r["n"], **{f: r[f"{f}_sum"] for f in AMOUNT_FIELDS}}) for r in rows
+        )
+    return _fill(by_yyq.items(), pos, fields, len(quarters))
+
+
+def change_index_series(quarters: List[int], signgu_cd: Optional[str] = None, adstrd_cd: Optional[str] = None,
+                        trdar_cd: Optional[str] = None) -> Dict[str, np.ndarray]:
+    """분기별 변화지표 {avg: 평균 점수, count: 행 수} — GROUP BY yyq 한 번"""
+    pos = _positions(quarters)
+    rows = (
+        ChangeIndex.objects.filter(_region_q(signgu_cd, adstrd_cd, trdar_cd), yyq__in=list(pos))
+        .order_by().values("yyq").annotate(count=Count("id"), scored=Count("change_score"), total=Sum("change_score"))
+    )
+    # 형식이 섞여 같은 분기가 두 번 나와도 평균이 맞도록 합계/개수로 모은 뒤 나눔
+    out = _fill(((r["yyq"], r) for r in rows), pos, ("count", "scored", "total"), len(quarters))
+    with np.errstate(invalid="ignore", divide="ignore"):
+        avg = out["total"] / out["scored"]
+    avg[~np.isfinite(avg)] = np.nan
+    return {"avg": avg, "count": out["count"]}
+
+
+def deltas(values: np.ndarray, relative: bool = True) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    (전 분기 대비, 전년 동분기 대비) — relative면 증감률(v/prev - 1), 아니면 차이(v - prev)
+    - 비교할 값이 없거나 0이면 NaN
+    """
+    result = []
+    for lag in (QOQ_LAG, YOY_LAG):
+        out = np.full(len(values), np.nan)
+        if len(values) > lag:
+            cur, prev = values[lag:], values[:-lag]
+            with np.errstate(invalid="ignore", divide="ignore"):
+                out[lag:] = cur / prev - 1 if relative else cur - prev
+        out[~np.isfinite(out)] = np.nan
+        result.append(out)
+    return result[0], result[1]
+
+
+def to_list(values: np.ndarray, digits: Optional[int] = None, as_int: bool = False) -> List[Optional[float]]:
+    """NaN → None (JSON 응답용), as_int면 개수 칼럼처럼 정수로"""
+    if digits is not None:
+        values = np.round(values, digits)
+    cast = int if as_int else float
+    return [None if np.isnan(v) else cast(v) for v in values.tolist()]
@@ -0,0 +1,142 @@
+# analytics/services/trading_areas.py
+# TradingArea 마스터 보조 — 좌표(lon/lat) 일괄 계산, API 동기화(diff)
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+from django.db import transaction
+
+from analytics.models import TradingArea
+from analytics.services.csv_loader import DEFAULT_BATCH_SIZE
+from analytics.services.geo import tm_to_wgs84
+
+LONLAT_DECIMALS = 7  # 약 1cm — 같은 x/y면 같은 값이 나와서 재실행 시 변경 없음
+
+
+def fill_lonlat(batch_size: int = DEFAULT_BATCH_SIZE) -> int:
+    """
+    x/y(TM)가 있는 상권 전체를 한 번의 Transformer 호출로 WGS84 변환 → 값이 바뀐 행만 bulk_update
+    - x/y가 없으면 lon/lat도 비움
+    - 반환: 갱신한 행 수
+    """
+    rows = list(TradingArea.objects.order_by().values_list("trdar_cd", "x", "y", "lon", "lat"))
+    if not rows:
+        return 0
+
+    x = np.array([np.nan if r[1] is None else r[1] for r in rows], dtype=np.float64)
+    y = np.array([np.nan if r[2] is None else r[2] for r in rows], dtype=np.float64)
+    has_xy = ~(np.isnan(x) | np.isnan(y))
+    lon = np.full(len(rows), np.nan)
+    lat = np.full(len(rows), np.nan)
+    if has_xy.any():
+        lon[has_xy], lat[has_xy] = tm_to_wgs84(x[has_xy], y[has_xy])
+    lon, lat = np.round(lon, LONLAT_DECIMALS), np.round(lat, LONLAT_DECIMALS)
+
+    dirty = []
+    for (trdar_cd, _, _, old_lon, old_lat), ok, new_lon, new_lat in zip(rows, has_xy, lon.tolist(), lat.tolist()):
+        new = (new_lon, new_lat) if ok else (None, None)
+        if new != (old_lon, old_lat):
+            dirty.append(TradingArea(trdar_cd=trdar_cd, lon=new[0], lat=new[1]))
+    if dirty:
+        TradingArea.objects.bulk_update(dirty, ["lon", "lat"], batch_size=batch_size)
+    return len(dirty)
+
+
+# ---- API 동기화 ----
+SYNC_FIELDS = (
+    "trdar_se_cd", "trdar_se_cd_nm", "trdar_cd_nm", "x", "y",
+    "signgu_cd", "signgu_cd_nm", "adstrd_cd", "adstrd_cd_nm", "area_m2",
+)
+
+
+@dataclass
+class SyncStats:
+    inserted: int = 0
+    updated: int = 0
+    unchanged: int = 0
+    deleted: int = 0
+
+    @property
+    def changed(self) -> int:
+        return self.inserted + self.updated + self.deleted
+
+
+class IncompleteSyncError(RuntimeError):
+    """
+    스트림이 중간에 실패했거나 전체 건수와 맞지 않음 → 삭제 안 함
+    - 그 전까지의 insert/update는 이미 커밋, stats에 (스트림 오류는 __cause__)
+    """
+
+    def __init__(self, message: str, stats: SyncStats):
+        super().__init__(message)
+        self.stats = stats
+
+
+def sync_rows(rows: Iterable[Tuple[str, dict]], batch_size: int = DEFAULT_BATCH_SIZE,
+              delete_missing: bool = False,
+              expected_total: Optional[Callable[[], Optional[int]]] = None) -> SyncStats:
+    """
+    (trdar_cd, {필드: 값}) 스트림을 기존 테이블과 메모리에서 비교 → 바뀐 행만 bulk_create/bulk_update
+    - 기존 행은 한 번에 {trdar_cd: 필드 튜플}로 읽어 둠 (행마다 SELECT 없음)
+    - 값 dict에 없는 필드는 기존 값 유지 (API가 빈 값을 준 경우)
+    - batch_size개씩 따로 커밋 — 전체를 하나의 트랜잭션으로 잡지 않음
+    - delete_missing: 응답에 없던 상권을 삭제 — 스트림의 서로 다른 trdar_cd 수가 expected_total()
+      (스트림을 다 읽은 뒤 호출, API list_total_count)과 정확히 같을 때만, 아니면 지우지 않고 IncompleteSyncError
+    - 스트림이 예외를 내면 받은 행까지 커밋하고 IncompleteSyncError로 감싸서 (부분 stats 포함)
+    """
+    existing: Dict[str, tuple] = {
+        r[0]: r[1:] for r in TradingArea.objects.order_by().values_list("trdar_cd", *SYNC_FIELDS)
+    }
+    stats = SyncStats()
+    seen = set()
+    creates: List[TradingArea] = []
+    updates: List[TradingArea] = []
+
+    def flush():
+        if not (creates or updates):
+            return
+        with transaction.atomic():
+            if creates:
+                TradingArea.objects.bulk_create(creates, batch_size=batch_size)
+            if updates:
+                TradingArea.objects.bulk_update(updates, SYNC_FIELDS, batch_size=batch_size)
+        creates.clear()
+        updates.clear()
+
+    stream = iter(rows)
+    while True:
+        try:
+            trdar_cd, values = next(stream)
+        except StopIteration:
+            break
+        except Exception as e:
+            flush()
+            raise IncompleteSyncError(f"row stream failed: {e}", stats) from e
+        if trdar_cd in seen:
+            continue
+        seen.add(trdar_cd)
+        old = existing.get(trdar_cd)
+        if old is None:
+            creates.append(TradingArea(trdar_cd=trdar_cd, **values))
+            stats.inserted += 1
+        else:
+            new = tuple(values.get(f, v) for f, v in zip(SYNC_FIELDS, old))
+            if new == old:
+                stats.unchanged += 1
+                continue
+            updates.append(TradingArea(trdar_cd=trdar_cd, **dict(zip(SYNC_FIELDS, new))))
+            stats.updated += 1
+        if len(creates) + len(updates) >= batch_size:
+            flush()
+    flush()
+
+    if delete_missing:
+        total = expected_total() if expected_total else None
+        if total is None or len(seen) != total:
+            raise IncompleteSyncError(f"refusing to delete: {len(seen)} distinct trdar_cd, expected {total}", stats)
+        gone = [cd for cd in existing if cd not in seen]
+        for i in range(0, len(gone), batch_size):
+            with transaction.atomic():
+                TradingArea.objects.filter(trdar_cd__in=gone[i:i + batch_size]).delete()
+        stats.deleted = len(gone)
+    return stats
@@ -0,0 +1,75 @@
+# analytics/services/versioning.py
+# 데이터셋 버전 카운터 (DatasetVersion) — 적재가 끝나면 bump, 캐시는 get_version으로 비교
+#
+# 요청마다 조회하지 않으려면 cached_version(name) — 워커별로 VERSION_CHECK_SECONDS마다만 DB 확인
+# (같은 프로세스에서 bump_version하면 즉시 반영)
+import threading
+import time
+from typing import Dict, Iterable, Tuple
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F
+
+from analytics.models import DatasetVersion
+
+TRADING_AREA = "trading_area"
+INDUSTRY_METRIC = "industry_metric"  # IndustryRollup 포함
+CHANGE_INDEX = "change_index"
+CLOSURE_STAT = "closure_stat"
+STORE_COUNT = "store_count"
+STORE_POINT = "store_point"  # StorePoint + 반경 인덱스 파일
+
+_memo_lock = threading.Lock()
+_memo: Dict[str, Tuple[int, float]] = {}  # name -> (version, 확인한 시각)
+
+
+def _check_interval() -> float:
+    return float(getattr(settings, "ANALYTICS_VERSION_CHECK_SECONDS", 5))
+
+
+def bump_version(name: str) -> int:
+    """name의 버전을 1 올리고 새 버전을 반환 (동시 실행돼도 F()로 원자적 증가)"""
+    with transaction.atomic():
+        DatasetVersion.objects.get_or_create(name=name)
+        DatasetVersion.objects.filter(name=name).update(version=F("version") + 1)
+        version = DatasetVersion.objects.values_list("version", flat=True).get(name=name)
+    with _memo_lock:
+        _memo[name] = (version, time.monotonic())
+    return version
+
+
+def get_version(name: str) -> int:
+    return DatasetVersion.objects.filter(name=name).values_list("version", flat=True).first() or 0
+
+
+def get_versions(names: Iterable[str]) -> Dict[str, int]:
+    names = list(names)
+    found = dict(DatasetVersion.objects.filter(name__in=names).values_list("name", "version"))
+    return {n: found.get(n, 0) for n in names}
+
+
+def cached_version(name: str) -> int:
+    """get_version과 같지만 워커별로 몇 초간 기억 — 다른 프로세스의 bump는 최대 그만큼 늦게 보임"""
+    now = time.monotonic()
+    hit = _memo.get(name)
+    if hit is not None and now - hit[1] < _check_interval():
+        return hit[0]
+    version = get_version(name)
+    with _memo_lock:
+        _memo[name] = (version, now)
+    return version
+
+
+def cached_versions(names: Iterable[str]) -> Tuple[int, ...]:
+    """cached_version 여러 개 — 기억이 지난 이름만 모아 쿼리 한 번"""
+    names = tuple(names)
+    now = time.monotonic()
+    interval = _check_interval()
+    stale = [n for n in names if n not in _memo or now - _memo[n][1] >= interval]
+    if stale:
+        found = get_versions(stale)
+        with _memo_lock:
+            for n, v in found.items():
+                _memo[n] = (v, now)
+    return tuple(_memo[n][0] for n in names)
@@ -1,3 +1,703 @@
-from django.test import TestCase
+import io
+import math
+import os
+import shutil
+import tempfile
+from decimal import Decimal
+from importlib import import_module
+from unittest import mock
 
-# Create your tests here.
+import numpy as np
+import requests
+from django.apps import apps as global_apps
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import SimpleTestCase, TestCase, override_settings
+from rest_framework.test import APIClient
+
+from analytics.models import (
+    ChangeIndex, ImportManifest, IndustryMetric, IndustryRollup, StoreCategoryCount, StoreCount, StorePoint, TradingArea,
+)
+from analytics.services import closure_cube, region_index, snapshot, store_index, versioning
+from analytics.services.closure_cube import ClosureCube
+from analytics.services.csv_loader import BulkUpserter
+from analytics.services.csv_schema import Column, CsvSchema, CsvSchemaError, decimal, integer, number
+from analytics.services.geo import tm_to_wgs84
+from analytics.services.http_cache import HttpCache, error_result
+from analytics.services.import_manifest import ImportTracker
+from analytics.services.pagination import InvalidCursor, decode_cursor, encode_cursor, keyset_page
+from analytics.services.quarters import parse_yyq, quarter_range
+from analytics.services.response_cache import get_response_cache
+from analytics.services.rollups import rebuild_industry_rollup
+from analytics.services.seoul_openapi import OpenApiError
+from analytics.services.store_counts import ring_counts
+from analytics.services.timeseries import deltas, sales_series, to_list
+from analytics.services.trading_areas import IncompleteSyncError, sync_rows
+from analytics.services.versioning import INDUSTRY_METRIC, STORE_POINT, bump_version
+from analytics.utils import CODE_TO_LEVEL, resolve_change_score
+
+NAN = float("nan")
+
+
+def reset_analytics_caches():
+    """워커 메모리 캐시 비우기 — 테스트마다 DB가 롤백되면 버전 번호가 겹칠 수 있음"""
+    with versioning._memo_lock:
+        versioning._memo.clear()
+    region_index._cached.update(version=None, index=None)
+    closure_cube._cached.update(version=None, cube=None)
+    snapshot._cached.update(name=None, snapshot=None)
+    store_index._cached.update(key=None, index=None)
+    get_response_cache().clear()
+
+
+class DeltasTests(SimpleTestCase):
+    def assertSeries(self, actual, expected):
+        self.assertEqual(len(actual), len(expected))
+        for a, e in zip(actual, expected):
+            if math.isnan(e):
+                self.assertTrue(math.isnan(a), f"{a} != NaN")
+            else:
+                self.assertAlmostEqual(a, e)
+
+    def test_relative(self):
+        qoq, yoy = deltas(np.array([100, 110, NAN, 121, 200, 0, 50], dtype=float))
+        self.assertSeries(qoq, [NAN, 0.1, NAN, NAN, 200 / 121 - 1, -1.0, NAN])  # 직전이 NaN/0이면 NaN
+        self.assertSeries(yoy, [NAN, NAN, NAN, NAN, 1.0, -1.0, NAN])
+
+    def test_absolute(self):
+        qoq, yoy = deltas(np.array([1, 3, 6, 10, 15], dtype=float), relative=False)
+        self.assertSeries(qoq, [NAN, 2, 3, 4, 5])
+        self.assertSeries(yoy, [NAN, NAN, NAN, NAN, 14])
+
+    def test_shorter_than_lag(self):
+        qoq, yoy = deltas(np.array([5.0, 10.0]))
+        self.assertSeries(qoq, [NAN, 1.0])
+        self.assertSeries(yoy, [NAN, NAN])
+
+    def test_to_list(self):
+        self.assertEqual(to_list(np.array([1.23456, NAN]), digits=2), [1.23, None])
+        self.assertEqual(to_list(np.array([3.0, NAN]), as_int=True), [3, None])
+        self.assertIsInstance(to_list(np.array([3.0]), as_int=True)[0], int)
+
+
+@override_settings(ANALYTICS_SNAPSHOT_DIR="", ANALYTICS_VERSION_CHECK_SECONDS=0, ANALYTICS_RESPONSE_CACHE_ENTRIES=0)
+class TimeSeriesTests(TestCase):
+    url = "/api/analytics/timeseries/"
+
+    def setUp(self):
+        reset_analytics_caches()
+        TradingArea.objects.create(trdar_cd="T1", signgu_cd="11110")
+        TradingArea.objects.create(trdar_cd="T2", signgu_cd="11110")
+        for yyq, amount in (("20243", 100), ("20244", 200)):
+            for trdar in ("T1", "T2"):
+                IndustryMetric.objects.create(trdar_cd=trdar, yyq=yyq, svc_induty_cd="CS1", thsmon_selng_amt=amount)
+        ChangeIndex.objects.create(trdar_cd="T1", yyq="20243", change_code="HH", change_score=0)
+        ChangeIndex.objects.create(trdar_cd="T2", yyq="20244", change_code="LL", change_score=3)
+        self.quarters = quarter_range(parse_yyq("2024Q2"), parse_yyq("2024Q4"))
+
+    def test_raw_rows_without_rollup(self):
+        sales = sales_series(self.quarters, signgu_cd="11110")
+        self.assertEqual(to_list(sales["row_count"], as_int=True), [None, 2, 2])
+        self.assertEqual(to_list(sales["thsmon_selng_amt"]), [None, 200.0, 400.0])
+
+    def test_rollup_with_raw_fallback_per_quarter(self):
+        rebuild_industry_rollup(["20243"])
+        # 롤업을 다시 만들지 않은 원본 변경은 롤업이 있는 분기엔 안 보임 → 롤업에서 읽었다는 뜻
+        IndustryMetric.objects.filter(yyq="20243").update(thsmon_selng_amt=1)
+        with self.assertNumQueries(2):  # 롤업 한 번 + 롤업에 없는 분기만 원본 한 번
+            sales = sales_series(self.quarters, signgu_cd="11110")
+        self.assertEqual(to_list(sales["thsmon_selng_amt"]), [None, 200.0, 400.0])
+        self.assertEqual(to_list(sales["row_count"], as_int=True), [None, 2, 2])
+
+        rebuild_industry_rollup()
+        with self.assertNumQueries(2):  # 빈 분기(2024Q2)는 원본에도 없음
+            sales = sales_series(self.quarters, signgu_cd="11110")
+        self.assertEqual(to_list(sales["thsmon_selng_amt"]), [None, 2.0, 400.0])
+
+    def test_view(self):
+        rebuild_industry_rollup(["20244"])
+        body = APIClient().get(self.url, {"signgu_cd": "11110", "yyq_from": "2024Q2", "yyq_to": "20244"}).json()
+        self.assertEqual(body["quarters"], ["2024Q2", "2024Q3", "2024Q4"])
+        self.assertEqual(body["sales"]["thsmon_selng_amt"], [None, 200.0, 400.0])
+        self.assertEqual(body["sales"]["qoq"]["thsmon_selng_amt"], [None, None, 1.0])
+        self.assertEqual(body["change_index"]["avg"], [None, 0.0, 3.0])
+        self.assertEqual(body["change_index"]["qoq"], [None, None, 3.0])
+
+    def test_view_bad_params(self):
+        client = APIClient()
+        for params in ({"yyq_from": "2024Q4"}, {"yyq_from": "2024Q4", "yyq_to": "2024Q1"},
+                       {"yyq_from": "2010Q1", "yyq_to": "2024Q4"}):
+            with self.subTest(params=params):
+                self.assertEqual(client.get(self.url, {"signgu_cd": "11110", **params}).status_code, 400)
+        self.assertEqual(client.get(self.url, {"signgu_cd": "99999", "yyq_from": "2024Q1", "yyq_to": "2024Q4"}).status_code, 404)
+
+    def test_migration_fills_rollup(self):
+        import_module("analytics.migrations.0015_industry_rollup").fill_rollup(global_apps, None)
+        fields = ("region_level", "region_cd", "yyq", "svc_induty_cd", "row_count", "thsmon_selng_amt")
+        migrated = sorted(IndustryRollup.objects.values_list(*fields))
+        rebuild_industry_rollup()
+        self.assertEqual(migrated, sorted(IndustryRollup.objects.values_list(*fields)))
+        self.assertEqual(len(migrated), 4)  # (서울, 자치구) × 2분기
+
+
+class ImportTrackerTests(TestCase):
+    HEADER = "기준_년분기_코드,상권_코드,상권_변화_지표\n"
+
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmp)
+
+    def write(self, name, codes):
+        path = os.path.join(self.tmp, name)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(self.HEADER + "".join(f"20244,T{i},{code}\n" for i, code in enumerate(codes)))
+        return path
+
+    def load(self, path, **opts):
+        out = io.StringIO()
+        call_command("import_change_index_csv", path, batch_size=2, stdout=out, **opts)
+        return out.getvalue()
+
+    def test_same_file_skipped(self):
+        path = self.write("a.csv", ["HH", "HL", "LH"])
+        self.load(path)
+        self.assertIn("이미 적재 완료", self.load(path))
+        self.assertIn("created=0, updated=3, unchanged=0", self.load(path, force=True))  # 해시 무시하고 전부
+
+    def test_resume_after_last_committed_batch(self):
+        path = self.write("a.csv", ["HH", "HL", "LH", "LL"])
+        tracker = ImportTracker("change_index", path).begin()
+        tracker.manifest.last_committed_row = 2
+        tracker.fail()  # 두 번째 배치 전에 중단된 것처럼
+        tracker.manifest.save()
+
+        self.assertIn("2행 이후부터", self.load(path))
+        self.assertEqual(sorted(ChangeIndex.objects.values_list("trdar_cd", flat=True)), ["T2", "T3"])
+        manifest = ImportManifest.objects.get(source="change_index")
+        self.assertEqual((manifest.status, manifest.last_committed_row), (ImportManifest.STATUS_DONE, 4))
+
+    def test_unchanged_rows_not_rewritten(self):
+        self.load(self.write("a.csv", ["HH", "HL", "LH", "LL"]))
+        ChangeIndex.objects.filter(trdar_cd="T0").update(change_level="손댐")  # 다시 쓰면 되돌아감
+
+        out = self.load(self.write("b.csv", ["HH", "HL", "LL", "LL"]))  # T2만 바뀐 새 파일
+        self.assertIn("created=0, updated=1, unchanged=3", out)
+        self.assertEqual(ChangeIndex.objects.get(trdar_cd="T0").change_level, "손댐")
+        self.assertEqual(ChangeIndex.objects.get(trdar_cd="T2").change_code, "LL")
+
+
+class CursorTests(SimpleTestCase):
+    def test_round_trip(self):
+        values = ["3110008", None, "한식"]
+        self.assertEqual(decode_cursor(encode_cursor(values), 3), values)
+
+    def test_invalid(self):
+        for cursor, n in (("!!!", 1), (encode_cursor(["a"]), 2), ("eyJhIjoxfQ", 1)):  # 마지막은 {"a":1}
+            with self.assertRaises(InvalidCursor):
+                decode_cursor(cursor, n)
+
+
+class KeysetPageTests(TestCase):
+    def setUp(self):
+        for trdar in ("B", "A"):
+            for svc in ("CS2", None, "CS1"):
+                IndustryMetric.objects.create(trdar_cd=trdar, yyq="20244", svc_induty_cd=svc)
+
+    def test_pages_cover_all_rows_in_key_order_nulls_first(self):
+        qs = IndustryMetric.objects.filter(yyq="20244").values("trdar_cd", "svc_induty_cd")
+        keys = ("trdar_cd", "svc_induty_cd")
+        seen, cursor, pages = [], None, 0
+        while True:
+            rows, cursor = keyset_page(qs, keys, cursor, 2)
+            seen += [(r["trdar_cd"], r["svc_induty_cd"]) for r in rows]
+            pages += 1
+            if cursor is None:
+                break
+        self.assertEqual(seen, [("A", None), ("A", "CS1"), ("A", "CS2"), ("B", None), ("B", "CS1"), ("B", "CS2")])
+        self.assertEqual(pages, 3)
+
+
+@override_settings(ANALYTICS_SNAPSHOT_DIR="", ANALYTICS_VERSION_CHECK_SECONDS=0, ANALYTICS_RESPONSE_CACHE_ENTRIES=0)
+class IndustryMetricsViewTests(TestCase):
+    url = "/api/analytics/industry-metrics/"
+
+    def setUp(self):
+        reset_analytics_caches()
+        self.client = APIClient()
+        TradingArea.objects.create(trdar_cd="T1", signgu_cd="11110")
+        TradingArea.objects.create(trdar_cd="T2", signgu_cd="11110")
+        TradingArea.objects.create(trdar_cd="T3", signgu_cd="11140")
+        for i, trdar in enumerate(("T1", "T2", "T3")):
+            for svc in ("CS1", "CS2"):
+                IndustryMetric.objects.create(
+                    trdar_cd=trdar, yyq="20244", svc_induty_cd=svc, svc_induty_cd_nm=svc,
+                    thsmon_selng_amt=Decimal("100.25") * (i + 1), thsmon_selng_co=Decimal(i + 1),
+                )
+
+    def get(self, **params):
+        return self.client.get(self.url, {"yyq": "20244", **params})
+
+    def test_items_pages_with_selected_fields(self):
+        items, cursor, pages = [], None, 0
+        while True:
+            params = {"signgu_cd": "11110", "include": "items", "fields": "trdar_cd,thsmon_selng_amt", "limit": 3}
+            if cursor:
+                params["cursor"] = cursor
+            body = self.get(**params).json()
+            self.assertIsNone(body["aggregate"])
+            items += body["items"]
+            cursor = body["page"]["next_cursor"]
+            pages += 1
+            if cursor is None:
+                break
+        self.assertEqual(pages, 2)
+        self.assertEqual([set(i) for i in items], [{"trdar_cd", "thsmon_selng_amt"}] * 4)
+        self.assertEqual([i["trdar_cd"] for i in items], ["T1", "T1", "T2", "T2"])
+
+    def test_include_aggregate_only(self):
+        body = self.get(signgu_cd="11110", include="aggregate").json()
+        self.assertEqual(body["items"], [])
+        self.assertIsNone(body["page"])
+        self.assertAlmostEqual(body["aggregate"]["thsmon_selng_amt_sum"], 2 * (100.25 + 200.5))
+        self.assertAlmostEqual(body["aggregate"]["thsmon_selng_co_sum"], 6)
+        self.assertIsNone(body["aggregate"]["mdwk_selng_amt_sum"])
+
+    def test_bad_params(self):
+        for params in ({"fields": "nope"}, {"include": "foo"}, {"cursor": "!!!"}, {"limit": 0}):
+            with self.subTest(params=params):
+                self.assertEqual(self.get(signgu_cd="11110", **params).status_code, 400)
+
+    def test_unknown_region(self):
+        self.assertEqual(self.get(signgu_cd="99999").status_code, 404)
+
+
+@override_settings(ANALYTICS_SNAPSHOT_DIR="", ANALYTICS_VERSION_CHECK_SECONDS=0, ANALYTICS_RESPONSE_CACHE_ENTRIES=16)
+class ResponseCacheTests(TestCase):
+    url = "/api/analytics/industry-metrics/"
+    params = {"trdar_cd": "T1", "yyq": "20244"}
+
+    def setUp(self):
+        reset_analytics_caches()
+        self.client = APIClient()
+        TradingArea.objects.create(trdar_cd="T1", signgu_cd="11110")
+        IndustryMetric.objects.create(trdar_cd="T1", yyq="20244", svc_induty_cd="CS1", thsmon_selng_amt=10)
+
+    def test_etag_and_not_modified(self):
+        first = self.client.get(self.url, self.params)
+        self.assertEqual(first.status_code, 200)
+        etag = first["ETag"]
+        self.assertIn("no-cache", first["Cache-Control"])
+
+        again = self.client.get(self.url, self.params, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(again.status_code, 304)
+        self.assertEqual(again["ETag"], etag)
+
+        # 파라미터 순서가 달라도 같은 키
+        reordered = self.client.get(f"{self.url}?yyq=20244&trdar_cd=T1", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(reordered.status_code, 304)
+
+    def test_cached_body_and_invalidation(self):
+        first = self.client.get(self.url, self.params)
+        IndustryMetric.objects.update(thsmon_selng_amt=20)  # 버전을 안 올리면 캐시된 본문 그대로
+        self.assertEqual(self.client.get(self.url, self.params).content, first.content)
+
+        bump_version(INDUSTRY_METRIC)
+        fresh = self.client.get(self.url, self.params, HTTP_IF_NONE_MATCH=first["ETag"])
+        self.assertEqual(fresh.status_code, 200)
+        self.assertNotEqual(fresh["ETag"], first["ETag"])
+        self.assertEqual(fresh.json()["aggregate"]["thsmon_selng_amt_sum"], 20)
+
+
+class ClosureCubeTests(SimpleTestCase):
+    def setUp(self):
+        self.cube = ClosureCube([
+            (2023, "11110", "종로구", "전체", 10),
+            (2023, "11110", "종로구", "음식", 6),
+            (2023, "11110", "종로구", "소매", 3),
+            (2023, "11140", "중구", "음식", 4),
+            (2023, "11140", "중구", "소매", None),
+            (2023, "11140", "중구", "합계", 99),
+            (2024, "11110", "종로구", "전체", None),
+            (2024, "11110", "종로구", "음식", 2),
+        ])
+        self.jongno = self.cube.district("11110", None)
+        self.junggu = self.cube.district(None, "중구")
+
+    def test_totals(self):
+        y23, y24 = self.cube.year_pos(2023), self.cube.year_pos(2024)
+        self.assertEqual(self.cube.total(y23, [self.jongno]), 10)  # '전체' 행 우선
+        self.assertEqual(self.cube.total(y23, [self.junggu]), 4)  # '합계' 빼고 업종 합 (빈 값 제외)
+        self.assertEqual(self.cube.total(y24, [self.jongno]), 2)  # '전체'가 비어 있으면 업종 합
+        self.assertEqual(self.cube.total(y24, [self.junggu]), 0)
+        self.assertEqual(self.cube.total(y23, [self.jongno, self.junggu]), 14)
+        self.assertIsNone(self.cube.total(self.cube.year_pos(2020), [self.jongno]))
+
+    def test_items_and_ranking(self):
+        items = self.cube.items(self.cube.year_pos(2023), [self.junggu])
+        self.assertEqual(items, [
+            {"category": "음식", "closures": 4},
+            {"category": "소매", "closures": None},
+            {"category": "합계", "closures": 99},
+        ])
+        ranking = self.cube.ranking(self.cube.year_slice(2000, 2100))
+        self.assertEqual([(r["signgu_cd"], r["closures_sum"], r["share"]) for r in ranking],
+                         [("11110", 12, 0.75), ("11140", 4, 0.25)])
+
+
+class CsvSchemaTests(SimpleTestCase):
+    schema = CsvSchema(
+        Column("trdar_cd", "상권_코드", "TRDAR_CD", required=True),
+        Column("count", "CNT", type=integer),
+        Column("amount", "AMT", type=decimal),
+        Column("ratio", "RATIO", type=number),
+        Column("name", "NAME"),
+        keep_raw=True,
+    )
+
+    def test_bind_uses_first_alias_present(self):
+        bound = self.schema.bind([" TRDAR_CD ", "AMT", "CNT"])
+        self.assertEqual(bound.positions, (0, 2, 1, -1, -1))
+
+    def test_missing_required_column(self):
+        with self.assertRaises(CsvSchemaError):
+            self.schema.bind(["CNT", "AMT"])
+
+    def test_convert_types_and_nulls(self):
+        bound = self.schema.bind(["상권_코드", "CNT", "AMT", "RATIO", "NAME"])
+        rec = bound.convert(["3110008", "1,234", "12.50", "abc", " 가게 "])
+        self.assertEqual(rec[:5], ("3110008", 1234, Decimal("12.50"), None, "가게"))
+        self.assertEqual(rec[5]["NAME"], "가게")
+        self.assertEqual(self.schema.as_dict(rec)["raw_data"]["CNT"], "1,234")
+
+        self.assertEqual(bound.convert(["3110008", "NaN", "", "0.5"])[:5], ("3110008", None, None, 0.5, None))
+        self.assertIsNone(bound.convert(["NULL", "1", "1", "1", "x"]))  # 필수값 누락 → 행 전체 None
+
+
+class RingCountsTests(SimpleTestCase):
+    def test_cumulative_rings(self):
+        x, y = 200000.0, 450000.0
+        lon, lat = tm_to_wgs84(np.array([x + 100, x + 700, x + 1500]), np.array([y, y, y]))
+        items = [
+            {"lon": str(lon[2]), "lat": str(lat[2]), "indsLclsNm": "소매", "indsMclsNm": "편의점", "indsSclsNm": "편의점"},
+            {"lon": str(lon[0]), "lat": str(lat[0]), "indsLclsNm": "음식", "indsMclsNm": "한식", "indsSclsNm": "백반"},
+            {"lon": str(lon[1]), "lat": str(lat[1]), "indsLclsNm": "음식", "indsMclsNm": "카페", "indsSclsNm": "카페"},
+            {"lon": None, "lat": None, "indsLclsNm": "음식", "indsMclsNm": "한식", "indsSclsNm": "백반"},
+        ]
+        rings = ring_counts(items, x, y, [2000, 500, 1000])
+        self.assertEqual([(r[0], r[1]) for r in rings], [(500, 1), (1000, 2), (2000, 4)])
+        self.assertEqual(rings[1][2], {"음식": 2})
+        self.assertEqual(rings[2][2], {"음식": 3, "소매": 1})
+        self.assertEqual(rings[2][3]["한식"], 2)
+
+    def test_single_radius_counts_everything(self):
+        rings = ring_counts([{"indsLclsNm": "음식"}, {"indsLclsNm": "음식"}], 0.0, 0.0, [500])
+        self.assertEqual([(r[0], r[1], r[2]) for r in rings], [(500, 2, {"음식": 2})])
+
+
+@override_settings(ANALYTICS_SNAPSHOT_DIR="", ANALYTICS_VERSION_CHECK_SECONDS=0, ANALYTICS_RESPONSE_CACHE_ENTRIES=0)
+class StoreIndexTests(TestCase):
+    url = "/api/analytics/store-counts/"
+
+    def setUp(self):
+        reset_analytics_caches()
+        TradingArea.objects.create(trdar_cd="T1", signgu_cd="11110", x=200000, y=450000, lon=127.0, lat=37.5)
+
+    def add_point(self, bizes_id, dx, mcls):
+        StorePoint.objects.create(bizes_id=bizes_id, inds_mcls_nm=mcls, lon=0, lat=0, x=200000 + dx, y=450000)
+
+    def get(self, radius):
+        return APIClient().get(self.url, {"trdar_cd": "T1", "radius": radius})
+
+    def test_kdtree_fallback(self):
+        self.assertEqual(self.get(150).status_code, 404)  # 점포가 없으면 인덱스도 없음 (None은 캐시 안 함)
+
+        self.add_point("S1", 0, "카페")
+        self.add_point("S2", 100, "카페")
+        self.add_point("S3", 120, "편의점")
+        self.add_point("S4", 300, "카페")
+        bump_version(STORE_POINT)
+        data = self.get(150).json()["data"]
+        self.assertEqual(data["source"], "store_index")
+        self.assertEqual(data["total"], 3)
+        self.assertEqual(data["top"], {"카페": 2, "편의점": 1})
+        self.assertEqual(data["center"], {"cx": 127.0, "cy": 37.5})
+
+        self.add_point("S5", -50, "카페")  # 버전이 바뀌면 다시 빌드
+        bump_version(STORE_POINT)
+        self.assertEqual(self.get(150).json()["data"]["top"], {"카페": 3, "편의점": 1})
+
+    def test_saved_index_round_trip(self):
+        self.add_point("S1", 0, "카페")
+        self.add_point("S2", 100, None)
+        index = store_index.StoreIndex.from_db()
+        path = os.path.join(tempfile.mkdtemp(), store_index.INDEX_FILE)
+        self.addCleanup(shutil.rmtree, os.path.dirname(path))
+        index.save(path)
+
+        loaded = store_index.StoreIndex.load(path)
+        idx = loaded.query(200000, 450000, 150)
+        self.assertEqual(len(idx), 2)
+        self.assertEqual(loaded.counts(idx, "mcls"), {"카페": 1})  # 분류 없는 점포는 제외
+
+
+class ChangeIndexScoreTests(TestCase):
+    # 코드별 '상권_변화_지표_명' 라벨 (기존 백필이 change_level에 넣던 값)
+    NAMES = {"HH": "상권축소", "HL": "정체", "LH": "상권확장", "LL": "다이나믹"}
+
+    def import_csv(self):
+        tmp = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmp)
+        path = os.path.join(tmp, "change.csv")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write("기준_년분기_코드,상권_코드,상권_변화_지표,상권_변화_지표_명\n")
+            for i, (code, name) in enumerate(self.NAMES.items()):
+                f.write(f"20244,T{i},{code},{name}\n")
+        call_command("import_change_index_csv", path, stdout=io.StringIO())
+
+    def test_import_scores_by_code(self):
+        self.import_csv()
+        rows = {r.change_code: r for r in ChangeIndex.objects.all()}
+        self.assertEqual(set(rows), set(CODE_TO_LEVEL))
+        for code, row in rows.items():
+            self.assertEqual((row.change_level, row.change_score), resolve_change_score(code, None))
+        # 레벨 라벨이 따로 와도 점수는 코드 기준
+        self.assertEqual(resolve_change_score("HH", "다이나믹"), ("다이나믹", 0))
+
+    def test_migration_matches_importer(self):
+        self.import_csv()
+        imported = dict(ChangeIndex.objects.values_list("trdar_cd", "change_score"))
+
+        # 업그레이드 전 DB 흉내: 코드/점수 없음 + 레벨엔 '_명' 라벨
+        for row in ChangeIndex.objects.all():
+            row.change_level = self.NAMES[row.change_code]
+            row.change_code = row.change_score = None
+            row.save()
+        migration = import_module("analytics.migrations.0016_change_index_code_score")
+        migration.fill_code_score(global_apps, None)
+
+        migrated = {r.trdar_cd: r for r in ChangeIndex.objects.all()}
+        self.assertEqual({k: r.change_score for k, r in migrated.items()}, imported)
+        self.assertEqual({r.change_level for r in migrated.values()}, set(self.NAMES.values()))  # 라벨은 그대로
+
+
+@override_settings(ANALYTICS_SNAPSHOT_DIR="", ANALYTICS_VERSION_CHECK_SECONDS=0, ANALYTICS_RESPONSE_CACHE_ENTRIES=0)
+class RollupTests(TestCase):
+    def setUp(self):
+        reset_analytics_caches()
+        TradingArea.objects.create(trdar_cd="T1", signgu_cd="11110", adstrd_cd="1111051")
+        TradingArea.objects.create(trdar_cd="T2", signgu_cd="11110", adstrd_cd="1111052")
+        TradingArea.objects.create(trdar_cd="T3", signgu_cd="11140")
+        for trdar, amount in (("T1", "1.10"), ("T2", "2.20"), ("T3", "4.40"), ("NOPE", "8.80")):
+            IndustryMetric.objects.create(trdar_cd=trdar, yyq="20244", svc_induty_cd="CS1",
+                                          thsmon_selng_amt=Decimal(amount))
+        IndustryMetric.objects.create(trdar_cd="T1", yyq="20244", svc_induty_cd=None, thsmon_selng_co=Decimal(3))
+
+    def rollup(self, level, code, svc="CS1"):
+        return IndustryRollup.objects.get(region_level=level, region_cd=code, yyq="20244", svc_induty_cd=svc)
+
+    def test_rebuild(self):
+        self.assertEqual(rebuild_industry_rollup(), 8)  # CS1: 서울 + 자치구 2 + 행정동 2 / 업종 없음: T1의 서울·자치구·행정동
+        city = self.rollup(IndustryRollup.LEVEL_CITY, IndustryRollup.CITY_CD)
+        self.assertEqual((city.row_count, city.thsmon_selng_amt), (3, Decimal("7.70")))  # TradingArea에 없는 상권 제외
+        self.assertEqual(self.rollup(IndustryRollup.LEVEL_SIGNGU, "11110").thsmon_selng_amt, Decimal("3.30"))
+        self.assertEqual(self.rollup(IndustryRollup.LEVEL_ADSTRD, "1111051", svc="").thsmon_selng_co, Decimal(3))
+
+        IndustryMetric.objects.filter(yyq="20244").delete()  # 원본에서 사라진 분기는 롤업도 비움
+        self.assertEqual(rebuild_industry_rollup(), 0)
+        self.assertFalse(IndustryRollup.objects.exists())
+
+    def test_view_reads_rollup(self):
+        url = "/api/analytics/industry-metrics/"
+        params = {"signgu_cd": "11110", "yyq": "20244", "include": "aggregate"}
+        raw = APIClient().get(url, params).json()["aggregate"]  # 롤업이 없으면 원본 집계
+
+        rebuild_industry_rollup(["20244"])
+        IndustryMetric.objects.filter(trdar_cd="T1", svc_induty_cd="CS1").update(thsmon_selng_amt=100)
+        agg = APIClient().get(url, params).json()["aggregate"]
+        self.assertEqual(agg, raw)  # 다시 만들기 전 원본 변경은 안 보임 → 롤업에서 읽음
+        self.assertAlmostEqual(agg["thsmon_selng_amt_sum"], 3.3)
+        self.assertAlmostEqual(agg["thsmon_selng_co_sum"], 3)
+
+
+@override_settings(ANALYTICS_SNAPSHOT_DIR="", ANALYTICS_VERSION_CHECK_SECONDS=0, ANALYTICS_RESPONSE_CACHE_ENTRIES=0)
+class StoreRankingTests(TestCase):
+    url = "/api/analytics/store-rankings/"
+
+    def setUp(self):
+        reset_analytics_caches()
+        counts = {"T1": ("11110", 10, 40), "T2": ("11110", 30, 60), "T3": ("11140", 20, 20)}  # 카페 수, 전체
+        for trdar, (signgu, cafes, total) in counts.items():
+            TradingArea.objects.create(trdar_cd=trdar, signgu_cd=signgu, trdar_cd_nm=f"{trdar} 상권")
+            StoreCount.objects.create(trdar_cd=trdar, radius=500, total=total,
+                                      counts_mcls={"카페": cafes, "편의점": 1, "null": 5})
+        # fetch_store_counts 이전에 모은 StoreCount도 마이그레이션으로 펼쳐짐
+        import_module("analytics.migrations.0018_store_category_count").fill_category_counts(global_apps, None)
+
+    def get(self, **params):
+        return APIClient().get(self.url, {"category": "카페", "radius": 500, **params})
+
+    def test_ranking(self):
+        body = self.get().json()
+        self.assertEqual([(i["rank"], i["trdar_cd"], i["count"]) for i in body["items"]],
+                         [(1, "T2", 30), (2, "T3", 20), (3, "T1", 10)])
+        self.assertEqual(body["items"][0]["trdar_cd_nm"], "T2 상권")
+        self.assertEqual([i["share"] for i in body["items"]], [0.5, 1.0, 0.25])
+        self.assertEqual(body["aggregate"], {"trdars_count": 3, "stores_sum": 60, "stores_avg": 20.0})
+        self.assertFalse(StoreCategoryCount.objects.filter(category="null").exists())
+
+    def test_region_and_limit(self):
+        body = self.get(signgu_cd="11110", limit=1).json()
+        self.assertEqual([i["trdar_cd"] for i in body["items"]], ["T2"])
+        self.assertEqual(body["aggregate"]["trdars_count"], 2)  # 집계는 limit과 무관하게 지역 전체
+
+    def test_bad_params(self):
+        for params in ({"category": ""}, {"level": "xx"}, {"limit": 0}, {"radius": "abc"}):
+            with self.subTest(params=params):
+                self.assertEqual(self.get(**params).status_code, 400)
+        self.assertEqual(self.get(radius=1000).status_code, 404)
+        self.assertEqual(self.get(category="서점").status_code, 404)
+
+
+class BulkUpserterTests(TestCase):
+    def load(self, amount):
+        upserter = BulkUpserter(IndustryMetric, ("trdar_cd", "yyq", "svc_induty_cd"), ["thsmon_selng_amt"], batch_size=2)
+        with upserter:
+            upserter.add(trdar_cd="T1", yyq="20244", svc_induty_cd="CS1", thsmon_selng_amt=amount)
+            upserter.add(trdar_cd="T1", yyq="20244", svc_induty_cd=None, thsmon_selng_amt=amount)
+            upserter.add(trdar_cd="T2", yyq="20244", svc_induty_cd=None, thsmon_selng_amt=amount)
+        return upserter
+
+    def test_reload_updates_rows_with_null_keys(self):
+        first = self.load(1)
+        self.assertEqual((first.created, first.updated), (3, 0))
+        second = self.load(2)
+        self.assertEqual((second.created, second.updated), (0, 3))
+        self.assertEqual(IndustryMetric.objects.count(), 3)
+        self.assertEqual(set(IndustryMetric.objects.values_list("thsmon_selng_amt", flat=True)), {Decimal(2)})
+
+
+class SyncRowsTests(TestCase):
+    def setUp(self):
+        TradingArea.objects.create(trdar_cd="OLD")
+        self.rows = [("T1", {"trdar_cd_nm": "a"}), ("T2", {"trdar_cd_nm": "b"})]
+
+    def test_keeps_missing_by_default(self):
+        stats = sync_rows(iter(self.rows))
+        self.assertEqual((stats.inserted, stats.deleted), (2, 0))
+        self.assertTrue(TradingArea.objects.filter(trdar_cd="OLD").exists())
+
+    def test_refuses_to_delete_on_incomplete_stream(self):
+        with self.assertRaises(IncompleteSyncError) as ctx:
+            sync_rows(iter(self.rows), delete_missing=True, expected_total=lambda: 3)
+        self.assertEqual(ctx.exception.stats.inserted, 2)
+        self.assertTrue(TradingArea.objects.filter(trdar_cd="OLD").exists())
+
+    def test_deletes_when_complete(self):
+        stats = sync_rows(iter(self.rows), delete_missing=True, expected_total=lambda: 2)
+        self.assertEqual(stats.deleted, 1)
+        self.assertFalse(TradingArea.objects.filter(trdar_cd="OLD").exists())
+
+    def test_stream_error_keeps_partial_stats(self):
+        def broken():
+            yield from self.rows
+            yield ("T3", {"trdar_cd_nm": "c"})
+            raise OpenApiError("ERROR-500")
+
+        with self.assertRaises(IncompleteSyncError) as ctx:
+            sync_rows(broken(), batch_size=2, delete_missing=True, expected_total=lambda: 3)
+        self.assertIsInstance(ctx.exception.__cause__, OpenApiError)
+        self.assertEqual(ctx.exception.stats.inserted, 3)
+        self.assertEqual(TradingArea.objects.count(), 4)  # 받은 행은 모두 커밋, OLD는 남음
+
+    def test_command_finishes_committed_rows_on_api_error(self):
+        IndustryMetric.objects.create(trdar_cd="T1", yyq="20244", svc_induty_cd="CS1", thsmon_selng_amt=10)
+
+        def pages(**kwargs):
+            yield {"TRDAR_CD": "T1", "SIGNGU_CD": "11110", "XCNTS_VALUE": "200000", "YDNTS_VALUE": "450000"}
+            raise OpenApiError("TbgisTrdarRelm 1001-2000: ERROR-500")
+
+        target = "analytics.management.commands.sync_trading_areas.iter_TbgisTrdarRelm"
+        with mock.patch(target, pages), self.assertRaises(CommandError):
+            call_command("sync_trading_areas", stdout=io.StringIO())
+        self.assertIsNotNone(TradingArea.objects.get(trdar_cd="T1").lon)
+        self.assertTrue(IndustryRollup.objects.filter(region_cd="11110", yyq="20244").exists())
+        self.assertTrue(TradingArea.objects.filter(trdar_cd="OLD").exists())
+
+
+@override_settings(ANALYTICS_VERSION_CHECK_SECONDS=0)
+class SnapshotTests(TestCase):
+    def setUp(self):
+        reset_analytics_caches()
+        self.root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.root, ignore_errors=True)
+        TradingArea.objects.create(trdar_cd="T1", signgu_cd="11110")
+        IndustryMetric.objects.create(trdar_cd="T1", yyq="20244", svc_induty_cd="CS1",
+                                      thsmon_selng_amt=Decimal("0.10"), thsmon_selng_co=Decimal("0.20"))
+        IndustryMetric.objects.create(trdar_cd="T1", yyq="20244", svc_induty_cd="CS2", thsmon_selng_amt=Decimal("0.20"))
+
+    def test_aggregate_types_and_staleness(self):
+        with override_settings(ANALYTICS_SNAPSHOT_DIR=self.root):
+            call_command("export_analytics_snapshot", stdout=io.StringIO())
+            snap = snapshot.get_snapshot()
+            self.assertIsNotNone(snap)
+            n, agg = snap.industry_aggregate("20244", snap.trdar_mask_of(["T1"]))
+            self.assertEqual(n, 2)
+            self.assertEqual(agg["thsmon_selng_amt_sum"], Decimal("0.30"))  # float 합이면 0.30000000000000004
+            self.assertEqual(agg["thsmon_selng_co_sum"], Decimal("0.20"))
+            self.assertIsNone(agg["mdwk_selng_amt_sum"])
+
+            bump_version(INDUSTRY_METRIC)  # 내보낸 뒤 적재 → 스냅샷은 안 씀
+            self.assertIsNone(snapshot.get_snapshot())
+
+    def test_exports_never_overwrite_open_snapshot(self):
+        with override_settings(ANALYTICS_SNAPSHOT_DIR=self.root):
+            call_command("export_analytics_snapshot", "--keep", "2", stdout=io.StringIO())
+            first = snapshot.get_snapshot()
+            trdar = np.array(first.im_trdar)
+            call_command("export_analytics_snapshot", "--keep", "2", stdout=io.StringIO())  # 같은 초 안
+            self.assertNotEqual(snapshot.get_snapshot().path, first.path)
+            self.assertEqual(first.im_trdar.tolist(), trdar.tolist())  # mmap한 파일이 그대로
+            self.assertEqual(sorted(os.listdir(self.root)), sorted([
+                snapshot.CURRENT_FILE, os.path.basename(first.path), os.path.basename(snapshot.get_snapshot().path),
+            ]))  # 임시 폴더/파일이 안 남음
+
+            name = os.path.basename(first.path)
+            with self.assertRaises(FileExistsError):
+                snapshot.write_snapshot(self.root, name, {}, {"im_trdar": np.zeros(0)})
+            self.assertEqual(first.im_trdar.tolist(), trdar.tolist())
+            self.assertEqual(len(os.listdir(self.root)), 3)
+
+
+class HttpCacheResultTests(SimpleTestCase):
+    def test_error_result(self):
+        self.assertEqual(error_result(b'{"RESULT": {"CODE": "INFO-200"}}'), "INFO-200")
+        self.assertEqual(error_result(b'{"Svc": {"RESULT": {"CODE": "ERROR-500"}, "row": []}}'), "ERROR-500")
+        self.assertEqual(error_result(b'{"header": {"resultCode": "30"}}'), "30")
+        self.assertIsNone(error_result(b'{"Svc": {"RESULT": {"CODE": "INFO-000"}, "row": []}}'))
+        self.assertIsNone(error_result(b'{"header": {"resultCode": "00"}, "body": {}}'))
+
+    def test_non_json_body_not_cacheable(self):
+        # data.go.kr 키 오류: HTTP 200 + XML
+        xml = b"<OpenAPI_ServiceResponse><cmmMsgHeader><returnReasonCode>30</returnReasonCode></cmmMsgHeader></OpenAPI_ServiceResponse>"
+        self.assertFalse(HttpCache.cacheable(200, xml))
+        self.assertFalse(HttpCache.cacheable(200, b"[]"))
+        self.assertTrue(HttpCache.cacheable(200, b'{"header": {"resultCode": "00"}}'))
+
+    def test_stored_url_has_no_key(self):
+        root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, root)
+        cache = HttpCache(root, secrets=("a/b+c=",))
+        url = "https://apis.data.go.kr/B553077/api/open/sdsc2/storeListInRadius"
+
+        def send(headers):
+            resp = requests.Response()
+            resp.status_code = 200
+            resp._content = b'{"header": {"resultCode": "00"}}'
+            resp.url = f"{url}?serviceKey=a%2Fb%2Bc%3D&radius=100"  # 인코딩된 키는 마스킹에 안 걸림
+            return resp
+
+        cache.get(url, {"serviceKey": "a/b+c=", "radius": 100}, send)
+        key = cache.key(url, {"radius": 100})
+        self.assertEqual(cache.lookup(key).url, url)
+        with open(cache._path(key), "rb") as f:
+            self.assertNotIn(b"a%2Fb", f.read())
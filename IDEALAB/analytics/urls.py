@@ -5,11 +5,15 @@ from .views import (
     ClosuresByRegionView,
     StoreCountsView,
     StoreCountsByRadiusView,
+    StoreRankingView,
+    TimeSeriesView,
 )
 
 urlpatterns = [
     path("analytics/industry-metrics/", IndustryMetricsByRegionView.as_view()),
     path("analytics/change-index/", ChangeIndexByRegionView.as_view()),
+    path("analytics/timeseries/", TimeSeriesView.as_view()),
     path("analytics/closures/", ClosuresByRegionView.as_view()),
     path("analytics/store-counts/", StoreCountsByRadiusView.as_view()),
+    path("analytics/store-rankings/", StoreRankingView.as_view()),
 ]
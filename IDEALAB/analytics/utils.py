@@ -1,6 +1,26 @@
-from typing import Optional, Tuple
+from typing import List, Optional, Tuple
 from django.db.models import QuerySet
 
+# 상권변화지표 점수 (코드가 있으면 CODE_TO_LEVEL을 거쳐 레벨 점수로)
+SCORE_MAP = {
+    "HH": 3, "HL": 2, "LH": 1, "LL": 0,
+    "다이나믹": 3, "성장": 2, "정체": 1, "쇠퇴": 0,
+}
+CODE_TO_LEVEL = {"HH": "쇠퇴", "HL": "정체", "LH": "성장", "LL": "다이나믹"}
+SCORE_TO_LEVEL = {3: "다이나믹", 2: "성장", 1: "정체", 0: "쇠퇴"}  # 레벨별 개수 표기용
+
+
+def resolve_change_score(code: Optional[str], level: Optional[str]) -> Tuple[Optional[str], Optional[int]]:
+    """
+    상권변화지표 코드(HH/HL/LH/LL) + 레벨 → (레벨, 점수)
+    - 점수는 코드가 있으면 코드 기준(CODE_TO_LEVEL) → 레벨 라벨 체계가 달라도 점수는 같음
+    - level이 없으면 코드로 한글 레벨 유추
+    """
+    if code in CODE_TO_LEVEL:
+        score = SCORE_MAP[CODE_TO_LEVEL[code]]
+        return level or CODE_TO_LEVEL[code], score
+    return level, SCORE_MAP.get(level)
+
 def parse_region_params(request) -> Tuple[Optional[str], Optional[str]]:
     """
     ?signgu_cd= & ?adstrd_cd=
@@ -22,6 +42,22 @@ def filter_trading_areas_by_region(TradingArea, signgu_cd: Optional[str], adstrd
     return qs
 
 
+def parse_bool_param(request, name: str, default: bool = False) -> bool:
+    """?items=0|1|true|false 같은 on/off 파라미터"""
+    raw = (request.GET.get(name) or "").strip().lower()
+    if not raw:
+        return default
+    return raw in ("1", "true", "yes", "y", "on")
+
+
+def parse_list_param(request, name: str) -> Optional[List[str]]:
+    """?fields=a,b&fields=c 같은 쉼표 목록 → ['a', 'b', 'c'] (파라미터가 없으면 None)"""
+    raw = request.GET.getlist(name)
+    if not raw:
+        return None
+    return [v.strip() for chunk in raw for v in chunk.split(",") if v.strip()]
+
+
 def parse_period_params(request):
     """
     업종 매출/변화지표:
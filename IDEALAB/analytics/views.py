@@ -2,17 +2,29 @@ from rest_framework.views import APIView
 from rest_framework.response import Response
 from collections import Counter
 from rest_framework import status
-from django.db.models import Sum, Avg, Q
-from .models import IndustryMetric, ChangeIndex, ClosureStat, TradingArea, StoreCount
+from django.db.models import Sum, Avg, Count, OuterRef, Q, Subquery
+from django.http import StreamingHttpResponse
+from .models import IndustryMetric, ChangeIndex, TradingArea, StoreCategoryCount, StoreCount
 from .serializers import IndustryMetricResponseSerializer, ChangeIndexResponseSerializer, ClosuresResponseSerializer
-
-
-from .utils import parse_region_params, filter_trading_areas_by_region, parse_period_params
-
-SCORE_MAP = {
-    "HH": 3, "HL": 2, "LH": 1, "LL": 0,
-    "다이나믹": 3, "성장": 2, "정체": 1, "쇠퇴": 0,
-}
+from .services.closure_cube import get_closure_cube
+from .services.pagination import InvalidCursor, keyset_page
+from .services.region_index import get_region_index, region_trdar_q
+from .services.response_cache import VersionedResponseMixin
+from .services.quarters import parse_yyq, quarter_range, yyq_label
+from .services.rollups import AMOUNT_FIELDS, industry_rollup_aggregate
+from .services.timeseries import change_index_series, deltas, sales_series, to_list
+from .services.snapshot import get_snapshot
+from .services.streaming import iter_keyset, stream_json
+from .services.store_index import get_store_index
+from .services.versioning import (
+    CHANGE_INDEX, CLOSURE_STAT, INDUSTRY_METRIC, STORE_COUNT, STORE_POINT, TRADING_AREA,
+)
+
+
+from .utils import (
+    parse_region_params, parse_period_params, parse_bool_param, parse_list_param,
+    SCORE_TO_LEVEL,
+)
 
 # 공통 에러 응답
 def _fail(message: str, http_status=status.HTTP_400_BAD_REQUEST):
@@ -24,7 +36,7 @@ def _fail(message: str, http_status=status.HTTP_400_BAD_REQUEST):
     }, status=http_status)
 
 
-class IndustryMetricsByRegionView(APIView):
+class IndustryMetricsByRegionView(VersionedResponseMixin, APIView):
     """
     GET /api/analytics/industry-metrics/?adstrd_cd=11680580&yyq=2024Q4
     또는 GET /api/analytics/industry-metrics/?trdar_cd=3110023&yyq=2024Q4
@@ -32,11 +44,49 @@ class IndustryMetricsByRegionView(APIView):
     - TradingArea를 자치구/행정동으로 필터 → 해당 trdar_cd들의 IndustryMetric 조회
     - 집계는 매출 금액/건수 합계 중심(요약)
     - 응답: items(행 단위) + aggregate(합계)
+    - ?include=aggregate|items|aggregate,items (기본 둘 다, 예전 ?items=0 은 include=aggregate와 같음)
+      aggregate만이면 스냅샷이 있으면 DB 조회 없이, 없으면 롤업 조회 한 번으로 응답
+    - items는 (trdar_cd, svc_induty_cd) 순 키셋 페이지: ?limit=1000(최대 5000)&cursor=<page.next_cursor>
+      다음 페이지는 include=items 로 받으면 합계를 다시 계산하지 않음
+    - ?fields=trdar_cd,svc_induty_cd,thsmon_selng_amt 처럼 items 칼럼 선택 (기본 전체)
+    - ?stream=1 이면 items 전체를 페이지 없이 스트리밍 (aggregate는 보낸 행으로 계산해 맨 끝에)
     """
+    cache_datasets = (TRADING_AREA, INDUSTRY_METRIC)
+    ITEM_FIELDS = (
+        "trdar_cd", "yyq",
+        "svc_induty_cd", "svc_induty_cd_nm",
+        "thsmon_selng_amt", "thsmon_selng_co",
+        "mdwk_selng_amt", "wkend_selng_amt",
+    )
+    ITEM_KEYS = ("trdar_cd", "svc_induty_cd")
+    INCLUDE_PARTS = ("aggregate", "items")
+    PAGE_SIZE = 1000
+    MAX_PAGE_SIZE = 5000
+
     def get(self, request):
         signgu_cd, adstrd_cd = parse_region_params(request)
         yyq, year = parse_period_params(request)  # year는 선택. 있으면 yyq를 만들어 사용.
         trdar_cd = request.query_params.get("trdar_cd")
+        cursor = request.query_params.get("cursor") or None
+
+        include = parse_list_param(request, "include")
+        if include is None:
+            include = list(self.INCLUDE_PARTS) if parse_bool_param(request, "items", default=True) else ["aggregate"]
+        unknown = set(include) - set(self.INCLUDE_PARTS)
+        if unknown or not include:
+            return _fail(f"include는 {'|'.join(self.INCLUDE_PARTS)} 중에서 골라 주세요: {','.join(sorted(unknown))}")
+        include_agg, include_items = "aggregate" in include, "items" in include
+
+        fields = parse_list_param(request, "fields") or list(self.ITEM_FIELDS)
+        unknown = [f for f in fields if f not in self.ITEM_FIELDS]
+        if unknown:
+            return _fail(f"fields에 없는 칼럼입니다: {','.join(unknown)} (가능: {','.join(self.ITEM_FIELDS)})")
+        try:
+            limit = int(request.query_params.get("limit") or self.PAGE_SIZE)
+        except ValueError:
+            return _fail("limit는 정수로 주세요.")
+        if not 1 <= limit <= self.MAX_PAGE_SIZE:
+            return _fail(f"limit는 1~{self.MAX_PAGE_SIZE} 사이로 주세요.")
 
         # yyq 우선, year만 왔으면 yyq로 치환(예: 2024 + Q4 필요하면 프런트에서 쿼리로 넘겨주세요)
         if not yyq and not year:
@@ -44,37 +94,28 @@ class IndustryMetricsByRegionView(APIView):
         if not yyq and year:
             return _fail("현재 모델은 yyq(예: 2024Q4) 기준입니다. year만 주신 경우 yyq로 변환해 주세요.", status.HTTP_400_BAD_REQUEST)
 
+        # 해당 분기가 들어 있는 스냅샷이 있으면 지역 매핑/집계는 스냅샷에서
+        snap = get_snapshot()
+        if snap is not None and not snap.has_yyq("industry_metric", yyq):
+            snap = None
+
         # 상권코드 직접 지정이 가장 정확
+        # 지역 → 상권 목록은 메모리 인덱스(쿼리 없음), DB 조회는 서브쿼리로 지역 조건을 붙임
         if trdar_cd:
             trdars = [trdar_cd]
+            region_q = Q(trdar_cd=trdar_cd)
         else:
-            ta_qs = filter_trading_areas_by_region(TradingArea, signgu_cd, adstrd_cd)
-            trdars = list(ta_qs.values_list("trdar_cd", flat=True))
+            if snap is not None:
+                trdars = snap.trdar_codes(snap.region_trdar_mask(signgu_cd, adstrd_cd))
+            else:
+                trdars = list(get_region_index().trdars(signgu_cd, adstrd_cd))
+            region_q = region_trdar_q(signgu_cd, adstrd_cd)
 
         if not trdars:
             return _fail("해당 지역에 매핑된 상권(TRDAR)이 없습니다.", status.HTTP_404_NOT_FOUND)
 
-        qs = IndustryMetric.objects.filter(trdar_cd__in=trdars, yyq=yyq)
-        if not qs.exists():
-            return _fail("해당 기간(yyq)에 데이터가 없습니다.", status.HTTP_404_NOT_FOUND)
-
-        # 원자료 rows (필요 컬럼만)
-        items = list(qs.values(
-            "trdar_cd", "yyq",
-            "svc_induty_cd", "svc_induty_cd_nm",
-            "thsmon_selng_amt", "thsmon_selng_co",
-            "mdwk_selng_amt", "wkend_selng_amt",
-        ))
-
-        # 합계 집계
-        agg = qs.aggregate(
-            thsmon_selng_amt_sum=Sum("thsmon_selng_amt"),
-            thsmon_selng_co_sum=Sum("thsmon_selng_co"),
-            mdwk_selng_amt_sum=Sum("mdwk_selng_amt"),
-            wkend_selng_amt_sum=Sum("wkend_selng_amt"),
-        )
-
-        resp = {
+        qs = IndustryMetric.objects.filter(region_q, yyq=yyq)
+        head = {
             "status": 200,
             "success": True,
             "message": "업종 지표 조회 성공",
@@ -85,64 +126,104 @@ class IndustryMetricsByRegionView(APIView):
                 "signgu_cd": signgu_cd,
                 "adstrd_cd": adstrd_cd,
             },
-            "aggregate": agg,
-            "items": items,
         }
+        if include_items and parse_bool_param(request, "stream"):
+            if not qs.exists():
+                return _fail("해당 기간(yyq)에 데이터가 없습니다.", status.HTTP_404_NOT_FOUND)
+            return self._stream(head, qs, fields, include_agg)
+
+        agg = None
+        if include_agg:
+            if snap is not None:
+                row_count, agg = snap.industry_aggregate(yyq, snap.trdar_mask_of(trdars))
+                if not row_count:
+                    return _fail("해당 기간(yyq)에 데이터가 없습니다.", status.HTTP_404_NOT_FOUND)
+            elif not trdar_cd:
+                # 지역 합계는 롤업(IndustryRollup)에서 한 번에 — 롤업이 없을 때만 원본 집계
+                agg = industry_rollup_aggregate(signgu_cd, adstrd_cd, yyq)
+            if agg is None:
+                if not qs.exists():
+                    return _fail("해당 기간(yyq)에 데이터가 없습니다.", status.HTTP_404_NOT_FOUND)
+
+                # 합계 집계
+                agg = qs.aggregate(
+                    thsmon_selng_amt_sum=Sum("thsmon_selng_amt"),
+                    thsmon_selng_co_sum=Sum("thsmon_selng_co"),
+                    mdwk_selng_amt_sum=Sum("mdwk_selng_amt"),
+                    wkend_selng_amt_sum=Sum("wkend_selng_amt"),
+                )
+
+        # 원자료 rows (고른 칼럼 + 페이지 키)
+        items, page = [], None
+        if include_items:
+            columns = list(dict.fromkeys([*fields, *self.ITEM_KEYS]))
+            try:
+                items, next_cursor = keyset_page(qs.values(*columns), self.ITEM_KEYS, cursor, limit)
+            except InvalidCursor:
+                return _fail("cursor 값이 올바르지 않습니다. 첫 페이지부터 다시 요청해 주세요.")
+            if not items and not cursor and not include_agg:
+                return _fail("해당 기간(yyq)에 데이터가 없습니다.", status.HTTP_404_NOT_FOUND)
+            if len(columns) != len(fields):
+                items = [{f: row[f] for f in fields} for row in items]
+            page = {"limit": limit, "count": len(items), "next_cursor": next_cursor}
+
+        resp = {**head, "aggregate": agg, "items": items, "page": page}
         return Response(resp, status=status.HTTP_200_OK)
 
+    def _stream(self, head, qs, fields, include_agg):
+        """키셋 배치로 행을 흘려보내면서 합계를 누적 → 마지막에 aggregate"""
+        sums = dict.fromkeys(AMOUNT_FIELDS)
+        columns = list(dict.fromkeys([*fields, *self.ITEM_KEYS, *AMOUNT_FIELDS]))
+        trim = len(columns) != len(fields)
+
+        def rows():
+            for row in iter_keyset(qs.values(*columns), self.ITEM_KEYS):
+                for f in AMOUNT_FIELDS:
+                    if row[f] is not None:
+                        sums[f] = row[f] if sums[f] is None else sums[f] + row[f]
+                yield {f: row[f] for f in fields} if trim else row
+
+        def tail():
+            agg = {f"{f}_sum": sums[f] for f in AMOUNT_FIELDS} if include_agg else None
+            return {"aggregate": agg, "page": None}
+
+        return StreamingHttpResponse(stream_json(head, "items", rows(), tail), content_type="application/json")
+
+
+class ChangeIndexByRegionView(VersionedResponseMixin, APIView):
+    """
+    GET /api/analytics/change-index/?signgu_cd=11680&yyq=20244
+    - ?items=0 이면 items 생략 (스냅샷이 있으면 DB 조회 없이 응답)
+    - ?stream=1 이면 items를 스트리밍 (aggregate는 보낸 행으로 계산해 맨 끝에)
+    """
+    cache_datasets = (TRADING_AREA, CHANGE_INDEX)
 
-class ChangeIndexByRegionView(APIView):
     def get(self, request):
         signgu_cd, adstrd_cd = parse_region_params(request)
         yyq, _ = parse_period_params(request)
         if not yyq:
             return _fail("쿼리 파라미터가 누락되었습니다: yyq(예: 2023Q4)는 필수입니다.", status.HTTP_400_BAD_REQUEST)
+        include_items = parse_bool_param(request, "items", default=True)
+
+        snap = get_snapshot()
+        if snap is not None and not snap.has_yyq("change_index", yyq):
+            snap = None
 
         trdar_cd = request.query_params.get("trdar_cd")
         if trdar_cd:
             trdars = [trdar_cd]
+            region_q = Q(trdar_cd=trdar_cd)
         else:
-            trdars = list(
-                filter_trading_areas_by_region(TradingArea, signgu_cd, adstrd_cd)
-                .values_list("trdar_cd", flat=True)
-            )
+            if snap is not None:
+                trdars = snap.trdar_codes(snap.region_trdar_mask(signgu_cd, adstrd_cd))
+            else:
+                trdars = list(get_region_index().trdars(signgu_cd, adstrd_cd))
+            region_q = region_trdar_q(signgu_cd, adstrd_cd)
         if not trdars:
             return _fail("해당 지역에 매핑된 상권(TRDAR)이 없습니다.", status.HTTP_404_NOT_FOUND)
 
-        qs = ChangeIndex.objects.filter(trdar_cd__in=trdars, yyq=yyq)
-        if not qs.exists():
-            return _fail("해당 기간(yyq)에 데이터가 없습니다.", status.HTTP_404_NOT_FOUND)
-
-        items = []
-        scores = []
-        for obj in qs.iterator():
-            raw = (obj.raw_data or {}).get("snake", {})
-            code = raw.get("상권_변화_지표")  # HH/HL/LH/LL
-            level = obj.change_level
-            # level이 없으면 코드로 한글 레벨 유추
-            if not level and code in ("HH","HL","LH","LL"):
-                level = {"HH":"쇠퇴","HL":"정체","LH":"성장","LL":"다이나믹"}.get(code)
-
-            score = None
-            if level in SCORE_MAP:
-                score = SCORE_MAP[level]
-            elif code in SCORE_MAP:
-                score = SCORE_MAP[code]
-
-            if score is not None:
-                scores.append(score)
-
-            items.append({
-                "trdar_cd": obj.trdar_cd,
-                "yyq": obj.yyq,
-                "change_code": code,
-                "change_level": level,
-                "score": score,
-            })
-
-        agg_avg = sum(scores)/len(scores) if scores else None
-
-        resp = {
+        qs = ChangeIndex.objects.filter(region_q, yyq=yyq)
+        head = {
             "status": 200,
             "success": True,
             "message": "상권변화지표 조회 성공",
@@ -151,64 +232,203 @@ class ChangeIndexByRegionView(APIView):
                 "trdars_count": len(trdars),
                 "signgu_cd": signgu_cd, "adstrd_cd": adstrd_cd
             },
-            "aggregate": {"change_index_avg": agg_avg},
+        }
+        if include_items and parse_bool_param(request, "stream"):
+            if not qs.exists():
+                return _fail("해당 기간(yyq)에 데이터가 없습니다.", status.HTTP_404_NOT_FOUND)
+            return self._stream(head, qs)
+
+        if snap is not None:
+            row_count, agg_avg, level_counts = snap.change_index_aggregate(yyq, snap.trdar_mask_of(trdars))
+        else:
+            # 점수/코드는 적재 시 컬럼으로 저장됨 → 평균과 레벨별 개수를 DB에서 한 번에
+            agg = qs.aggregate(
+                row_count=Count("id"),
+                avg=Avg("change_score"),
+                **{f"n{score}": Count("id", filter=Q(change_score=score)) for score in SCORE_TO_LEVEL},
+            )
+            row_count = agg["row_count"]
+            agg_avg = float(agg["avg"]) if agg["avg"] is not None else None  # MySQL은 Decimal
+            level_counts = {level: agg[f"n{score}"] for score, level in SCORE_TO_LEVEL.items() if agg[f"n{score}"]}
+        if not row_count:
+            return _fail("해당 기간(yyq)에 데이터가 없습니다.", status.HTTP_404_NOT_FOUND)
+
+        items = []
+        if include_items:
+            items = [self._item(obj) for obj in qs.values(*self.ITEM_COLUMNS)]
+
+        resp = {
+            **head,
+            "aggregate": {"change_index_avg": agg_avg, "change_level_counts": level_counts},
             "items": items,
         }
         return Response(resp, status=status.HTTP_200_OK)
 
+    ITEM_COLUMNS = ("trdar_cd", "yyq", "change_code", "change_level", "change_score")
+
+    @staticmethod
+    def _item(obj):
+        return {
+            "trdar_cd": obj["trdar_cd"],
+            "yyq": obj["yyq"],
+            "change_code": obj["change_code"],
+            "change_level": obj["change_level"],
+            "score": obj["change_score"],
+        }
+
+    def _stream(self, head, qs):
+        """상권 순 키셋 배치로 흘려보내면서 점수 합계/레벨별 개수 누적 → 마지막에 aggregate"""
+        acc = {"scored": 0, "total": 0, "levels": Counter()}
+
+        def rows():
+            for obj in iter_keyset(qs.values(*self.ITEM_COLUMNS), ("trdar_cd",)):
+                score = obj["change_score"]
+                if score is not None:
+                    acc["scored"] += 1
+                    acc["total"] += score
+                    acc["levels"][score] += 1
+                yield self._item(obj)
+
+        def tail():
+            avg = acc["total"] / acc["scored"] if acc["scored"] else None
+            levels = {level: acc["levels"][score] for score, level in SCORE_TO_LEVEL.items() if acc["levels"][score]}
+            return {"aggregate": {"change_index_avg": avg, "change_level_counts": levels}}
+
+        return StreamingHttpResponse(stream_json(head, "items", rows(), tail), content_type="application/json")
+
+
+class TimeSeriesView(VersionedResponseMixin, APIView):
+    """
+    GET /api/analytics/timeseries/?signgu_cd=11680&yyq_from=2019Q1&yyq_to=2024Q4
+    또는 ?trdar_cd=3110023&yyq_from=20191&yyq_to=20244&svc_induty_cd=CS100001
+
+    - 분기별 매출 합계(IndustryMetric/롤업) + 상권변화지표 평균(ChangeIndex)을 분기 범위 전체로 한 번에
+    - 분기는 '20244' / '2024Q4' 둘 다 가능, 응답은 '2024Q4' 형식
+    - qoq/yoy: 매출은 증감률(0.1 = +10%), 변화지표 평균은 점수 차이 / 값이 없는 분기는 null
+    """
+    cache_datasets = (TRADING_AREA, INDUSTRY_METRIC, CHANGE_INDEX)
+    MAX_QUARTERS = 40
+
+    def get(self, request):
+        signgu_cd, adstrd_cd = parse_region_params(request)
+        trdar_cd = request.query_params.get("trdar_cd")
+        svc_induty_cd = request.query_params.get("svc_induty_cd") or None
+        start = parse_yyq(request.query_params.get("yyq_from"))
+        end = parse_yyq(request.query_params.get("yyq_to"))
+        if start is None or end is None:
+            return _fail("쿼리 파라미터가 누락되었습니다: yyq_from, yyq_to(예: 2019Q1, 2024Q4)는 필수입니다.")
+        if start > end:
+            return _fail("yyq_from이 yyq_to보다 늦습니다.")
+        if end - start + 1 > self.MAX_QUARTERS:
+            return _fail(f"조회 기간은 최대 {self.MAX_QUARTERS}분기입니다.")
+        if not trdar_cd and not get_region_index().trdars(signgu_cd, adstrd_cd):
+            return _fail("해당 지역에 매핑된 상권(TRDAR)이 없습니다.", status.HTTP_404_NOT_FOUND)
+
+        quarters = quarter_range(start, end)
+        sales = sales_series(quarters, signgu_cd, adstrd_cd, trdar_cd, svc_induty_cd)
+        change = change_index_series(quarters, signgu_cd, adstrd_cd, trdar_cd)
+
+        sales_out = {"row_count": to_list(sales["row_count"], as_int=True), "qoq": {}, "yoy": {}}
+        for f in AMOUNT_FIELDS:
+            sales_out[f] = to_list(sales[f], 2)
+            qoq, yoy = deltas(sales[f], relative=True)
+            sales_out["qoq"][f], sales_out["yoy"][f] = to_list(qoq, 4), to_list(yoy, 4)
+        change_qoq, change_yoy = deltas(change["avg"], relative=False)
+
+        resp = {
+            "status": 200,
+            "success": True,
+            "message": "시계열 조회 성공",
+            "params": {
+                "signgu_cd": signgu_cd, "adstrd_cd": adstrd_cd, "trdar_cd": trdar_cd,
+                "svc_induty_cd": svc_induty_cd, "yyq_from": yyq_label(start), "yyq_to": yyq_label(end),
+            },
+            "quarters": [yyq_label(q) for q in quarters],
+            "sales": sales_out,
+            "change_index": {
+                "avg": to_list(change["avg"], 4),
+                "count": to_list(change["count"], as_int=True),
+                "qoq": to_list(change_qoq, 4),
+                "yoy": to_list(change_yoy, 4),
+            },
+        }
+        return Response(resp, status=status.HTTP_200_OK)
+
 
-class ClosuresByRegionView(APIView):
+class ClosuresByRegionView(VersionedResponseMixin, APIView):
     """
     GET /api/analytics/closures/?signgu_cd=11740&year=2023
     또는
     GET /api/analytics/closures/?signgu_nm=강동구&year=2023
+    - 여러 해: ?year_from=2019&year_to=2023 → items에 year 포함, aggregate는 기간 합계
+    - series: 연도별 합계와 전년 대비 증감률(yoy), 자치구 지정 시 aggregate에 서울 내 순위/비중
+    - ?compare=1 이면 districts: 자치구별 합계 순위 (폐업 많은 순)
+    - 워커 메모리의 폐업 큐브에서 배열 인덱싱만 (closure_stat 버전이 바뀔 때만 DB 다시 읽음)
     """
+    cache_datasets = (CLOSURE_STAT,)
+
     def get(self, request):
         signgu_cd = request.GET.get("signgu_cd")
         signgu_nm = request.GET.get("signgu_nm")
         year = request.GET.get("year")
+        year_from = request.GET.get("year_from") or year
+        year_to = request.GET.get("year_to") or year_from
 
-        if not year:
-            return Response({
-                "status": 400,
-                "success": False,
-                "message": "year 파라미터는 필수입니다.",
-                "data": None,
-            }, status=status.HTTP_400_BAD_REQUEST)
-        qs = ClosureStat.objects.filter(year=year)
-        if signgu_cd:
-            qs = qs.filter(signgu_cd=signgu_cd)
-        elif signgu_nm:
-            qs = qs.filter(signgu_cd_nm=signgu_nm)
-
-        items = list(qs.values("category", "closures"))
-
-        # ✅ 집계 계산 로직 수정
-        # 1) '전체' 행이 있으면 그 값을 총합으로 사용 (이중합 방지)
-        total_row = qs.filter(category="전체").values_list("closures", flat=True).first()
+        if not year_from:
+            return _fail("year(또는 year_from/year_to) 파라미터는 필수입니다.")
+        try:
+            start, end = int(year_from), int(year_to)
+        except ValueError:
+            return _fail("year/year_from/year_to는 연도 숫자로 주세요. 예: 2023")
+        if start > end:
+            return _fail("year_from이 year_to보다 늦습니다.")
 
-        # 2) 없으면 '전체/합계' 같은 요약행을 제외하고 합계
-        leaf_qs = qs.exclude(category__in=["전체", "합계"])
-        leaf_sum = leaf_qs.aggregate(closures_sum=Sum("closures"))["closures_sum"]
+        cube = get_closure_cube()
+        region_given = bool(signgu_cd or signgu_nm)
+        d = cube.district(signgu_cd, signgu_nm) if region_given else None
+        districts = ([d] if d is not None else []) if region_given else list(range(len(cube.names)))
+        years = cube.year_slice(start, end)
+        multi = start != end
 
-        total_closures = total_row if total_row is not None else (leaf_sum or 0)
+        items = []
+        for y in years:
+            for row in cube.items(y, districts):
+                items.append({"year": cube.years[y], **row} if multi else row)
+
+        series = []
+        for y in years:
+            cur = cube.total(y, districts)
+            prev = cube.total(cube.year_pos(cube.years[y] - 1), districts)
+            yoy = round(cur / prev - 1, 4) if prev else None
+            series.append({"year": cube.years[y], "closures_sum": cur, "prev_closures_sum": prev, "yoy": yoy})
+
+        aggregate = {"closures_sum": sum(r["closures_sum"] for r in series)}
+        if not multi:
+            aggregate["yoy"] = series[0]["yoy"] if series else None
+        ranking = cube.ranking(years) if years else []
+        if d is not None and ranking:
+            mine = next(r for r in ranking if r["signgu_cd_nm"] == (cube.names[d] or None))
+            aggregate.update(rank=mine["rank"], share=mine["share"], districts_count=len(ranking))
 
         resp = {
             "status": 200,
             "success": True,
             "message": "폐업 통계 조회 성공",
-            "params": {"signgu_cd": signgu_cd, "signgu_nm": signgu_nm, "year": year},
+            "params": {"signgu_cd": signgu_cd, "signgu_nm": signgu_nm, "year": year,
+                       "year_from": start, "year_to": end},
             "region": {
-                "signgu_cd": signgu_cd,
-                "signgu_cd_nm": qs.values_list("signgu_cd_nm", flat=True).first(),
+                "signgu_cd": signgu_cd or (cube.codes[d] if d is not None else None),
+                "signgu_cd_nm": (cube.names[d] or None) if d is not None else None,
             },
             "items": items,
-            "aggregate": {
-                "closures_sum": total_closures,  # ⬅️ 이제 3023으로 나와요
-            },
+            "aggregate": aggregate,
+            "series": series,
         }
+        if parse_bool_param(request, "compare"):
+            resp["districts"] = ranking
         return Response(resp, status=status.HTTP_200_OK)
-    
+
+
 class StoreCountsView(APIView):
     """
     GET /api/analytics/store-counts/?trdar_cd=3110008&radius=2000
@@ -247,16 +467,19 @@ class StoreCountsView(APIView):
             "data": {
                 "total": obj.total,
                 "center": {"cx": obj.cx, "cy": obj.cy},
-                "raw": obj.raw_data,
+                "raw": obj.raw,
             }
         }, status=200)
     
-class StoreCountsByRadiusView(APIView):
+class StoreCountsByRadiusView(VersionedResponseMixin, APIView):
     """
     GET /api/analytics/store-counts/?trdar_cd=3110008&radius=2000&group_by=mcls&limit=10
     - group_by: lcls(대분류) | mcls(중분류, 기본) | scls(소분류)
     - limit: 상위 N개 (기본 10)
+    - 수집된 StoreCount가 없는 반경은 로컬 점포 인덱스(StorePoint KD-tree)로 계산
     """
+    cache_datasets = (TRADING_AREA, STORE_COUNT, STORE_POINT)
+
     def get(self, request):
         trdar_cd = request.GET.get("trdar_cd")
         radius = int(request.GET.get("radius", 2000))
@@ -269,29 +492,22 @@ class StoreCountsByRadiusView(APIView):
                 "message": "trdar_cd 파라미터는 필수입니다.", "data": None
             }, status=status.HTTP_400_BAD_REQUEST)
 
-        obj = StoreCount.objects.filter(trdar_cd=trdar_cd, radius=radius).first()
+        # JSON 집계 칼럼은 읽지 않음 (상위 N개는 StoreCategoryCount에서)
+        obj = StoreCount.objects.filter(trdar_cd=trdar_cd, radius=radius).only("id", "total", "cx", "cy").first()
         if not obj:
-            return Response({
-                "status": 404, "success": False,
-                "message": "해당 상권/반경의 집계가 없습니다. fetch_store_counts를 먼저 실행하세요.",
-                "data": None
-            }, status=status.HTTP_404_NOT_FOUND)
-
-        # ✓ 저장된 집계 사용
-        if group_by == "lcls":
-            counts = obj.counts_lcls or {}
-        elif group_by == "scls":
-            counts = obj.counts_scls or {}
-        else:  # mcls (default)
-            counts = obj.counts_mcls or {}
-
-        # 상위 N개
-        top_items = sorted(counts.items(), key=lambda x: x[1], reverse=True)[:limit]
-        top_dict = {k: v for k, v in top_items}
+            # 수집한 반경이 아니면 로컬 점포 인덱스(KD-tree)로 바로 계산
+            return self._from_store_index(trdar_cd, radius, group_by, limit)
+
+        # ✓ 저장된 집계 사용 — (상권, 반경, 분류 단계) 인덱스에서 count 역순 LIMIT
+        level = group_by if group_by in StoreCategoryCount.LEVELS else "mcls"
+        top_dict = dict(
+            StoreCategoryCount.objects.filter(trdar_cd=trdar_cd, radius=radius, level=level)
+            .order_by("-count", "category").values_list("category", "count")[:limit]
+        )
 
-        # 백업: 저장된 집계가 없으면 raw_data(샘플 20개)로라도 간이 집계
-        if not top_dict and obj.raw_data:
-            items = ((obj.raw_data or {}).get("body") or {}).get("items") or []
+        # 백업: 저장된 집계가 없으면 raw(샘플 20개)로라도 간이 집계
+        if not top_dict and obj.raw:
+            items = ((obj.raw or {}).get("body") or {}).get("items") or []
             key_map = {"lcls": "indsLclsNm", "mcls": "indsMclsNm", "scls": "indsSclsNm"}
             key = key_map.get(group_by, "indsMclsNm")
             cnt = Counter(it.get(key) for it in items if it.get(key))
@@ -306,5 +522,100 @@ class StoreCountsByRadiusView(APIView):
                 "total": obj.total,
                 "top": top_dict,     # ✅ 여기!
                 "center": {"cx": obj.cx, "cy": obj.cy},
+                "source": "api",
+            }
+        }, status=status.HTTP_200_OK)
+
+    def _from_store_index(self, trdar_cd, radius, group_by, limit):
+        index = get_store_index()
+        center = TradingArea.objects.filter(trdar_cd=trdar_cd).values_list("x", "y", "lon", "lat").first()
+        if index is None or not center or None in center[:2]:
+            return Response({
+                "status": 404, "success": False,
+                "message": "해당 상권/반경의 집계가 없습니다. fetch_store_counts 또는 import_store_points_csv를 먼저 실행하세요.",
+                "data": None
+            }, status=status.HTTP_404_NOT_FOUND)
+
+        x, y, lon, lat = center
+        idx = index.query(x, y, radius)
+        level = group_by if group_by in ("lcls", "scls") else "mcls"
+        counts = index.counts(idx, level)
+        top_items = sorted(counts.items(), key=lambda x: x[1], reverse=True)[:limit]
+
+        return Response({
+            "status": 200,
+            "success": True,
+            "message": "상권 반경 내 점포 수 조회 성공",
+            "params": {"trdar_cd": trdar_cd, "radius": radius, "group_by": group_by, "limit": limit},
+            "data": {
+                "total": int(idx.size),
+                "top": dict(top_items),
+                "center": {"cx": lon, "cy": lat},
+                "source": "store_index",
+            }
+        }, status=status.HTTP_200_OK)
+
+
+class StoreRankingView(VersionedResponseMixin, APIView):
+    """
+    GET /api/analytics/store-rankings/?category=카페&signgu_cd=11440&radius=500&limit=20
+    - 업종(category) 점포 수가 많은 상권 순위 — level: lcls | mcls(기본) | scls
+    - 지역(signgu_cd/adstrd_cd)을 빼면 서울 전체
+    - items[].share: 그 반경 전체 점포 중 해당 업종 비중 (포화도 비교용)
+    - aggregate: 지역 안에서 해당 업종이 있는 상권 수 / 점포 합계 / 상권당 평균
+    """
+    cache_datasets = (TRADING_AREA, STORE_COUNT)
+    MAX_LIMIT = 100
+
+    def get(self, request):
+        signgu_cd, adstrd_cd = parse_region_params(request)
+        category = (request.GET.get("category") or "").strip()
+        level = request.GET.get("level", "mcls")
+        if not category:
+            return _fail("category 파라미터는 필수입니다. 예: category=카페")
+        if level not in StoreCategoryCount.LEVELS:
+            return _fail(f"level은 {'|'.join(StoreCategoryCount.LEVELS)} 중 하나입니다.")
+        try:
+            radius = int(request.GET.get("radius", 2000))
+            limit = int(request.GET.get("limit", 20))
+        except ValueError:
+            return _fail("radius/limit는 정수로 주세요.")
+        if not 1 <= limit <= self.MAX_LIMIT:
+            return _fail(f"limit는 1~{self.MAX_LIMIT} 사이로 주세요.")
+
+        qs = StoreCategoryCount.objects.filter(level=level, category=category, radius=radius)
+        if signgu_cd or adstrd_cd:
+            qs = qs.filter(region_trdar_q(signgu_cd, adstrd_cd))
+
+        # (level, category, radius, count) 인덱스에서 count 역순 LIMIT — 이름/전체 점포 수는 고른 행에만
+        rows = list(
+            qs.order_by("-count", "trdar_cd")
+            .annotate(
+                trdar_cd_nm=Subquery(TradingArea.objects.filter(trdar_cd=OuterRef("trdar_cd")).values("trdar_cd_nm")[:1]),
+                total=Subquery(StoreCount.objects.filter(trdar_cd=OuterRef("trdar_cd"), radius=radius).values("total")[:1]),
+            )
+            .values("trdar_cd", "trdar_cd_nm", "count", "total")[:limit]
+        )
+        if not rows:
+            return _fail("해당 업종/반경의 점포 집계가 없습니다.", status.HTTP_404_NOT_FOUND)
+        agg = qs.aggregate(trdars_count=Count("id"), stores_sum=Sum("count"), stores_avg=Avg("count"))
+        if agg["stores_avg"] is not None:
+            agg["stores_avg"] = round(float(agg["stores_avg"]), 2)
+
+        items = [
+            {
+                "rank": rank,
+                **row,
+                "share": round(row["count"] / row["total"], 4) if row["total"] else None,
             }
+            for rank, row in enumerate(rows, 1)
+        ]
+        return Response({
+            "status": 200,
+            "success": True,
+            "message": "업종별 상권 순위 조회 성공",
+            "params": {"category": category, "level": level, "radius": radius, "limit": limit,
+                       "signgu_cd": signgu_cd, "adstrd_cd": adstrd_cd},
+            "aggregate": agg,
+            "items": items,
         }, status=status.HTTP_200_OK)